@@ -5,6 +5,8 @@ from typing import Mapping, Sequence, TextIO, TypeAlias, Literal
 from audio_transformers.cli.datasets.public import DEFAULT_DATASETS, DatasetSource
 from audio_transformers.cli.task.executor import DEFAULT_TRANSFORMS
 from audio_transformers.cli.task.initializers import Initializer
+from audio_transformers.core.precision import Precision
+from audio_transformers.io.probe import DEFAULT_CACHE_PATH
 
 LogLevel: TypeAlias = Literal["DEBUG", "INFO", "WARN", "ERROR"]
 
@@ -26,6 +28,10 @@ class CliConfig:
 
     transforms: Mapping[str, Initializer] = DEFAULT_TRANSFORMS
     input_block_duration: float = 60.0  # 10m blocks
+    optimize: bool = True
+    precision: Precision = "single"
+    scratch_dir: str | None = None  # Memory-mapped signals directory
+    probe_cache: str | None = DEFAULT_CACHE_PATH  # Persistent file metadata cache
     public_datasets: Sequence[DatasetSource] = DEFAULT_DATASETS
     output_file: TextIO = sys.stdout
     errors_file: TextIO = sys.stderr
@@ -7,6 +7,8 @@ from audio_transformers.cli.errors import CliUsageError
 from audio_transformers.cli.handlers.datasets import DatasetsHandler
 from audio_transformers.cli.handlers.transform import TransformHandler
 from audio_transformers.cli.logconfig import configure_logging
+from audio_transformers.core.precision import set_precision
+from audio_transformers.io import probe
 from audio_transformers.utils.console import Console
 
 
@@ -20,6 +22,8 @@ class RootHandler:
     @staticmethod
     def make(config: CliConfig = CliConfig()) -> "RootHandler":
         """Initialize root handler based on CLI config."""
+        set_precision(config.precision)
+        probe.set_cache(config.probe_cache)
         console = RootHandler.make_console(config)
         datasets_handler = DatasetsHandler(
             console=console,
@@ -29,6 +33,8 @@ class RootHandler:
             console=console,
             transforms=config.transforms,
             input_block_duration=config.input_block_duration,
+            optimize=config.optimize,
+            scratch_dir=config.scratch_dir,
         )
         root_handler = RootHandler(
             datasets=datasets_handler,
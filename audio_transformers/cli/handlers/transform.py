@@ -9,11 +9,12 @@ from tqdm import tqdm
 import audio_transformers.io.probe as probe
 from audio_transformers.cli.errors import CliUsageError
 from audio_transformers.cli.task.errors import InitError
-from audio_transformers.cli.task.executor import TaskExecutor, FileTask, TaskStats
+from audio_transformers.cli.task.executor import TaskExecutor, FileTask, TaskStats, FileOutput
 from audio_transformers.cli.task.initializers import Initializer
 from audio_transformers.cli.task.model import TransformSpec, TaskSpec
-from audio_transformers.core.transform import Transform
+from audio_transformers.io.decode import DecodeOptions, push_down
 from audio_transformers.utils.console import Tabular, Format, Console
+from audio_transformers.utils.types import BasicValue
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +37,19 @@ class TransformPreview(Tabular):
 class TransformHandler:
     """Transform audio files."""
 
-    def __init__(self, console: Console, transforms: Mapping[str, Initializer], input_block_duration: float = 60.0):
+    def __init__(
+        self,
+        console: Console,
+        transforms: Mapping[str, Initializer],
+        input_block_duration: float = 60.0,
+        optimize: bool = True,
+        scratch_dir: str | None = None,
+    ):
         self._console: Console = console
         self._transforms: Mapping[str, Initializer] = transforms
         self._input_block_duration: float = input_block_duration
+        self._optimize: bool = optimize
+        self._scratch_dir: str | None = scratch_dir
 
     def list(self, format: Format = "table"):
         """List available transformations"""
@@ -54,41 +64,64 @@ class TransformHandler:
         init: Initializer = self._transforms[name]
         self._console.output(init.docs.params, format)
 
+    def plan(self, type: str | None = None, config: str | None = None, **options):
+        """Explain how transformation chain is optimized before execution."""
+        specs = TransformHandler._specs(type, config, options)
+        executor = TaskExecutor(self._transforms, self._input_block_duration, optimize=self._optimize)
+        try:
+            plan = executor.plan(specs)
+        except InitError as error:
+            raise CliUsageError(f"Cannot initialize {error.name} transformation: {error}")
+        explanation = plan.explain()
+        decode, _ = push_down(plan.transform)
+        if self._optimize and decode != DecodeOptions():
+            explanation += f"\nDone by decoder: {decode}"
+        self._console.text(explanation)
+
     def file(self, input: str, output: str, type: str | None = None, config: str | None = None, **options):
         """Process a single file."""
-        if type is None and config is None:
-            raise CliUsageError("Either transformation type or a config file must be specified.")
-        if type is not None and config is not None:
-            raise CliUsageError("Ambiguous usage: transformation type and config cannot be specified simultaneously.")
-
-        specs: List[TransformSpec] = []
-        if type is not None:
-            specs = [TransformSpec(type=type, params=options)]
-        elif config is not None:  # config file is specified
-            transform_config = TaskSpec.from_file(config)
-            specs = transform_config.transforms
-        executor = TaskExecutor(self._transforms, self._input_block_duration)
+        specs = TransformHandler._specs(type, config, options)
+        executor = TaskExecutor(
+            self._transforms, self._input_block_duration, optimize=self._optimize, scratch_dir=self._scratch_dir
+        )
 
         try:
-            transform: Transform = executor.build_transform(specs)
+            decode, transform = executor.build_input(specs)
         except InitError as error:
             raise CliUsageError(f"Cannot initialize {error.name} transformation: {error}")
 
         logger.info(f"Processing file {input} -> {output}")
         task = FileTask(
             input_path=input,
-            output_path=output,
+            outputs=[FileOutput(output)],
             transform=transform,
             block_duration=executor.block_duration,
+            decode=decode,
+            scratch_dir=executor.scratch_dir,
         )
 
         start_time = time.time()
-        with tqdm(total=probe.samples(input), unit="samples", unit_scale=True) as progress:
+        input_info = probe.info(input)
+        total_samples = input_info.samples if decode.rate is None else int(input_info.duration * decode.rate)
+        with tqdm(total=total_samples, unit="samples", unit_scale=True) as progress:
             TaskExecutor.execute_subtask_parallel(task, progress.update)
         elapsed = timedelta(seconds=time.time() - start_time)
         logger.info(f"Processing done: {input} -> {output}")
         self._console.ok(f"Done! Elapsed time: {elapsed}")
 
+    @staticmethod
+    def _specs(type: str | None, config: str | None, options: Mapping[str, BasicValue]) -> List[TransformSpec]:
+        """Get transformation specs either from CLI arguments or from config file."""
+        if type is None and config is None:
+            raise CliUsageError("Either transformation type or a config file must be specified.")
+        if type is not None and config is not None:
+            raise CliUsageError("Ambiguous usage: transformation type and config cannot be specified simultaneously.")
+
+        if type is not None:
+            return [TransformSpec(type=type, params=dict(options))]
+        transform_config = TaskSpec.from_file(config)
+        return transform_config.transforms
+
     def files(
         self,
         input_root: str | None = None,
@@ -115,9 +148,9 @@ class TransformHandler:
             task.input_root = "."
         if task.input_pattern is None:
             raise CliUsageError("Input files pattern must be specified either via CLI arguments or config file.")
-        if len(task.transforms) == 0:
+        if len(task.transforms) == 0 and not any(output.transforms for output in task.outputs):
             raise CliUsageError("At least one transformation must be specified via CLI arguments or config file.")
-        executor: TaskExecutor = TaskExecutor(self._transforms)
+        executor: TaskExecutor = TaskExecutor(self._transforms, optimize=self._optimize, scratch_dir=self._scratch_dir)
 
         start_time = time.time()
         stats: TaskStats = TaskExecutor.stats(task)
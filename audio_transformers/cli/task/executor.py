@@ -1,51 +1,147 @@
 import logging
+import math
 import multiprocessing
 import os
-from dataclasses import dataclass
+import tempfile
+import zlib
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from functools import partial
+from multiprocessing import resource_tracker
 from os import fspath
 from pathlib import Path
 from types import MappingProxyType
-from typing import Sequence, List, Mapping, Iterator, Callable, Any, Type
+from typing import (
+    Sequence,
+    List,
+    Mapping,
+    Iterator,
+    Callable,
+    Any,
+    Type,
+    Iterable,
+    Tuple,
+    TypeVar,
+)
 
 from audio_transformers.cli.task.errors import InitError, TaskExecutionError
 from audio_transformers.cli.task.initializers import Initializer, BasicInit
-from audio_transformers.cli.task.model import TransformSpec, TaskSpec
+from audio_transformers.cli.task.model import TransformSpec, TaskSpec, OutputSpec
 from audio_transformers.core.band_pass import BandPass
 from audio_transformers.core.band_stop import BandStop
+from audio_transformers.core.channels import Downmix, SelectChannels
 from audio_transformers.core.composite import Composite
 from audio_transformers.core.gaussian_noise import GaussianNoise
 from audio_transformers.core.high_pass import HighPass
 from audio_transformers.core.inversion import Inversion
 from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal, ChunkedSignal
+from audio_transformers.core.optimizer import Optimizer, Plan
 from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.precision import set_precision, get_precision, Precision
+from audio_transformers.core.resample import Resample
 from audio_transformers.core.speed_perturbation import SpeedPerturbation
-from audio_transformers.core.transform import Transform
+from audio_transformers.core.transform import Transform, Context
+import audio_transformers.io.probe as probe
+import audio_transformers.io.wav as wav
+from audio_transformers.io import scratch
+from audio_transformers.io.decode import DecodeOptions, push_down
 from audio_transformers.io.file import AudioFile
+from audio_transformers.io.pipeline import DEFAULT_DEPTH, WriteBehind, prefetch
+from audio_transformers.io.shared import BlockRing, Slot, SharedBlock
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 DEFAULT_TRANSFORMS: Mapping[str, Initializer] = MappingProxyType(
     {
         "BandPass": BasicInit(BandPass),
         "BandStop": BasicInit(BandStop),
+        "Downmix": BasicInit(Downmix),
         "GaussianNoise": BasicInit(GaussianNoise),
         "HighPass": BasicInit(HighPass),
         "Inversion": BasicInit(Inversion),
         "LowPass": BasicInit(LowPass),
         "PitchShift": BasicInit(PitchShift),
+        "Resample": BasicInit(Resample),
+        "SelectChannels": BasicInit(SelectChannels),
         "SpeedPerturbation": BasicInit(SpeedPerturbation),
     }
 )
 
 
+@dataclass
+class FileOutput:
+    """Output variant of a single file processing task."""
+
+    output_path: str
+    transform: Transform = field(default_factory=lambda: Composite([]))
+
+
 @dataclass
 class FileTask:
-    """Single file processing task."""
+    """Single file processing task.
+
+    The input file is decoded once (with the given decoder conversions) and
+    the shared transformation is applied once, its result is then passed
+    through the transformation of each output.
+    """
 
     input_path: str
-    output_path: str
-    transform: Transform
+    outputs: Sequence[FileOutput]
+    transform: Transform = field(default_factory=lambda: Composite([]))
     block_duration: float = 60.0
+    decode: DecodeOptions = DecodeOptions()
+    scratch_dir: str | None = None
+    pipeline_depth: int = (
+        DEFAULT_DEPTH  # Blocks buffered by decoding and encoding threads (0 disables them)
+    )
+    key: str | None = (
+        None  # Input identity for randomized transformations (the input file name by default)
+    )
+
+    @property
+    def uniform(self) -> bool:
+        """Check if all the transformations could be applied to blocks independently."""
+        return self.transform.uniform and all(
+            output.transform.uniform for output in self.outputs
+        )
+
+    @property
+    def streamable(self) -> bool:
+        """Check if all the transformations could be applied to consecutive blocks in a stream."""
+        return self.transform.streamable and all(
+            output.transform.streamable for output in self.outputs
+        )
+
+    def context(self, rate: int) -> Context | None:
+        """Get input context required to apply all the transformations to blocks independently."""
+        context = self.transform.context(rate)
+        if context is None or self.transform.output_rate(rate) != rate:
+            return None
+        branches = Context()
+        for output in self.outputs:
+            output_context = output.transform.context(rate)
+            if output_context is None or output.transform.output_rate(rate) != rate:
+                return None
+            branches = branches.union(output_context)
+        return context.then(branches)
+
+    @property
+    def signal_key(self) -> int:
+        """Get key of the input signal, so that it gets the same random streams however the path is written."""
+        key = (
+            self.key
+            if self.key is not None
+            else os.path.basename(os.path.normpath(self.input_path))
+        )
+        return zlib.crc32(key.encode())
+
+    @property
+    def output_paths(self) -> str:
+        """Get comma-separated output paths."""
+        return ", ".join(output.output_path for output in self.outputs)
 
 
 @dataclass
@@ -71,36 +167,70 @@ class TaskExecutor:
     transforms: Mapping[str, Initializer]
     block_duration: float
     tolerate_errors: int = 10
+    optimizer: Optimizer | None
+    scratch_dir: str | None
 
     def __init__(
         self,
         transforms: Mapping[str, Initializer] | None,
         block_duration: float = 60.0,
         tolerate_errors: int = 10,
+        optimize: bool = True,
+        scratch_dir: str | None = None,
     ):
         """
         :param transforms: Available transformations.
         :param block_duration: Block duration in streamed IO
+        :param optimize: Rewrite transformation chains into equivalent cheaper ones.
+        :param scratch_dir: Directory for memory-mapped signals (system temporary directory by default).
         """
         self.transforms = transforms or DEFAULT_TRANSFORMS
         self.block_duration = block_duration
+        self.optimizer = Optimizer() if optimize else None
+        self.scratch_dir = scratch_dir
 
     def build_transform(self, specs: Sequence[TransformSpec]) -> Transform:
         """Build transformation from the spec list."""
+        if self.optimizer is not None:
+            return self.plan(specs).transform
+        return self._build_composite(specs)
+
+    def build_input(
+        self, specs: Sequence[TransformSpec]
+    ) -> Tuple[DecodeOptions, Transform]:
+        """Build transformation from the spec list moving its leading conversions to the decoder if optimized."""
+        transform = self.build_transform(specs)
+        if self.optimizer is not None:
+            return push_down(transform)
+        return DecodeOptions(), transform
+
+    def plan(self, specs: Sequence[TransformSpec]) -> Plan:
+        """Build optimized transformation plan from the spec list."""
+        optimizer = self.optimizer or Optimizer(rules=())
+        return optimizer.optimize(self._build_composite(specs))
+
+    def _build_composite(self, specs: Sequence[TransformSpec]) -> Composite:
+        """Build transformation chain exactly as specified."""
         transforms: List[Transform] = []
         for spec in specs:
             if spec.type not in self.transforms:
                 known = ", ".join(self.transforms.keys())
-                raise InitError(f"Unknown transformation: {spec.type}. Must be one of: {known}", spec.type, None)
+                raise InitError(
+                    f"Unknown transformation: {spec.type}. Must be one of: {known}",
+                    spec.type,
+                    None,
+                )
             initializer = self.transforms[spec.type]
             try:
                 transforms.append(initializer.init(spec, self.transforms))
-            except TypeError as error:
+            except (TypeError, ValueError) as error:
                 raise InitError(str(error), spec.type, initializer.docs)
         return Composite(transforms)
 
     @staticmethod
-    def resolve_output(input_rel: str, output_root: str, output_pattern: str) -> str:
+    def resolve_output(
+        input_rel: str, output_root: str, output_pattern: str, output_name: str = ""
+    ) -> str:
         """Resolve output path."""
         rel_dir = os.path.dirname(input_rel)
         basename = os.path.basename(input_rel)
@@ -111,8 +241,10 @@ class TaskExecutor:
             reldir=rel_dir,
             name=name,
             ext=ext,
+            output=output_name,
         )
-        return os.path.join(output_root, output_rel)
+        # Pattern is relative to the output root even if the input directory is empty
+        return os.path.join(output_root, output_rel.lstrip("/"))
 
     @staticmethod
     def _input_rel_paths(task: TaskSpec) -> Iterator[str]:
@@ -137,28 +269,51 @@ class TaskExecutor:
 
     def subtasks(self, task: TaskSpec) -> Iterator[FileTask]:
         """List file tasks."""
-        transform: Transform = self.build_transform(task.transforms)
+        decode, transform = self.build_input(task.transforms)
+        outputs = task.outputs or [
+            OutputSpec(name="", output_pattern=task.output_pattern)
+        ]
+        output_transforms = [
+            self.build_transform(output.transforms) for output in outputs
+        ]
         for rel_path in TaskExecutor._input_rel_paths(task):
             input_path = os.path.join(task.input_root, rel_path)
-            output_path = TaskExecutor.resolve_output(rel_path, task.output_root, task.output_pattern)
-            yield FileTask(input_path, output_path, transform, self.block_duration)
+            file_outputs = []
+            for output, output_transform in zip(outputs, output_transforms):
+                output_path = TaskExecutor.resolve_output(
+                    rel_path, task.output_root, output.output_pattern, output.name
+                )
+                file_outputs.append(FileOutput(output_path, output_transform))
+            yield FileTask(
+                input_path,
+                file_outputs,
+                transform,
+                self.block_duration,
+                decode,
+                self.scratch_dir,
+                key=Path(rel_path).as_posix(),
+            )
 
     def execute(self, task: TaskSpec, progress: Callable[[int], Any] | None = None):
         """Execute task."""
-        pool = multiprocessing.Pool(processes=multiprocessing.cpu_count())
+        pool = TaskExecutor._pool(multiprocessing.cpu_count())
 
         error: ErrorDetails
         failed_subtasks: int = 0
-        for error in pool.imap_unordered(self.execute_subtask, self.subtasks(task), chunksize=1):
+        for error in pool.imap_unordered(
+            self.execute_subtask, self.subtasks(task), chunksize=1
+        ):
             if error is not None:
                 logger.exception(
                     "Subtask failed while processing "
-                    f"{error.subtask.input_path} -> {error.subtask.output_path}: "
+                    f"{error.subtask.input_path} -> {error.subtask.output_paths}: "
                     f"{error.type.__name__}: {error.message}"
                 )
                 failed_subtasks += 1
                 if failed_subtasks > self.tolerate_errors:
-                    raise TaskExecutionError(f"{failed_subtasks} subtasks failed. See log for more details.")
+                    raise TaskExecutionError(
+                        f"{failed_subtasks} subtasks failed. See log for more details."
+                    )
             if progress is not None:
                 progress(1)
 
@@ -166,14 +321,19 @@ class TaskExecutor:
     def execute_subtask(subtask: FileTask) -> ErrorDetails | None:
         """Execute single file processing."""
         try:
-            if os.path.exists(subtask.output_path):
-                os.remove(subtask.output_path)
-            os.makedirs(os.path.dirname(subtask.output_path), exist_ok=True)
-            with AudioFile(subtask.input_path, "r", block_duration=subtask.block_duration) as input_file:
-                with AudioFile(subtask.output_path, "w", rate=input_file.rate) as output_file:
-                    for block in input_file:
-                        output_block = subtask.transform(block)
-                        output_file.write(output_block)
+            if not subtask.streamable:
+                return TaskExecutor.execute_subtask_mapped(subtask)
+            with TaskExecutor._open_input(subtask) as input_file:
+                with ExitStack() as stack:
+                    output_files = TaskExecutor._open_outputs(
+                        stack, subtask, input_file.rate
+                    )
+                    shared, branches = TaskExecutor.signal_transforms(subtask)
+                    blocks = TaskExecutor._decoded(subtask, input_file)
+                    for index, output_block in TaskExecutor.fan_out(
+                        shared, branches, blocks
+                    ):
+                        output_files[index].write(output_block)
         except Exception as error:
             return ErrorDetails(
                 type=type(error),
@@ -182,22 +342,608 @@ class TaskExecutor:
             )
 
     @staticmethod
-    def execute_subtask_parallel(subtask: FileTask, progress: Callable[[int], Any] | None = None):
-        """Execute single file in parallel processes."""
-        cpu_count = multiprocessing.cpu_count()
-        pool = multiprocessing.Pool(processes=cpu_count)
+    def execute_subtask_parallel(
+        subtask: FileTask,
+        progress: Callable[[int], Any] | None = None,
+        seek: bool = True,
+        segmented: bool = True,
+    ):
+        """Execute single file in parallel processes.
+
+        Uniform transformations are applied to blocks independently. Blocks
+        of other transformations are extended by the input context they
+        require (see Transform.context) and the extension is trimmed from
+        the results. If the context is unknown, the blocks are streamed
+        through the transformation sequentially.
+
+        :param seek: Workers decode their own blocks by seeking the input file,
+            otherwise the blocks are decoded by the current process and sent to the workers.
+            Resampled inputs (see DecodeOptions.rate) are always decoded by the current process.
+        :param segmented: Workers decoding their own blocks also encode their own output
+            segments if the outputs could be joined losslessly (see execute_subtask_seeking).
+        """
+        context = Context()
+        if not subtask.uniform:
+            context = subtask.context(
+                subtask.decode.rate or probe.rate(subtask.input_path)
+            )
+            if context is None:
+                return TaskExecutor.execute_subtask_stream(subtask, progress)
+        # Resampling decoders restart at each sought range, which would leave seams at the block boundaries
+        if seek and subtask.decode.rate is None:
+            return TaskExecutor.execute_subtask_seeking(
+                subtask, context, progress, segmented
+            )
+        if not subtask.uniform:
+            return TaskExecutor.execute_subtask_overlapped(subtask, context, progress)
+
+        processes = multiprocessing.cpu_count()
+        fan_out_block = partial(
+            TaskExecutor.fan_out_block, *TaskExecutor.signal_transforms(subtask)
+        )
+        with TaskExecutor._pool(processes) as pool, TaskExecutor._open_input(
+            subtask
+        ) as input_file:
+            with ExitStack() as stack:
+                output_files = TaskExecutor._open_outputs(
+                    stack, subtask, input_file.rate
+                )
+                ring = stack.enter_context(
+                    TaskExecutor._ring(subtask, processes, input_file.block_size)
+                )
+                tasks = TaskExecutor._send(ring, TaskExecutor.positioned(input_file))
+                call_shared = partial(TaskExecutor.call_shared, fan_out_block)
+                for result_blocks in TaskExecutor._imap_shared(
+                    pool, ring, call_shared, tasks
+                ):
+                    for output_file, result_block in zip(output_files, result_blocks):
+                        output_file.write(result_block)
+                    if progress is not None:
+                        progress(len(result_blocks[0]))
+
+    @staticmethod
+    def execute_subtask_overlapped(
+        subtask: FileTask,
+        context: Context,
+        progress: Callable[[int], Any] | None = None,
+    ):
+        """Execute single file in parallel processes transforming overlapping blocks."""
+        processes = multiprocessing.cpu_count()
+        fan_out_segment = partial(
+            TaskExecutor.fan_out_segment, *TaskExecutor.signal_transforms(subtask)
+        )
+        with TaskExecutor._pool(processes) as pool, TaskExecutor._open_input(
+            subtask
+        ) as input_file:
+            with ExitStack() as stack:
+                output_files = TaskExecutor._open_outputs(
+                    stack, subtask, input_file.rate
+                )
+                block_size, left = context.align(input_file.block_size)
+                capacity = left + block_size + context.right
+                ring = stack.enter_context(
+                    TaskExecutor._ring(subtask, processes, capacity)
+                )
+                tasks = TaskExecutor._send(
+                    ring,
+                    TaskExecutor.segments(input_file, context, input_file.block_size),
+                )
+                call_shared = partial(TaskExecutor.call_shared, fan_out_segment)
+                for result_blocks in TaskExecutor._imap_shared(
+                    pool, ring, call_shared, tasks
+                ):
+                    for output_file, result_block in zip(output_files, result_blocks):
+                        output_file.write(result_block)
+                    if progress is not None:
+                        progress(len(result_blocks[0]))
+
+    @staticmethod
+    def execute_subtask_seeking(
+        subtask: FileTask,
+        context: Context,
+        progress: Callable[[int], Any] | None = None,
+        segmented: bool = True,
+    ):
+        """Execute single file in parallel processes each decoding its own (extended) blocks of the input.
 
-        if os.path.exists(subtask.output_path):
-            os.remove(subtask.output_path)
-        os.makedirs(os.path.dirname(subtask.output_path), exist_ok=True)
+        If all the outputs are WAV files and `segmented` is set, workers also
+        encode their own output segments, which are joined by appending their
+        sample data. Otherwise, the results are passed to the current process
+        through the shared memory ring and encoded by it.
+        """
+        processes = multiprocessing.cpu_count()
+        info = probe.info(subtask.input_path)
+        rate = subtask.decode.rate or info.rate
+        samples = (
+            info.samples if subtask.decode.rate is None else int(info.duration * rate)
+        )
+        block_size, _ = context.align(int(subtask.block_duration * rate))
+        count = max(math.ceil(samples / block_size), 1)
 
-        block_duration = subtask.block_duration
-        with AudioFile(subtask.input_path, "r", block_duration=block_duration) as input_file:
-            with AudioFile(subtask.output_path, "w", rate=input_file.rate) as output_file:
-                for result_block in pool.imap(subtask.transform, input_file, chunksize=1):
-                    output_file.write(result_block)
+        with TaskExecutor._pool(processes) as pool:
+            if segmented and all(
+                TaskExecutor._concatenable(output) for output in subtask.outputs
+            ):
+                return TaskExecutor._execute_segmented(
+                    pool, subtask, context, rate, block_size, count, progress
+                )
+            with ExitStack() as stack:
+                output_files = TaskExecutor._open_outputs(stack, subtask, rate)
+                ring = stack.enter_context(
+                    TaskExecutor._ring(subtask, processes, block_size, inputs=False)
+                )
+                tasks = TaskExecutor._acquire(
+                    ring, subtask.decode.channels(info.channels), range(count)
+                )
+                fan_out_range = partial(
+                    TaskExecutor.fan_out_range_shared,
+                    subtask,
+                    context,
+                    block_size,
+                    count,
+                )
+                for result_blocks in TaskExecutor._imap_shared(
+                    pool, ring, fan_out_range, tasks
+                ):
+                    for output_file, result_block in zip(output_files, result_blocks):
+                        output_file.write(result_block)
                     if progress is not None:
-                        progress(len(result_block))
+                        progress(len(result_blocks[0]))
+
+    @staticmethod
+    def _execute_segmented(
+        pool: multiprocessing.Pool,
+        subtask: FileTask,
+        context: Context,
+        rate: int,
+        block_size: int,
+        count: int,
+        progress: Callable[[int], Any] | None = None,
+    ):
+        """Encode output segments by the workers into a temporary directory and join them."""
+        with tempfile.TemporaryDirectory(
+            prefix="audio-segments-", dir=subtask.scratch_dir
+        ) as directory:
+            encode_range = partial(
+                TaskExecutor.encode_range,
+                directory,
+                subtask,
+                context,
+                block_size,
+                count,
+            )
+            segments: List[List[str]] = [[] for _ in subtask.outputs]
+            for samples, paths in pool.imap(encode_range, range(count), chunksize=1):
+                for output_segments, path in zip(segments, paths):
+                    output_segments.append(path)
+                if progress is not None:
+                    progress(samples)
+            shared_rate = subtask.transform.output_rate(rate)
+            for output, output_segments in zip(subtask.outputs, segments):
+                TaskExecutor._prepare_output(output.output_path)
+                wav.concat(
+                    output_segments,
+                    output.output_path,
+                    output.transform.output_rate(shared_rate),
+                )
+
+    @staticmethod
+    def _concatenable(output: FileOutput) -> bool:
+        """Check if independently encoded segments of the output could be joined losslessly.
+
+        Compressed formats are not: lossy encoders prepend priming samples to
+        each segment and FLAC frames are numbered from the segment start.
+        """
+        return output.output_path.lower().endswith(".wav")
+
+    @staticmethod
+    def execute_subtask_stream(
+        subtask: FileTask, progress: Callable[[int], Any] | None = None
+    ):
+        """Execute single file streaming its blocks through the transformation in the current process."""
+        if not subtask.streamable:
+            return TaskExecutor.execute_subtask_mapped(subtask, progress)
+        with TaskExecutor._open_input(subtask) as input_file:
+            with ExitStack() as stack:
+                output_files = TaskExecutor._open_outputs(
+                    stack, subtask, input_file.rate
+                )
+                shared, branches = TaskExecutor.signal_transforms(subtask)
+                blocks = TaskExecutor._progress(
+                    TaskExecutor._decoded(subtask, input_file), progress
+                )
+                for index, output_block in TaskExecutor.fan_out(
+                    shared, branches, blocks
+                ):
+                    output_files[index].write(output_block)
+
+    @staticmethod
+    def execute_subtask_mapped(
+        subtask: FileTask, progress: Callable[[int], Any] | None = None
+    ):
+        """Execute single file applying the transformations to the whole signal mapped from a scratch file.
+
+        Transformations which cannot be streamed need the whole signal to be
+        correct. The input is decoded block by block into a memory-mapped scratch
+        file, so that very long files don't have to fit into memory at once.
+        Outputs of the transformation stages are stored the same way (see apply_mapped).
+        """
+        with TaskExecutor._open_input(subtask) as input_file:
+            blocks = TaskExecutor._progress(
+                TaskExecutor._decoded(subtask, input_file), progress
+            )
+            signal = scratch.store(blocks, input_file.rate, subtask.scratch_dir)
+            block_size = input_file.block_size
+        shared, branches = TaskExecutor.signal_transforms(subtask)
+        shared_signal = TaskExecutor.apply_mapped(shared, signal, subtask.scratch_dir)
+        with ExitStack() as stack:
+            output_files = TaskExecutor._open_outputs(stack, subtask, signal.rate)
+            for output_file, branch in zip(output_files, branches):
+                output = TaskExecutor.apply_mapped(
+                    branch, shared_signal, subtask.scratch_dir
+                )
+                for block in scratch.blocks(output, block_size):
+                    output_file.write(block)
+
+    @staticmethod
+    def apply_mapped(
+        transform: Transform, signal: Signal, directory: str | None = None
+    ) -> Signal:
+        """Apply transformation to the whole signal storing the output of each stage in a scratch file.
+
+        Stages of composite transformations are applied one by one (instead of
+        passing their whole-signal results in pooled arrays). In-place stages
+        write their output to a scratch file directly, outputs of other stages
+        are moved to a scratch file, so that at most a single stage output is
+        held in memory at a time.
+        """
+        for stage in TaskExecutor._stages(transform):
+            if stage.inplace:
+                signal = stage.apply(
+                    signal, scratch.allocate(signal.channels, signal.samples, directory)
+                )
+            else:
+                signal = scratch.spill(stage(signal), directory)
+        return signal
+
+    @staticmethod
+    def _stages(transform: Transform) -> Iterator[Transform]:
+        """Iterate over the stages of the (nested) composite transformation."""
+        if isinstance(transform, Composite):
+            for stage in transform.transforms:
+                yield from TaskExecutor._stages(stage)
+        else:
+            yield transform
+
+    @staticmethod
+    def _open_input(subtask: FileTask) -> AudioFile:
+        """Open input file of the subtask."""
+        return AudioFile(
+            subtask.input_path,
+            "r",
+            block_duration=subtask.block_duration,
+            decode=subtask.decode,
+        )
+
+    @staticmethod
+    def _decoded(subtask: FileTask, input_file: AudioFile) -> Iterable[Signal]:
+        """Get input blocks decoded ahead by a background thread if pipelining is enabled."""
+        if subtask.pipeline_depth > 0:
+            return prefetch(input_file, subtask.pipeline_depth)
+        return input_file
+
+    @staticmethod
+    def _open_outputs(
+        stack: ExitStack, subtask: FileTask, rate: int
+    ) -> List[AudioFile | WriteBehind]:
+        """Open output files of the subtask (at the output sampling rates) replacing existing ones.
+
+        If pipelining is enabled, the blocks are encoded by background threads.
+        """
+        output_files = []
+        shared_rate = subtask.transform.output_rate(rate)
+        for output in subtask.outputs:
+            TaskExecutor._prepare_output(output.output_path)
+            output_rate = output.transform.output_rate(shared_rate)
+            output_file = stack.enter_context(
+                AudioFile(output.output_path, "w", rate=output_rate)
+            )
+            if subtask.pipeline_depth > 0:
+                output_file = stack.enter_context(
+                    WriteBehind(output_file, subtask.pipeline_depth)
+                )
+            output_files.append(output_file)
+        return output_files
+
+    @staticmethod
+    def _prepare_output(output_path: str):
+        """Remove existing output file and create its directory."""
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    @staticmethod
+    def _progress(
+        blocks: Iterable[Signal], progress: Callable[[int], Any] | None
+    ) -> Iterator[Signal]:
+        """Report number of samples of each block before it is processed."""
+        for block in blocks:
+            yield block
+            if progress is not None:
+                progress(len(block))
+
+    @staticmethod
+    def signal_transforms(subtask: FileTask) -> Tuple[Transform, List[Transform]]:
+        """Get shared and output transformations with random streams bound to the subtask input (see FileTask.key)."""
+        key = subtask.signal_key
+        return subtask.transform.for_signal(key), [
+            output.transform.for_signal(key) for output in subtask.outputs
+        ]
+
+    @staticmethod
+    def fan_out_block(
+        shared: Transform,
+        branches: Sequence[Transform],
+        positioned_block: Tuple[int, Signal],
+    ) -> List[Signal]:
+        """Apply shared and then each output transformation to the block starting at the given sample."""
+        start, block = positioned_block
+        shared_block = shared.for_block(start)(block)
+        return [branch.for_block(start)(shared_block) for branch in branches]
+
+    @staticmethod
+    def fan_out_segment(
+        shared: Transform,
+        branches: Sequence[Transform],
+        segment: Tuple[int, Signal, int, int],
+    ) -> List[Signal]:
+        """Apply shared and then each output transformation to the extended block and trim the extension.
+
+        :param segment: Start of the extended block in the signal, extended block,
+            offset and length of the block within the extended one.
+        """
+        start, extended, offset, length = segment
+        stop = offset + length
+        shared_block = shared.for_block(start)(extended)
+        return [
+            branch.for_block(start)(shared_block)[offset:stop] for branch in branches
+        ]
+
+    @staticmethod
+    def fan_out_range(
+        subtask: FileTask, context: Context, block_size: int, count: int, index: int
+    ) -> List[Signal]:
+        """Decode the input block with the given index extended by the context and apply the transformations to it.
+
+        The last block extends to the end of the input, as its estimated length may be inexact.
+
+        :param count: Total number of blocks.
+        """
+        block_size, left = context.align(block_size)
+        start = index * block_size
+        extended_start = max(start - left, 0)
+        last = index == count - 1
+        with TaskExecutor._open_input(subtask) as input_file:
+            rate = input_file.rate
+            duration = (
+                None
+                if last
+                else (start + block_size + context.right - extended_start) / rate
+            )
+            extended = input_file.read_range(extended_start / rate, duration)
+        offset = start - extended_start
+        length = max(extended.samples - offset, 0) if last else block_size
+        shared, branches = TaskExecutor.signal_transforms(subtask)
+        return TaskExecutor.fan_out_segment(
+            shared, branches, (extended_start, extended, offset, length)
+        )
+
+    @staticmethod
+    def encode_range(
+        directory: str,
+        subtask: FileTask,
+        context: Context,
+        block_size: int,
+        count: int,
+        index: int,
+    ) -> Tuple[int, List[str]]:
+        """Transform the input block with the given index and encode its output segments (see fan_out_range).
+
+        :param directory: Directory of the encoded segments.
+        :return: Number of input samples and paths of the output segments.
+        """
+        result_blocks = TaskExecutor.fan_out_range(
+            subtask, context, block_size, count, index
+        )
+        paths = []
+        for output_index, (output, result_block) in enumerate(
+            zip(subtask.outputs, result_blocks)
+        ):
+            extension = os.path.splitext(output.output_path)[1]
+            path = os.path.join(directory, f"{output_index}-{index:08d}{extension}")
+            with AudioFile(path, "w", rate=result_block.rate) as segment_file:
+                segment_file.write(result_block)
+            paths.append(path)
+        return len(result_blocks[0]), paths
+
+    @staticmethod
+    def positioned(blocks: Iterable[Signal]) -> Iterator[Tuple[int, Signal]]:
+        """Pair consecutive blocks of a signal with their start sample."""
+        start = 0
+        for block in blocks:
+            yield start, block
+            start += block.samples
+
+    @staticmethod
+    def segments(
+        blocks: Iterable[Signal], context: Context, block_size: int
+    ) -> Iterator[Tuple[int, Signal, int, int]]:
+        """Split consecutive blocks of a signal into blocks extended by the given context.
+
+        Blocks are realigned to the context step. Extended blocks are clipped by
+        the signal edges, where transformations handle the edges themselves.
+
+        :return: Iterator over start of the extended block in the signal, extended block,
+            offset and length of the block within the extended one.
+        """
+        block_size, left = context.align(block_size)
+        buffer = (
+            ChunkedSignal()
+        )  # Buffered input samples starting at the `buffer_start`
+        buffer_start, next_start = 0, 0
+
+        def segment(end: int) -> Tuple[int, Signal, int, int]:
+            nonlocal buffer, buffer_start, next_start
+            extended_start = max(next_start - left, 0)
+            extended_stop = min(next_start + block_size + context.right, end)
+            length = min(block_size, end - next_start)
+            first, last = extended_start - buffer_start, extended_stop - buffer_start
+            extended = buffer[first:last].to_signal()
+            result = extended_start, extended, next_start - extended_start, length
+
+            # Drop samples which are not needed by the next blocks
+            next_start += length
+            keep_from = max(next_start - left, buffer_start)
+            dropped = keep_from - buffer_start
+            buffer, buffer_start = buffer[dropped:], keep_from
+            return result
+
+        for block in blocks:
+            buffer.append(block)
+            while (
+                buffer_start + buffer.samples >= next_start + block_size + context.right
+            ):
+                yield segment(buffer_start + buffer.samples)
+        while next_start < buffer_start + buffer.samples:
+            yield segment(buffer_start + buffer.samples)
+
+    @staticmethod
+    def fan_out(
+        shared: Transform, branches: Sequence[Transform], blocks: Iterable[Signal]
+    ) -> Iterator[Tuple[int, Signal]]:
+        """Stream blocks through the shared transformation and then through each branch.
+
+        :return: Iterator over pairs of branch index and the next output block of the branch.
+        """
+        streams = [branch.stream() for branch in branches]
+        for shared_block in TaskExecutor.stream(shared, blocks):
+            for index, stream in enumerate(streams):
+                yield index, stream(shared_block)
+        for index, stream in enumerate(streams):
+            rest = stream.flush()
+            if rest is not None:
+                yield index, rest
+
+    @staticmethod
+    def _ring(
+        subtask: FileTask, processes: int, capacity: int, inputs: bool = True
+    ) -> BlockRing:
+        """Create shared memory ring for the results of blocks with up to `capacity` samples.
+
+        :param inputs: Slots also hold the input blocks.
+        """
+        blocks = len(subtask.outputs) + (1 if inputs else 0)
+        return BlockRing(processes + max(subtask.pipeline_depth, 1), capacity, blocks)
+
+    @staticmethod
+    def _send(ring: BlockRing, tasks: Iterable[Tuple]) -> Iterator[Tuple[Slot, Tuple]]:
+        """Store the input block of each task (the second element) in a slot of the ring (see call_shared)."""
+        for start, block, *rest in tasks:
+            sent = ring.send(block)
+            if sent is None:  # Ring is closed
+                return
+            slot, shared_block = sent
+            yield slot, (start, shared_block, *rest)
+
+    @staticmethod
+    def _acquire(
+        ring: BlockRing, channels: int, tasks: Iterable[T]
+    ) -> Iterator[Tuple[Slot, T]]:
+        """Pair each task with a slot of the ring for its results."""
+        for task in tasks:
+            slot = ring.acquire(channels)
+            if slot is None:  # Ring is closed
+                return
+            yield slot, task
+
+    @staticmethod
+    def _imap_shared(
+        pool: multiprocessing.Pool,
+        ring: BlockRing,
+        call: Callable[[Tuple[Slot, Any]], Tuple[Slot, List[SharedBlock | Signal]]],
+        tasks: Iterable[Tuple[Slot, Any]],
+    ) -> Iterator[List[Signal]]:
+        """Map the call over the tasks holding slots of the ring, copy the results out of the slots and release them.
+
+        Only the slots and the block locations are pickled. Tasks are generated by
+        the pool thread feeding the workers, their errors are raised by the caller.
+        """
+        errors: List[Exception] = []
+
+        def feed() -> Iterator[Tuple[Slot, Any]]:
+            try:
+                yield from tasks
+            except Exception as error:
+                errors.append(error)
+
+        for slot, shared_results in pool.imap(call, feed(), chunksize=1):
+            result_blocks = [slot.load(result, copy=True) for result in shared_results]
+            ring.release(slot)
+            yield result_blocks
+        if len(errors) > 0:
+            raise errors[0]
+
+    @staticmethod
+    def call_shared(
+        fan_out: Callable[[Tuple], List[Signal]], task: Tuple[Slot, Tuple]
+    ) -> Tuple[Slot, List[SharedBlock | Signal]]:
+        """Apply the fan out function to the task block loaded from the slot and store the results after it."""
+        slot, (start, block, *rest) = task
+        result_blocks = fan_out((start, slot.load(block), *rest))
+        offset = block.end if isinstance(block, SharedBlock) else 0
+        return slot, slot.store(result_blocks, offset)
+
+    @staticmethod
+    def fan_out_range_shared(
+        subtask: FileTask,
+        context: Context,
+        block_size: int,
+        count: int,
+        task: Tuple[Slot, int],
+    ) -> Tuple[Slot, List[SharedBlock | Signal]]:
+        """Transform the input block with the given index (see fan_out_range) and store the results in the slot."""
+        slot, index = task
+        return slot, slot.store(
+            TaskExecutor.fan_out_range(subtask, context, block_size, count, index)
+        )
+
+    @staticmethod
+    def _pool(processes: int) -> multiprocessing.Pool:
+        """Create worker pool using the same precision and probe cache as the current process."""
+        initargs = (get_precision(), probe.get_cache())
+        # Workers share the resource tracker, so that it doesn't unlink shared memory attached by them on their exit
+        resource_tracker.ensure_running()
+        return multiprocessing.Pool(
+            processes=processes,
+            initializer=TaskExecutor._init_worker,
+            initargs=initargs,
+        )
+
+    @staticmethod
+    def _init_worker(precision: Precision, probe_cache: str | None):
+        """Apply process-wide settings in a worker process."""
+        set_precision(precision)
+        probe.set_cache(probe_cache)
+
+    @staticmethod
+    def stream(transform: Transform, blocks: Iterable[Signal]) -> Iterator[Signal]:
+        """Pass consecutive blocks of a single signal through the transformation stream."""
+        stream = transform.stream()
+        for block in blocks:
+            yield stream(block)
+        rest = stream.flush()
+        if rest is not None:
+            yield rest
 
     @staticmethod
     def stats(task: TaskSpec) -> TaskStats:
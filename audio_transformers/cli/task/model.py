@@ -15,9 +15,27 @@ class TransformSpec:
     params: Dict[str, BasicValue]
 
 
+@dataclass
+class OutputSpec:
+    """Named output variant of a task with its own transformations.
+
+    Output pattern may refer to the variant name as "{output}".
+    """
+
+    name: str
+    output_pattern: str = "{reldir}/{name}_{output}.{ext}"
+    transforms: List[TransformSpec] = field(default_factory=list)
+
+
 @dataclass
 class TaskSpec:
-    """Transformation task specification."""
+    """Transformation task specification.
+
+    If output variants are specified, the task transformations are applied
+    once to each input file and their result is then passed through the
+    transformations of each variant. Otherwise, a single output is written
+    by the output pattern.
+    """
 
     input_root: str | None = None
     input_pattern: str | None = None
@@ -26,6 +44,7 @@ class TaskSpec:
     output_pattern: str | None = "{reldir}/{name}_aug.{ext}"
 
     transforms: List[TransformSpec] = field(default_factory=list)
+    outputs: List[OutputSpec] = field(default_factory=list)
 
     def __post_init__(self):
         if self.output_root is None:
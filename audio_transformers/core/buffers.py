@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from typing import Tuple, List, Literal, TypeAlias
+
+import numpy as np
+from numpy.typing import NDArray
+
+Order: TypeAlias = Literal["C", "F"]
+BufferKey = Tuple[Tuple[int, ...], np.dtype, Order]
+
+
+def order(array: NDArray) -> Order:
+    """Get memory layout of the array ("F" only if it is not C-contiguous at the same time)."""
+    return "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+
+
+class BufferPool:
+    """Pool of reusable block-sized arrays.
+
+    Consecutive blocks of a signal mostly have the same shape, so the
+    intermediate results of a transformation chain could be stored in
+    the same few arrays instead of allocating new ones for each block
+    and each stage. Released arrays are kept by shape, data type and
+    memory layout, the least recently used shapes are dropped.
+    """
+
+    max_shapes: int
+    max_buffers: int
+
+    def __init__(self, max_shapes: int = 8, max_buffers: int = 4):
+        """
+        :param max_shapes: Maximal number of distinct array shapes kept in the pool.
+        :param max_buffers: Maximal number of free arrays kept for each shape.
+        """
+        self.max_shapes = max_shapes
+        self.max_buffers = max_buffers
+        self._free: OrderedDict[BufferKey, List[NDArray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, shape: Tuple[int, ...], dtype: np.dtype, order: Order = "C") -> NDArray:
+        """Get uninitialized array of the given shape, data type and memory layout."""
+        key = (tuple(shape), np.dtype(dtype), order)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self._free.move_to_end(key)
+                return free.pop()
+        return np.empty(shape, dtype=dtype, order=order)
+
+    def release(self, buffer: NDArray):
+        """Return array to the pool, it must not be used by the caller afterwards."""
+        key = (buffer.shape, buffer.dtype, order(buffer))
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            self._free.move_to_end(key)
+            if len(free) < self.max_buffers:
+                free.append(buffer)
+            while len(self._free) > self.max_shapes:
+                self._free.popitem(last=False)
+
+    def clear(self):
+        """Drop all pooled arrays."""
+        with self._lock:
+            self._free.clear()
+
+
+# Process-wide pool shared by all transformations
+DEFAULT_POOL: BufferPool = BufferPool()
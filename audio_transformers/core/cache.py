@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, TypeVar, Any
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Plan cache statistics."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Get fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+
+class PlanCache:
+    """Bounded LRU cache of designed DSP plans.
+
+    Filter coefficients, windows and interpolation tables depend only on
+    the transformation parameters and the sampling rate, which is known
+    at call time only. The cache lets every block (and every file) with
+    the same parameters reuse the plan designed once.
+
+    Cached plans are shared, so they must never be modified by the caller.
+    """
+
+    max_size: int
+
+    def __init__(self, max_size: int = 128):
+        """
+        :param max_size: Maximal number of cached plans.
+        """
+        self.max_size = max_size
+        self._items: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Get cached plan or create it with the factory."""
+        with self._lock:
+            if key in self._items:
+                self._hits += 1
+                self._items.move_to_end(key)
+                return self._items[key]
+            self._misses += 1
+
+        # Design outside the lock, concurrent misses
+        # of the same key could design the plan twice.
+        plan = factory()
+        with self._lock:
+            self._items[key] = plan
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self._evictions += 1
+        return plan
+
+    def stats(self) -> CacheStats:
+        """Get cache statistics."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._items),
+                max_size=self.max_size,
+            )
+
+    def clear(self):
+        """Remove all cached plans and reset statistics."""
+        with self._lock:
+            self._items.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+# Process-wide cache shared by all transformations
+DEFAULT_CACHE: PlanCache = PlanCache()
@@ -0,0 +1,26 @@
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.filter import Filter
+
+
+class FilterCascade(Filter):
+    """Sequence of filters applied in a single pass as one cascade of second-order sections."""
+
+    def __init__(self, filters: Sequence[Filter]):
+        """
+        :param filters: Filters to be applied in sequence, all of them must use the same engine.
+        """
+        engines = {item.engine for item in filters}
+        if len(engines) > 1:
+            raise ValueError(f"Cannot combine filters with different engines: {', '.join(sorted(engines))}")
+        super().__init__(engines.pop() if engines else "iir")
+        self.filters: Sequence[Filter] = tuple(filters)
+
+    def design(self, rate: int) -> NDArray[np.float64] | None:
+        sections = [sos for sos in (item.sos(rate) for item in self.filters) if sos is not None]
+        if len(sections) == 0:
+            return None
+        return np.concatenate(sections, axis=0)
@@ -0,0 +1,55 @@
+from abc import abstractmethod
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.model import Signal
+from audio_transformers.core.transform import Transform
+
+
+class ChannelMix(Transform):
+    """Abstract base for transformations which linearly combine signal channels."""
+
+    @abstractmethod
+    def matrix(self, channels: int) -> NDArray[np.float64]:
+        """Get mixing matrix with shape=(n_output_channels, n_input_channels)."""
+
+    def __call__(self, signal: Signal) -> Signal:
+        matrix = self.matrix(signal.channels).astype(signal.data.dtype)
+        return Signal(matrix @ signal.data, signal.rate)
+
+
+class Downmix(ChannelMix):
+    """Mix all channels into a single one."""
+
+    def matrix(self, channels: int) -> NDArray[np.float64]:
+        return np.full((1, channels), 1.0 / channels)
+
+    def __call__(self, signal: Signal) -> Signal:
+        return Signal(signal.data.mean(axis=0, keepdims=True), signal.rate)
+
+
+class SelectChannels(ChannelMix):
+    """Select signal channels by their indices."""
+
+    def __init__(self, channels: Sequence[int]):
+        """
+        :param channels: Indices of the selected channels (starting from 0).
+        """
+        if len(channels) == 0:
+            raise ValueError("At least one channel must be selected.")
+        self.channels: Sequence[int] = tuple(channels)
+
+    def matrix(self, channels: int) -> NDArray[np.float64]:
+        self._check(channels)
+        return np.eye(channels)[list(self.channels)]
+
+    def __call__(self, signal: Signal) -> Signal:
+        self._check(signal.channels)
+        return Signal(signal.data[list(self.channels)], signal.rate)
+
+    def _check(self, channels: int):
+        """Check if the selected channels are present."""
+        if max(self.channels) >= channels or min(self.channels) < -channels:
+            raise ValueError(f"Cannot select channels {list(self.channels)} from {channels} channels.")
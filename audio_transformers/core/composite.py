@@ -1,7 +1,11 @@
 from typing import Sequence
 
-from audio_transformers.core.model import Signal
-from audio_transformers.core.transform import Transform
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.buffers import BufferPool, DEFAULT_POOL, order
+from audio_transformers.core.model import Signal, SignalBatch
+from audio_transformers.core.transform import Transform, Context
 
 
 class Composite(Transform):
@@ -15,8 +19,90 @@ class Composite(Transform):
         """Check if composite transformation is uniform."""
         return all(t.uniform for t in self.transforms)
 
+    @property
+    def streamable(self) -> bool:
+        """Check if each stage could be streamed."""
+        return all(t.streamable for t in self.transforms)
+
+    def output_rate(self, rate: int) -> int:
+        for transform in self.transforms:
+            rate = transform.output_rate(rate)
+        return rate
+
+    def context(self, rate: int) -> Context | None:
+        """Accumulate context of the stages, it is unknown if any stage changes the sampling rate."""
+        context = Context()
+        for transform in self.transforms:
+            stage_context = transform.context(rate)
+            if stage_context is None or transform.output_rate(rate) != rate:
+                return None
+            context = context.then(stage_context)
+        return context
+
+    def stream(self) -> "Composite":
+        """Get composite transformation which carries state of each stage between blocks."""
+        return Composite([transform.stream() for transform in self.transforms])
+
+    def apply_batch(self, batch: SignalBatch) -> SignalBatch:
+        """Apply transformations to the batch in sequence."""
+        for transform in self.transforms:
+            batch = transform.apply_batch(batch)
+        return batch
+
+    def for_signal(self, key: int) -> "Composite":
+        return Composite([transform.for_signal(key) for transform in self.transforms])
+
+    def for_block(self, offset: int) -> "Composite":
+        return Composite([transform.for_block(offset) for transform in self.transforms])
+
+    def flush(self) -> Signal | None:
+        """Flush each stage passing its rest through the subsequent stages."""
+        pending: Signal | None = None
+        for transform in self.transforms:
+            if pending is not None:
+                pending = transform(pending)
+            rest = transform.flush()
+            if rest is not None:
+                pending = rest if pending is None else pending + rest
+        return pending
+
+    @property
+    def inplace(self) -> bool:
+        """Check if all the stages could write to a preallocated array."""
+        return all(t.inplace for t in self.transforms)
+
     def __call__(self, signal: Signal) -> Signal:
         """Apply transformations in sequence."""
-        for transform in self.transforms:
-            signal = transform(signal)
+        return self.apply(signal)
+
+    def apply(self, signal: Signal, out: NDArray[np.float32] | None = None, pool: BufferPool = DEFAULT_POOL) -> Signal:
+        """Apply transformations in sequence passing intermediate results in pooled arrays.
+
+        In-place stages alternate between two pooled arrays, so that the chain
+        allocates only its final output (or none if `out` is given). Pooled
+        arrays have the same memory layout as the input signal.
+        """
+        if len(self.transforms) == 0:
+            if out is None:
+                return signal
+            np.copyto(out, signal.data)
+            return Signal(out, signal.rate)
+
+        pooled: NDArray | None = None  # Pooled array holding the current signal data
+        last = len(self.transforms) - 1
+        for index, transform in enumerate(self.transforms):
+            if index == last:
+                signal = transform.apply(signal, out)
+            elif transform.inplace:
+                buffer = pool.acquire(signal.data.shape, signal.data.dtype, order(signal.data))
+                signal = transform.apply(signal, buffer)
+                if pooled is not None:
+                    pool.release(pooled)
+                pooled = buffer
+            else:
+                signal = transform(signal)
+            # Stages may return their input data as is, it must stay out of the pool
+            if pooled is not None and not np.may_share_memory(signal.data, pooled):
+                pool.release(pooled)
+                pooled = None
         return signal
@@ -0,0 +1,65 @@
+import numpy as np
+import scipy
+from numpy.typing import NDArray
+
+
+class OverlapAdd:
+    """Streaming FFT convolution with a linear-phase (symmetric) kernel.
+
+    The convolution is computed block by block by the overlap-add method:
+    the tail of each convolved block is kept and added to the head of the
+    next one. Group delay of the kernel is compensated, so the concatenated
+    output (including the flushed rest) is aligned with the input.
+
+    Signal is assumed to be constant before the first sample and after
+    the last sample, which avoids transients at the signal edges.
+
+    Output has the common data type of the input and the kernel.
+    """
+
+    kernel: NDArray[np.float64]
+    delay: int
+
+    def __init__(self, kernel: NDArray[np.float64]):
+        """
+        :param kernel: Linear-phase kernel of odd length.
+        """
+        self.kernel = kernel
+        self.delay = (len(kernel) - 1) // 2
+        self._tail: NDArray[np.float32] | None = None
+        self._last: NDArray[np.float32] | None = None
+        self._skip: int = self.delay
+
+    def __call__(self, data: NDArray[np.float32]) -> NDArray[np.float32]:
+        """Convolve the next block of data with shape=(n_channels, n_samples)."""
+        if data.shape[-1] == 0:
+            return np.zeros(data.shape, dtype=np.result_type(data, self.kernel))
+        if self._tail is None:
+            # Response to the constant signal preceding the first sample
+            past_gain = np.cumsum(self.kernel[::-1])[::-1][1:].astype(self.kernel.dtype)
+            self._tail = data[:, 0, np.newaxis] * past_gain
+
+        samples = data.shape[-1]
+        overlap = self._tail.shape[-1]
+        convolved = scipy.signal.oaconvolve(data, self.kernel[np.newaxis, :], mode="full", axes=-1)
+        convolved[:, :overlap] += self._tail
+        self._tail = convolved[:, samples:]
+        self._last = data[:, -1]
+
+        # Drop leading samples to compensate the group delay
+        skip = min(self._skip, samples)
+        self._skip -= skip
+        return convolved[:, skip:samples]
+
+    def flush(self) -> NDArray[np.float32] | None:
+        """Get the rest of the output delayed by the kernel."""
+        if self._tail is None:
+            return None
+        # Output samples not emitted yet are [skip, delay) in the tail coordinates.
+        start, stop = self._skip, self.delay
+        # Response to the constant signal following the last sample
+        future_gain = np.cumsum(self.kernel)[start:stop].astype(self.kernel.dtype)
+        rest = self._tail[:, start:stop] + self._last[:, np.newaxis] * future_gain
+        self._tail = None
+        self._skip = self.delay
+        return rest
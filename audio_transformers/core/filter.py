@@ -0,0 +1,208 @@
+import copy
+from abc import abstractmethod
+from typing import TypeAlias, Literal, get_args
+
+import numpy as np
+import scipy
+from numpy.typing import NDArray
+
+from audio_transformers.core.cache import DEFAULT_CACHE
+from audio_transformers.core.convolution import OverlapAdd
+from audio_transformers.core.model import Signal, SignalBatch
+from audio_transformers.core.precision import real_dtype
+from audio_transformers.core.transform import Transform, Context
+
+Engine: TypeAlias = Literal["iir", "fft"]
+
+# Bounds of the FIR kernel length (in samples)
+MIN_KERNEL_SIZE: int = 31
+MAX_KERNEL_SIZE: int = 2**15 + 1
+
+# Fraction of the impulse response energy preserved by the FIR kernel
+KERNEL_ENERGY: float = 1 - 1e-8
+
+# Number of samples filtered recursively at once (in double precision) before writing them to the output
+FILTER_CHUNK: int = 2**16
+
+
+class Filter(Transform):
+    """Abstract base for filters implemented as a cascade of second-order sections.
+
+    The filter may be applied by one of the two engines:
+      * "iir" - recursive filtering by the second-order sections
+      * "fft" - convolution with a linear-phase FIR kernel approximating
+        the magnitude response of the second-order sections. The kernel is
+        applied by FFT, which is faster and numerically stable for steep
+        roll-offs.
+
+    When used as a stream (see Transform.stream) the filter carries
+    its state from one block to the next, so that filtering a signal
+    block by block is equivalent to filtering it as a whole.
+    """
+
+    # Filtering independent chunks introduces transients at their edges
+    uniform: bool = False
+
+    engine: Engine = "iir"
+    _streaming: bool = False
+    _state: NDArray[np.float64] | None = None
+    _convolver: OverlapAdd | None = None
+    _rate: int | None = None
+
+    def __init__(self, engine: Engine = "iir"):
+        """
+        :param engine: Filtering engine ("iir" or "fft").
+        """
+        if engine not in get_args(Engine):
+            raise ValueError(f"Unknown filter engine: {engine}. Must be one of: {', '.join(get_args(Engine))}")
+        self.engine: Engine = engine
+
+    @abstractmethod
+    def design(self, rate: int) -> NDArray[np.float64] | None:
+        """Design second-order sections coefficients for the given sampling rate.
+
+        :param rate: Sampling rate of the filtered signal.
+        :return: Second-order sections or None if the filter has no effect.
+        """
+
+    def sos(self, rate: int) -> NDArray[np.float64] | None:
+        """Get cached second-order sections for the given sampling rate."""
+        return DEFAULT_CACHE.get(("sos", repr(self), rate), lambda: self.design(rate))
+
+    def kernel(self, rate: int) -> NDArray[np.float64] | None:
+        """Get cached linear-phase FIR kernel for the given sampling rate.
+
+        :param rate: Sampling rate of the filtered signal.
+        :return: Kernel of odd length or None if the filter has no effect.
+        """
+        return DEFAULT_CACHE.get(("fir", repr(self), rate), lambda: self._design_kernel(rate))
+
+    def _design_kernel(self, rate: int) -> NDArray[np.float64] | None:
+        """Design FIR kernel approximating magnitude response of the second-order sections."""
+        sos_coefficients = self.sos(rate)
+        if sos_coefficients is None:
+            return None
+
+        # Kernel must be long enough to hold the impulse response of the recursive filter.
+        half_size = response_length(sos_coefficients)
+        size = min(max(2 * half_size + 1, MIN_KERNEL_SIZE), MAX_KERNEL_SIZE)
+
+        frequencies = np.linspace(0, rate / 2, size)
+        _, response = scipy.signal.sosfreqz(sos_coefficients, worN=frequencies, fs=rate)
+        return scipy.signal.firwin2(size, frequencies, np.abs(response), window=("kaiser", 8.0), fs=rate)
+
+    def context(self, rate: int) -> Context:
+        """Recursive filter needs the preceding samples until its impulse response decays, FIR kernel is centered."""
+        if self.engine == "fft":
+            kernel = self.kernel(rate)
+            half_size = 0 if kernel is None else len(kernel) // 2
+            return Context(half_size, half_size)
+        sos_coefficients = self.sos(rate)
+        if sos_coefficients is None:
+            return Context()
+        key = ("response", repr(self), rate)
+        return Context(left=DEFAULT_CACHE.get(key, lambda: response_length(sos_coefficients)))
+
+    def stream(self) -> "Filter":
+        """Get a filter copy which keeps its state between consecutive blocks."""
+        stream = copy.copy(self)
+        stream._streaming = True
+        stream._state = None
+        stream._convolver = None
+        stream._rate = None
+        return stream
+
+    @property
+    def inplace(self) -> bool:
+        """Recursive filtering preserves the signal shape, FIR engine delays the output."""
+        return self.engine == "iir"
+
+    def __call__(self, signal: Signal) -> Signal:
+        if self.engine == "fft":
+            return self._convolve(signal)
+        return self._filter(signal)
+
+    def apply(self, signal: Signal, out: NDArray[np.float32] | None = None) -> Signal:
+        if self.engine == "fft":
+            return super().apply(signal, out)
+        return self._filter(signal, out)
+
+    def apply_batch(self, batch: SignalBatch) -> SignalBatch:
+        """Filter all channels of all signals in the batch by a single call."""
+        detached = self.stream()
+        detached._streaming = False
+        if self.engine == "fft":
+            # Kernel is applied to the signals extended by their last samples (see OverlapAdd)
+            flat = Signal(batch.extended().reshape(-1, batch.samples), batch.rate)
+            processed = detached._convolve(flat)
+        else:
+            # Recursive filter is causal, so padding doesn't affect the signals
+            processed = detached._filter(batch.flat())
+        data = processed.data.reshape(batch.data.shape)
+        return SignalBatch(data, batch.lengths, batch.rate).masked()
+
+    def flush(self) -> Signal | None:
+        """Get the output held back by the FIR kernel delay."""
+        if self._convolver is None:
+            return None
+        rest = self._convolver.flush()
+        self._convolver = None
+        if rest is None:
+            return None
+        return Signal(rest, self._rate)
+
+    def _filter(self, signal: Signal, out: NDArray[np.float32] | None = None) -> Signal:
+        """Apply recursive filter."""
+        sos_coefficients = self.sos(signal.rate)
+        if sos_coefficients is None or signal.samples == 0:
+            if out is None:
+                return signal
+            np.copyto(out, signal.data)
+            return Signal(out, signal.rate)
+
+        state = self._state
+        state_shape = (sos_coefficients.shape[0], signal.channels, 2)
+        if state is None or state.shape != state_shape:
+            # Start in the steady state for the first sample value
+            # to avoid transients at the beginning of the signal.
+            sos_start = scipy.signal.sosfilt_zi(sos_coefficients)
+            state = sos_start[:, np.newaxis, :] * signal.data[np.newaxis, :, 0, np.newaxis]
+
+        # Recursion is always computed in double precision to keep steep filters stable. It is computed by
+        # chunks carrying the state, so that only chunk-sized double-precision arrays are allocated.
+        if out is None:
+            out = np.empty(signal.data.shape, dtype=real_dtype())
+        for start in range(0, signal.samples, FILTER_CHUNK):
+            stop = start + FILTER_CHUNK
+            processed, state = scipy.signal.sosfilt(sos_coefficients, signal.data[:, start:stop], axis=-1, zi=state)
+            out[:, start:stop] = processed
+        if self._streaming:
+            self._state = state
+        return Signal(out, signal.rate)
+
+    def _convolve(self, signal: Signal) -> Signal:
+        """Apply FIR filter by FFT convolution."""
+        if signal.samples == 0:
+            return signal
+        convolver = self._convolver
+        if convolver is None:
+            kernel = self.kernel(signal.rate)
+            if kernel is None:
+                return signal
+            convolver = OverlapAdd(kernel.astype(real_dtype(), copy=False))
+
+        processed = convolver(signal.data)
+        if self._streaming:
+            self._convolver = convolver
+            self._rate = signal.rate
+        else:
+            processed = np.concatenate([processed, convolver.flush()], axis=-1)
+        return Signal(processed, signal.rate)
+
+
+def response_length(sos_coefficients: NDArray[np.float64]) -> int:
+    """Get number of samples holding the impulse response energy of the second-order sections (see KERNEL_ENERGY)."""
+    impulse = np.zeros(MAX_KERNEL_SIZE // 2)
+    impulse[0] = 1.0
+    energy = np.cumsum(scipy.signal.sosfilt(sos_coefficients, impulse) ** 2)
+    return int(np.searchsorted(energy, energy[-1] * KERNEL_ENERGY)) + 1
@@ -1,18 +1,93 @@
+import copy
+from typing import Tuple
+
 import numpy as np
+from numpy.typing import NDArray
 
 from audio_transformers.core.model import Signal
+from audio_transformers.core.precision import real_dtype
 from audio_transformers.core.transform import Transform
 
+# Seeded noise is generated by chunks of this many samples, each channel of a chunk from its own random stream
+NOISE_CHUNK: int = 1 << 16
+
 
 class GaussianNoise(Transform):
-    """Add gaussian noise to the signal."""
+    """Add gaussian noise to the signal.
+
+    If the seed is specified, the noise is reproducible: it is generated by
+    fixed chunks of the signal samples, each channel of each chunk gets its own
+    random stream spawned from the seed by the signal key, the chunk position
+    and the channel index (see Transform.for_signal and Transform.for_block).
+    So the noise added to each sample doesn't depend on how the signal is split
+    into blocks and whether the blocks are processed sequentially or by
+    independent workers.
+    """
+
+    inplace: bool = True
+
+    _key: Tuple[int, ...] = ()
+    _position: int = 0
+    _streaming: bool = False
 
-    def __init__(self, amplitude: float):
+    def __init__(self, amplitude: float, seed: int | None = None):
         """
         :param amplitude: Noise amplitude.
+        :param seed: Random seed, noise is not reproducible if not specified.
         """
         self.amplitude: float = amplitude
+        self.seed: int | None = seed
+
+    def for_signal(self, key: int) -> "GaussianNoise":
+        """Get transformation with random streams spawned by the signal key."""
+        transform = copy.copy(self)
+        transform._key = (key,)
+        return transform
+
+    def for_block(self, offset: int) -> "GaussianNoise":
+        """Get transformation generating the noise of the block starting at the given sample."""
+        transform = copy.copy(self)
+        transform._position = offset
+        transform._streaming = False
+        return transform
+
+    def stream(self) -> "GaussianNoise":
+        """Get transformation which advances the noise position by each block."""
+        stream = self.for_block(0)
+        stream._streaming = True
+        return stream
 
     def __call__(self, signal: Signal) -> Signal:
-        noise = self.amplitude * np.random.randn(*signal.data.shape)
-        return Signal(signal.data + noise, signal.rate)
+        return self.apply(signal)
+
+    def apply(self, signal: Signal, out: NDArray[np.float32] | None = None) -> Signal:
+        noise = out if out is not None else np.empty(signal.data.shape, dtype=real_dtype())
+        position = self._position
+        if self._streaming:
+            self._position += signal.samples
+        self._fill(noise, position)
+        noise *= self.amplitude
+        return Signal(np.add(noise, signal.data, out=noise), signal.rate)
+
+    def _fill(self, noise: NDArray[np.float32], position: int):
+        """Fill the array with the standard noise of the samples starting at the given position."""
+        if self.seed is None:
+            # Fresh OS entropy, so forked workers never share the state
+            generator = np.random.default_rng()
+            if noise.flags.c_contiguous:
+                generator.standard_normal(noise.shape, dtype=noise.dtype, out=noise)
+            else:
+                np.copyto(noise, generator.standard_normal(noise.shape, dtype=noise.dtype))
+            return
+        channels, samples = noise.shape
+        stop = position + samples
+        for chunk in range(position // NOISE_CHUNK, -(-stop // NOISE_CHUNK)):
+            chunk_start = chunk * NOISE_CHUNK
+            first, last = max(position, chunk_start), min(stop, chunk_start + NOISE_CHUNK)
+            source_first, target_first, target_last = first - chunk_start, first - position, last - position
+            for channel in range(channels):
+                # Leading values of a stream don't depend on the number of drawn values,
+                # so only the values up to the last sample of the block are drawn
+                seed = np.random.SeedSequence(self.seed, spawn_key=self._key + (chunk, channel))
+                values = np.random.default_rng(seed).standard_normal(last - chunk_start, dtype=noise.dtype)
+                noise[channel, target_first:target_last] = values[source_first:]
@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+@dataclass(frozen=True)
+class LinearMapping:
+    """Linear interpolation of sampled data at fixed fractional positions along an axis.
+
+    Interpolation indices and weights are computed once and then
+    applied to any data as a single gather along the given axis.
+    Positions outside of the data range are mapped to zero.
+    """
+
+    indices: NDArray[np.intp]
+    left_weights: NDArray[np.float32]
+    right_weights: NDArray[np.float32]
+
+    @staticmethod
+    def at(positions: NDArray[np.float64], size: int) -> "LinearMapping":
+        """Create mapping at fractional positions for axis of the given size."""
+        positions = np.asarray(positions, dtype=np.float64)
+        valid = (positions >= 0) & (positions <= size - 1)
+        indices = np.clip(np.floor(positions).astype(np.intp), 0, max(size - 2, 0))
+        fractions = np.where(valid, positions - indices, 0.0)
+        if size < 2:
+            fractions[:] = 0.0
+        left_weights = np.where(valid, 1.0 - fractions, 0.0)
+        right_weights = fractions
+        return LinearMapping(indices, left_weights.astype(np.float32), right_weights.astype(np.float32))
+
+    def __len__(self) -> int:
+        """Get number of interpolated positions."""
+        return len(self.indices)
+
+    def apply(self, data: NDArray, axis: int = -1) -> NDArray:
+        """Interpolate data along the given axis."""
+        shape = [1] * data.ndim
+        shape[axis] = len(self)
+        right_indices = np.minimum(self.indices + 1, data.shape[axis] - 1)
+        left = np.take(data, self.indices, axis=axis)
+        left *= self.left_weights.reshape(shape)
+        right = np.take(data, right_indices, axis=axis)
+        right *= self.right_weights.reshape(shape)
+        left += right
+        return left
@@ -1,9 +1,20 @@
-from audio_transformers.core.model import Signal
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.model import Signal, SignalBatch
 from audio_transformers.core.transform import Transform
 
 
 class Inversion(Transform):
     """Inverse waveform polarity by multiplying it by -1."""
 
+    inplace: bool = True
+
     def __call__(self, signal: Signal) -> Signal:
-        return Signal(-signal.data, signal.rate)
+        return self.apply(signal)
+
+    def apply(self, signal: Signal, out: NDArray[np.float32] | None = None) -> Signal:
+        return Signal(np.negative(signal.data, out=out), signal.rate)
+
+    def apply_batch(self, batch: SignalBatch) -> SignalBatch:
+        return SignalBatch(-batch.data, batch.lengths, batch.rate)
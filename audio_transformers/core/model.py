@@ -1,8 +1,12 @@
+import bisect
 from dataclasses import dataclass
+from typing import Sequence, List, Iterable, Iterator
 
 import numpy as np
 from numpy.typing import NDArray
 
+from audio_transformers.core.precision import real_dtype
+
 
 @dataclass
 class Signal:
@@ -13,12 +17,16 @@ class Signal:
     we pass sampled data. So sampled data alone is incomplete and this is
     a good idea to combine the two.
 
-    Signal data must have shape=(n_channels, n_samples) and dtype=float32.
+    Signal data must have shape=(n_channels, n_samples). Data is converted
+    to float32 (or float64 if double precision is set, see core.precision).
     """
 
     data: NDArray[np.float32]
     rate: int
 
+    def __post_init__(self):
+        self.data = np.asarray(self.data, dtype=real_dtype())
+
     @property
     def channels(self) -> int:
         """Get number of channels."""
@@ -34,6 +42,15 @@ class Signal:
         """Get signal duration in seconds."""
         return self.samples / self.rate
 
+    @property
+    def interleaved(self) -> bool:
+        """Check if samples of different channels are interleaved in memory.
+
+        Decoded signals are transposed views of the interleaved (n_samples, n_channels)
+        data, they are written back without copying if the layout is preserved.
+        """
+        return self.channels > 1 and self.data.T.flags.c_contiguous
+
     def concatenate(self, other: "Signal") -> "Signal":
         """Concatenate two signals."""
         if other.rate != self.rate:
@@ -61,3 +78,184 @@ class Signal:
     def __getitem__(self, slice_spec):
         """Shortcut to slice channel."""
         return Signal(self.data[:, slice_spec], self.rate)
+
+
+class ChunkedSignal:
+    """Signal stored as a sequence of chunks.
+
+    Appending a chunk, concatenating and slicing chunked signals don't copy
+    sample data, so a long signal could be assembled from many blocks in
+    linear time. Contiguous data is materialized only when it is requested
+    by `to_signal`.
+    """
+
+    def __init__(self, chunks: Iterable[Signal] = ()):
+        """
+        :param chunks: Consecutive chunks of the signal.
+        """
+        self._chunks: List[Signal] = []
+        self._ends: List[int] = []  # End sample of each chunk
+        self.extend(chunks)
+
+    @property
+    def rate(self) -> int | None:
+        """Get sampling rate, it is unknown until the first chunk is added."""
+        return self._chunks[0].rate if self._chunks else None
+
+    @property
+    def channels(self) -> int | None:
+        """Get number of channels, it is unknown until the first chunk is added."""
+        return self._chunks[0].channels if self._chunks else None
+
+    @property
+    def samples(self) -> int:
+        """Get total number of samples."""
+        return self._ends[-1] if self._ends else 0
+
+    @property
+    def duration(self) -> float:
+        """Get signal duration in seconds."""
+        return self.samples / self.rate if self._chunks else 0.0
+
+    @property
+    def chunks(self) -> Sequence[Signal]:
+        """Get signal chunks."""
+        return tuple(self._chunks)
+
+    def append(self, chunk: Signal):
+        """Append chunk to the end of the signal."""
+        if self._chunks:
+            if chunk.rate != self.rate:
+                raise ValueError(f"Incompatible sampling rate: {chunk.rate} != {self.rate}")
+            if chunk.channels != self.channels:
+                raise ValueError(f"Incompatible number of channels: {chunk.channels} != {self.channels}")
+        if chunk.samples == 0 and self._chunks:
+            return
+        self._chunks.append(chunk)
+        self._ends.append(self.samples + chunk.samples)
+
+    def extend(self, chunks: Iterable[Signal]):
+        """Append chunks to the end of the signal."""
+        for chunk in chunks:
+            self.append(chunk)
+
+    def concatenate(self, other: "ChunkedSignal | Signal") -> "ChunkedSignal":
+        """Concatenate two signals without copying their data."""
+        result = ChunkedSignal(self._chunks)
+        result.extend(other.chunks if isinstance(other, ChunkedSignal) else (other,))
+        return result
+
+    def to_signal(self) -> Signal:
+        """Get signal with contiguous data.
+
+        Chunks are replaced by the materialized signal, so that the data is copied only once.
+        """
+        if not self._chunks:
+            raise ValueError("Cannot materialize empty signal with unknown sampling rate.")
+        if len(self._chunks) > 1:
+            data = np.concatenate([chunk.data for chunk in self._chunks], axis=-1)
+            self._chunks = [Signal(data, self.rate)]
+            self._ends = [self.samples]
+        return self._chunks[0]
+
+    def __add__(self, other: "ChunkedSignal | Signal") -> "ChunkedSignal":
+        """Concatenate two signals."""
+        return self.concatenate(other)
+
+    def __len__(self) -> int:
+        """Get signal samples."""
+        return self.samples
+
+    def __iter__(self) -> Iterator[Signal]:
+        """Iterate over chunks."""
+        return iter(self._chunks)
+
+    def __getitem__(self, slice_spec: slice) -> "ChunkedSignal":
+        """Slice samples without copying the data."""
+        start, stop, step = slice_spec.indices(self.samples)
+        if step != 1:
+            raise ValueError("Chunked signal doesn't support slicing with step.")
+        result = ChunkedSignal()
+        index = bisect.bisect_right(self._ends, start)
+        while index < len(self._chunks) and start < stop:
+            chunk_start = self._ends[index] - self._chunks[index].samples
+            chunk_stop = min(stop, self._ends[index])
+            first, last = start - chunk_start, chunk_stop - chunk_start
+            result.append(self._chunks[index][first:last])
+            start = chunk_stop
+            index += 1
+        if not result._chunks and self._chunks:
+            result.append(self._chunks[0][0:0])
+        return result
+
+
+@dataclass
+class SignalBatch:
+    """Batch of signals with the same sampling rate and number of channels.
+
+    Many short signals could be processed by a single vectorized call
+    instead of a call per signal. Data has shape=(n_signals, n_channels,
+    n_samples) where n_samples is the length of the longest signal, shorter
+    signals are padded with zeros. Actual length of each signal is stored
+    in `lengths`.
+    """
+
+    data: NDArray[np.float32]
+    lengths: NDArray[np.intp]
+    rate: int
+
+    def __post_init__(self):
+        self.data = np.asarray(self.data, dtype=real_dtype())
+        self.lengths = np.asarray(self.lengths, dtype=np.intp)
+        if self.data.ndim != 3 or self.lengths.shape != self.data.shape[:1]:
+            raise ValueError(f"Incompatible batch data shape {self.data.shape} and lengths shape {self.lengths.shape}")
+
+    @staticmethod
+    def from_signals(signals: Sequence[Signal]) -> "SignalBatch":
+        """Combine signals into a batch."""
+        if len(signals) == 0:
+            raise ValueError("Cannot create batch from empty sequence of signals.")
+        rate, channels = signals[0].rate, signals[0].channels
+        for signal in signals:
+            if signal.rate != rate:
+                raise ValueError(f"Incompatible sampling rate: {signal.rate} != {rate}")
+            if signal.channels != channels:
+                raise ValueError(f"Incompatible number of channels: {signal.channels} != {channels}")
+        lengths = np.array([signal.samples for signal in signals], dtype=np.intp)
+        data = np.zeros((len(signals), channels, lengths.max()), dtype=real_dtype())
+        for item, signal in zip(data, signals):
+            item[:, : signal.samples] = signal.data
+        return SignalBatch(data, lengths, rate)
+
+    @property
+    def channels(self) -> int:
+        """Get number of channels."""
+        return self.data.shape[1]
+
+    @property
+    def samples(self) -> int:
+        """Get number of samples of the padded signals."""
+        return self.data.shape[-1]
+
+    def flat(self) -> Signal:
+        """Get signal with all channels of all items stacked (no data is copied)."""
+        return Signal(self.data.reshape(-1, self.samples), self.rate)
+
+    def extended(self) -> NDArray[np.float32]:
+        """Get data with each item padded by its last sample instead of zeros."""
+        positions = np.minimum(np.arange(self.samples), np.maximum(self.lengths, 1)[:, np.newaxis] - 1)
+        return np.take_along_axis(self.data, positions[:, np.newaxis, :], axis=-1)
+
+    def masked(self) -> "SignalBatch":
+        """Reset padding samples to zero."""
+        valid = np.arange(self.samples) < self.lengths[:, np.newaxis]
+        self.data *= valid[:, np.newaxis, :]
+        return self
+
+    def to_signals(self) -> List[Signal]:
+        """Split batch into separate signals."""
+        return [Signal(item[:, :length], self.rate) for item, length in zip(self.data, self.lengths)]
+
+    def __len__(self) -> int:
+        """Get number of signals in the batch."""
+        return len(self.lengths)
@@ -0,0 +1,265 @@
+import abc
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from typing import Sequence, List, Iterator
+
+from audio_transformers.core.cascade import FilterCascade
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.filter import Filter
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.spectral import SpectralTransform, SpectralChain
+from audio_transformers.core.speed_perturbation import SpeedPerturbation
+from audio_transformers.core.transform import Transform
+
+
+class Rule(abc.ABC):
+    """Abstract base for plan rewrite rules.
+
+    Rule matches a fixed number of consecutive stages and replaces
+    them with an equivalent shorter sequence of stages.
+    """
+
+    # Number of consecutive stages matched by the rule
+    arity: int = 1
+
+    # Human-readable rule description
+    description: str = ""
+
+    @abstractmethod
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        """Get replacement for the matched stages.
+
+        :param stages: Consecutive stages, exactly `arity` of them.
+        :return: Replacement stages or None if the rule is not applicable.
+        """
+
+
+class DoubleInversion(Rule):
+    """Two consecutive polarity inversions cancel each other out."""
+
+    arity = 2
+    description = "Remove double inversion"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        if all(isinstance(stage, Inversion) for stage in stages):
+            return ()
+        return None
+
+
+class SilentNoise(Rule):
+    """Zero-amplitude noise has no effect."""
+
+    description = "Remove zero-amplitude noise"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        (stage,) = stages
+        if isinstance(stage, GaussianNoise) and stage.amplitude == 0:
+            return ()
+        return None
+
+
+class ZeroPitchShift(Rule):
+    """Zero pitch shift has no effect."""
+
+    description = "Remove zero pitch shift"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        (stage,) = stages
+        if isinstance(stage, PitchShift) and stage.shift == 0:
+            return ()
+        return None
+
+
+class UnitSpeed(Rule):
+    """Speed perturbation by factor 1.0 has no effect."""
+
+    description = "Remove unit speed perturbation"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        (stage,) = stages
+        if isinstance(stage, SpeedPerturbation) and stage.speed_factor == 1:
+            return ()
+        return None
+
+
+class MergePitchShifts(Rule):
+    """Consecutive pitch shifts with the same window add up."""
+
+    arity = 2
+    description = "Merge consecutive pitch shifts"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        first, second = stages
+        if not isinstance(first, PitchShift) or not isinstance(second, PitchShift):
+            return None
+        if first.window_size != second.window_size:
+            return None
+        return (PitchShift(first.shift + second.shift, first.window_size),)
+
+
+class MergeSpeedPerturbations(Rule):
+    """Consecutive speed perturbations with the same settings multiply."""
+
+    arity = 2
+    description = "Merge consecutive speed perturbations"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        first, second = stages
+        if not isinstance(first, SpeedPerturbation) or not isinstance(second, SpeedPerturbation):
+            return None
+        if first.window_size != second.window_size or first.phase_vocoder != second.phase_vocoder:
+            return None
+        speed_factor = first.speed_factor * second.speed_factor
+        return (SpeedPerturbation(speed_factor, first.window_size, first.phase_vocoder),)
+
+
+class FuseFilters(Rule):
+    """Adjacent filters with the same engine are applied as a single cascade."""
+
+    arity = 2
+    description = "Fuse adjacent filters into a single cascade"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        if not all(isinstance(stage, Filter) for stage in stages):
+            return None
+        if len({stage.engine for stage in stages}) > 1:
+            return None
+        filters: List[Filter] = []
+        for stage in stages:
+            if isinstance(stage, FilterCascade):
+                filters.extend(stage.filters)
+            else:
+                filters.append(stage)
+        return (FilterCascade(filters),)
+
+
+class ShareSpectre(Rule):
+    """Consecutive spectral transformations with the same STFT parameters share a single STFT."""
+
+    arity = 2
+    description = "Share spectre between spectral transformations"
+
+    def rewrite(self, stages: Sequence[Transform]) -> Sequence[Transform] | None:
+        if not all(isinstance(stage, SpectralTransform) for stage in stages):
+            return None
+        if len({(stage.window_size, stage.hop_ratio) for stage in stages}) > 1:
+            return None
+        transforms: List[SpectralTransform] = []
+        for stage in stages:
+            if isinstance(stage, SpectralChain):
+                transforms.extend(stage.transforms)
+            else:
+                transforms.append(stage)
+        return (SpectralChain(transforms),)
+
+
+DEFAULT_RULES: Sequence[Rule] = (
+    SilentNoise(),
+    ZeroPitchShift(),
+    UnitSpeed(),
+    DoubleInversion(),
+    MergePitchShifts(),
+    MergeSpeedPerturbations(),
+    FuseFilters(),
+    ShareSpectre(),
+)
+
+
+@dataclass
+class Rewrite:
+    """Single rewrite applied to the plan."""
+
+    description: str
+    before: Sequence[Transform]
+    after: Sequence[Transform]
+
+
+@dataclass
+class Plan:
+    """Optimized transformation plan."""
+
+    original: Sequence[Transform]
+    transform: Composite
+    rewrites: Sequence[Rewrite] = field(default_factory=tuple)
+
+    def explain(self) -> str:
+        """Get human-readable description of the plan rewrites."""
+        lines = ["Original plan:"]
+        lines.extend(Plan._stages(self.original))
+        lines.append("Rewrites:")
+        for rewrite in self.rewrites:
+            before = ", ".join(map(repr, rewrite.before))
+            after = ", ".join(map(repr, rewrite.after)) or "(nothing)"
+            lines.append(f"  * {rewrite.description}: {before} -> {after}")
+        if len(self.rewrites) == 0:
+            lines.append("  (none)")
+        lines.append("Optimized plan:")
+        lines.extend(Plan._stages(self.transform.transforms))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _stages(stages: Sequence[Transform]) -> Iterator[str]:
+        """Format plan stages."""
+        for index, stage in enumerate(stages, start=1):
+            yield f"  {index}. {stage!r}"
+        if len(stages) == 0:
+            yield "  (identity)"
+
+
+class Optimizer:
+    """Rewrites a sequence of transformations into an equivalent but cheaper one."""
+
+    rules: Sequence[Rule]
+
+    def __init__(self, rules: Sequence[Rule] | None = None):
+        """
+        :param rules: Rewrite rules applied to the plan.
+        """
+        self.rules = DEFAULT_RULES if rules is None else tuple(rules)
+
+    def optimize(self, transform: Transform) -> Plan:
+        """Optimize the transformation."""
+        original = tuple(Optimizer.flatten(transform))
+        stages: List[Transform] = list(original)
+        rewrites: List[Rewrite] = []
+        changed = True
+        while changed:
+            changed = False
+            for rule in self.rules:
+                changed = self._apply(rule, stages, rewrites) or changed
+        return Plan(original=original, transform=Composite(stages), rewrites=tuple(rewrites))
+
+    @staticmethod
+    def _apply(rule: Rule, stages: List[Transform], rewrites: List[Rewrite]) -> bool:
+        """Apply rule to the stages in-place, return True if any rewrite happened."""
+        changed = False
+        index = 0
+        while index + rule.arity <= len(stages):
+            stop = index + rule.arity
+            matched = stages[index:stop]
+            replacement = rule.rewrite(matched)
+            if replacement is None:
+                index += 1
+                continue
+            rewrites.append(Rewrite(rule.description, tuple(matched), tuple(replacement)))
+            stages[index:stop] = replacement
+            # Replacement may form a new match with the previous stage
+            index = max(index - 1, 0)
+            changed = True
+        return changed
+
+    @staticmethod
+    def flatten(transform: Transform) -> Iterator[Transform]:
+        """Flatten nested composite transformations."""
+        if isinstance(transform, Composite):
+            for stage in transform.transforms:
+                yield from Optimizer.flatten(stage)
+        else:
+            yield transform
+
+
+def optimize(transform: Transform) -> Plan:
+    """Optimize transformation with default rules."""
+    return Optimizer().optimize(transform)
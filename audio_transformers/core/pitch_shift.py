@@ -1,13 +1,18 @@
 import numpy as np
-from scipy.interpolate import interp1d
-from scipy.signal import ShortTimeFFT
-from scipy.signal.windows import gaussian
+from numpy.typing import NDArray
 
-from audio_transformers.core.model import Signal
-from audio_transformers.core.transform import Transform
+from audio_transformers.core.cache import DEFAULT_CACHE
+from audio_transformers.core.interpolation import LinearMapping
+from audio_transformers.core.spectral import SpectralTransform
+from audio_transformers.core.stft import StreamingSTFT
 
 
-class PitchShift(Transform):
+def frequency_mapping(bins: int, factor: float) -> LinearMapping:
+    """Get (cached) mapping from the target frequency bins to the (fractional) source bins."""
+    return DEFAULT_CACHE.get(("pitch", bins, factor), lambda: LinearMapping.at(np.arange(bins) * factor, bins))
+
+
+class PitchShift(SpectralTransform):
     """Pitch shift transformation."""
 
     def __init__(self, shift: float, fft_window_size: float = 0.1):
@@ -18,21 +23,9 @@ class PitchShift(Transform):
         self.shift: float = shift
         self.window_size: float = fft_window_size
 
-    def __call__(self, signal: Signal) -> Signal:
-        window_size_samples = int(self.window_size * signal.rate)  # Window size in samples
-        hop_samples = window_size_samples // 2
-        window = gaussian(window_size_samples, std=window_size_samples // 2, sym=True)
-        stft = ShortTimeFFT(window, hop=hop_samples, fs=signal.rate, scale_to="magnitude")
-        spectre = stft.stft(signal.data)
-
-        # Now we need to scale frequencies of the spectre
-        spectre_func = interp1d(stft.f, spectre, axis=-2, bounds_error=False, fill_value=0.0)
-        factor = 2**-self.shift
-        result_spectre = np.zeros_like(spectre)
-        for i, freq in enumerate(stft.f):
-            result_spectre[:, i, :] = spectre_func(freq * factor)
-        output = stft.istft(result_spectre)
-
-        # truncate extra window-size in output signal
-        output = output[:, : signal.data.shape[-1]]
-        return Signal(output, signal.rate)
+    def transform_spectre(self, spectre: NDArray[np.complex64], stft: StreamingSTFT, last: bool) -> NDArray:
+        # Now we need to scale frequencies of the spectre: the target
+        # frequency f is taken from the source frequency f * 2^-shift.
+        # Frequencies are evenly spaced, so we can map bin indices directly.
+        mapping = frequency_mapping(stft.bins, 2**-self.shift)
+        return mapping.apply(spectre, axis=-2)
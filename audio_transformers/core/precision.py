@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TypeAlias, Literal, Mapping, get_args
+
+import numpy as np
+
+Precision: TypeAlias = Literal["single", "double"]
+
+
+@dataclass(frozen=True)
+class PrecisionPolicy:
+    """Sample and spectre data types used by all transformations."""
+
+    name: Precision
+    real: type[np.floating]
+    complex: type[np.complexfloating]
+
+
+POLICIES: Mapping[Precision, PrecisionPolicy] = MappingProxyType(
+    {
+        "single": PrecisionPolicy("single", np.float32, np.complex64),
+        "double": PrecisionPolicy("double", np.float64, np.complex128),
+    }
+)
+
+# Single precision is enough for audio and halves memory traffic of each stage
+_policy: PrecisionPolicy = POLICIES["single"]
+
+
+def set_precision(precision: Precision):
+    """Set process-wide precision of the signal and spectre data."""
+    global _policy
+    if precision not in POLICIES:
+        raise ValueError(f"Unknown precision: {precision}. Must be one of: {', '.join(get_args(Precision))}")
+    _policy = POLICIES[precision]
+
+
+def get_precision() -> Precision:
+    """Get current precision name."""
+    return _policy.name
+
+
+def real_dtype() -> type[np.floating]:
+    """Get data type of the signal samples."""
+    return _policy.real
+
+
+def complex_dtype() -> type[np.complexfloating]:
+    """Get data type of the spectre values."""
+    return _policy.complex
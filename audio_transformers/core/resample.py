@@ -0,0 +1,133 @@
+import copy
+import math
+from fractions import Fraction
+
+import numpy as np
+import scipy
+from numpy.typing import NDArray
+
+from audio_transformers.core.cache import DEFAULT_CACHE
+from audio_transformers.core.model import Signal
+from audio_transformers.core.precision import real_dtype
+from audio_transformers.core.transform import Transform
+
+
+def resampling_kernel(up: int, down: int) -> NDArray[np.float64]:
+    """Get (cached) low-pass kernel for rational resampling, the same as used by scipy's resample_poly."""
+
+    def design() -> NDArray[np.float64]:
+        max_rate = max(up, down)
+        half_size = 10 * max_rate
+        return scipy.signal.firwin(2 * half_size + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * up
+
+    return DEFAULT_CACHE.get(("resample", up, down), design)
+
+
+class Resample(Transform):
+    """Change sampling rate by rational polyphase resampling.
+
+    The signal is upsampled, filtered and downsampled by a single
+    polyphase FIR filter. When used as a stream (see Transform.stream)
+    the resampler keeps the input samples still needed by the filter,
+    so that resampling a signal block by block gives the same result as
+    resampling it as a whole. The signal is assumed to be constant before
+    the first sample and after the last sample.
+    """
+
+    # Independent chunks would be resampled with edge effects
+    uniform: bool = False
+
+    _streaming: bool = False
+    _input: NDArray[np.float32] | None = None
+    _start: int = 0  # Input index of the first buffered sample
+    _received: int = 0  # Total number of input samples
+    _next: int = 0  # Index of the next output sample
+    _rate: int | None = None  # Input sampling rate
+
+    def __init__(self, rate: int):
+        """
+        :param rate: Target sampling rate (Hz).
+        """
+        if rate <= 0:
+            raise ValueError(f"Sampling rate must be positive: {rate}")
+        self.rate: int = rate
+
+    def output_rate(self, rate: int) -> int:
+        return self.rate
+
+    def stream(self) -> "Resample":
+        """Get resampler which keeps the filter input between consecutive blocks."""
+        stream = copy.copy(self)
+        stream._streaming = True
+        stream._input = None
+        stream._start = stream._received = stream._next = 0
+        stream._rate = None
+        return stream
+
+    def __call__(self, signal: Signal) -> Signal:
+        if signal.rate == self.rate:
+            return signal
+        if not self._streaming:
+            stream = self.stream()
+            output = stream(signal)
+            rest = stream.flush()
+            return output if rest is None else output + rest
+
+        up, down = self._ratio(signal.rate)
+        kernel = resampling_kernel(up, down)
+        if self._input is None:
+            # Constant signal preceding the first sample
+            padding = math.ceil(len(kernel) / up) + 1
+            self._input = np.repeat(signal.data[:, :1], padding, axis=-1)
+            self._start = -padding
+            self._rate = signal.rate
+        self._input = np.concatenate([self._input, signal.data], axis=-1)
+        self._received += signal.samples
+
+        # Output sample requires input samples up to its position
+        delay = (len(kernel) - 1) // 2
+        end = (self._received * up - 1 - delay) // down + 1
+        return Signal(self._resample(kernel, up, down, end), self.rate)
+
+    def flush(self) -> Signal | None:
+        """Resample the rest of the signal using its last sample as the following input."""
+        if self._input is None:
+            return None
+        up, down = self._ratio(self._rate)
+        kernel = resampling_kernel(up, down)
+        padding = math.ceil(len(kernel) / up) + 1
+        self._input = np.concatenate([self._input, np.repeat(self._input[:, -1:], padding, axis=-1)], axis=-1)
+        output = self._resample(kernel, up, down, math.ceil(self._received * up / down))
+        self._input = None
+        return Signal(output, self.rate)
+
+    def _ratio(self, rate: int) -> tuple[int, int]:
+        """Get irreducible upsampling and downsampling factors."""
+        ratio = Fraction(self.rate, rate)
+        return ratio.numerator, ratio.denominator
+
+    def _resample(self, kernel: NDArray[np.float64], up: int, down: int, end: int) -> NDArray[np.float32]:
+        """Get output samples from the next one up to the given end."""
+        first = self._next
+        if end <= first:
+            return np.zeros((self._input.shape[0], 0), dtype=real_dtype())
+
+        # Output sample m is at position m * down + delay of the upsampled filter output
+        delay = (len(kernel) - 1) // 2
+        start = max((first * down + delay - len(kernel) + 1) // up, self._start)
+        # Kernel is shifted, so that filter outputs downsampled by upfirdn hit the output positions
+        shift = (start * up - delay) % down
+        offset = (start * up - shift - delay) // down
+        shifted = np.concatenate([np.zeros(shift), kernel]).astype(real_dtype())
+        offset_input = start - self._start
+        filtered = scipy.signal.upfirdn(shifted, self._input[:, offset_input:], up, down, axis=-1)
+        first_output, end_output = first - offset, end - offset
+        output = filtered[:, first_output:end_output]
+
+        # Drop input samples which are not needed by the next outputs
+        self._next = end
+        keep_from = max((end * down + delay - len(kernel) + 1) // up, self._start)
+        keep_input = keep_from - self._start
+        self._input = self._input[:, keep_input:]
+        self._start = keep_from
+        return output.astype(real_dtype(), copy=False)
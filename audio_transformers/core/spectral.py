@@ -0,0 +1,144 @@
+import copy
+from abc import abstractmethod
+from typing import Sequence
+
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.model import Signal, SignalBatch
+from audio_transformers.core.stft import StreamingSTFT
+from audio_transformers.core.transform import Transform, Context
+
+
+class SpectralTransform(Transform):
+    """Abstract base for transformations of the Short-Time Fourier spectre.
+
+    The signal is analysed by the Gaussian-window STFT, the spectre is
+    transformed frame by frame and then synthesized back. When used as
+    a stream (see Transform.stream) the STFT engine carries the window
+    tail and the pending overlap-add buffer between blocks, so that block
+    by block processing gives the same result as processing the whole signal.
+    """
+
+    # Applying the transformation to independent chunks introduces edge effects
+    uniform: bool = False
+
+    # Each output frame depends only on the input frames around the same position,
+    # so zero-padded signals of a batch could share a single STFT.
+    batchable: bool = True
+
+    window_size: float
+    _streaming: bool = False
+    _stft: StreamingSTFT | None = None
+    _rate: int | None = None
+
+    @property
+    def hop_ratio(self) -> float:
+        """Get distance between consecutive frames relative to the window size."""
+        return 0.5
+
+    @abstractmethod
+    def transform_spectre(self, spectre: NDArray[np.complex64], stft: StreamingSTFT, last: bool) -> NDArray:
+        """Transform the next frames of the spectre.
+
+        :param spectre: The next frames with shape=(n_channels, n_bins, n_frames)
+        :param stft: STFT engine used to get the spectre
+        :param last: Indicates the last frames of the signal
+        :return: Transformed frames, their number may differ from the input.
+        """
+
+    def output_samples(self, samples: int) -> int:
+        """Get the total number of output samples for the given number of input samples."""
+        return samples
+
+    def context(self, rate: int) -> Context | None:
+        """Output samples depend on the frames covering them, blocks must start at the frame grid."""
+        stft = StreamingSTFT.gaussian(self.window_size, rate, self.hop_ratio)
+        return Context(stft.size, stft.size, stft.hop)
+
+    def stream(self) -> "SpectralTransform":
+        """Get a transformation copy which keeps STFT state between consecutive blocks."""
+        stream = copy.copy(self)
+        stream._streaming = True
+        stream._stft = None
+        stream._rate = None
+        stream.reset()
+        return stream
+
+    def reset(self):
+        """Reset spectre transformation state carried between consecutive frames."""
+
+    def __call__(self, signal: Signal) -> Signal:
+        if not self._streaming:
+            stream = self.stream()
+            output = stream(signal)
+            return Signal(np.concatenate([output.data, stream.flush().data], axis=-1), signal.rate)
+
+        if self._stft is None:
+            self._stft = StreamingSTFT.gaussian(self.window_size, signal.rate, self.hop_ratio)
+            self._rate = signal.rate
+        spectre = self._stft.analyze(signal.data)
+        output = self._stft.synthesize(self.transform_spectre(spectre, self._stft, last=False))
+        return Signal(output, signal.rate)
+
+    def apply_batch(self, batch: SignalBatch) -> SignalBatch:
+        """Transform all channels of all signals in the batch by a single STFT."""
+        if not self.batchable:
+            return super().apply_batch(batch)
+        output = self(batch.flat())
+        lengths = [self.output_samples(int(length)) for length in batch.lengths]
+        data = output.data.reshape(len(batch), batch.channels, -1)
+        return SignalBatch(data, lengths, batch.rate).masked()
+
+    def flush(self) -> Signal | None:
+        """Synthesize the rest of the signal after the last frames."""
+        if self._stft is None:
+            return None
+        spectre = self.transform_spectre(self._stft.analyze_rest(), self._stft, last=True)
+        output = self._stft.synthesize_rest(spectre, self.output_samples(self._stft.samples))
+        self._stft = None
+        return Signal(output, self._rate)
+
+
+class SpectralChain(SpectralTransform):
+    """Sequence of spectral transformations sharing a single STFT.
+
+    The signal is analysed once, the spectre is passed through each
+    transformation and then synthesized once. All the transformations
+    must use the same STFT window size and hop.
+    """
+
+    def __init__(self, transforms: Sequence[SpectralTransform]):
+        """
+        :param transforms: Spectral transformations to be applied in sequence.
+        """
+        if len({(item.window_size, item.hop_ratio) for item in transforms}) != 1:
+            raise ValueError("Spectral transformations must have the same non-empty STFT parameters.")
+        self.transforms: Sequence[SpectralTransform] = tuple(transforms)
+        self.window_size: float = self.transforms[0].window_size
+
+    @property
+    def hop_ratio(self) -> float:
+        return self.transforms[0].hop_ratio
+
+    @property
+    def batchable(self) -> bool:
+        return all(transform.batchable for transform in self.transforms)
+
+    def context(self, rate: int) -> Context | None:
+        if any(transform.context(rate) is None for transform in self.transforms):
+            return None
+        return super().context(rate)
+
+    def output_samples(self, samples: int) -> int:
+        for transform in self.transforms:
+            samples = transform.output_samples(samples)
+        return samples
+
+    def reset(self):
+        self.transforms = tuple(transform.stream() for transform in self.transforms)
+
+    def transform_spectre(self, spectre: NDArray[np.complex64], stft: StreamingSTFT, last: bool) -> NDArray:
+        for transform in self.transforms:
+            spectre = transform.transform_spectre(spectre, stft, last)
+        return spectre
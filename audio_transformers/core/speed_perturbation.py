@@ -1,52 +1,121 @@
 import math
 
 import numpy as np
-from scipy.interpolate import interp1d
-from scipy.signal import ShortTimeFFT
-from scipy.signal.windows import gaussian
+from numpy.typing import NDArray
 
-from audio_transformers.core.model import Signal
-from audio_transformers.core.transform import Transform
+from audio_transformers.core.interpolation import LinearMapping
+from audio_transformers.core.spectral import SpectralTransform
+from audio_transformers.core.stft import StreamingSTFT
+from audio_transformers.core.transform import Context
 
 
-class SpeedPerturbation(Transform):
+class SpeedPerturbation(SpectralTransform):
     """Speed perturbation transformer."""
 
-    def __init__(self, speed_factor: float, window_size: float = 0.1):
+    # Time warp depends on where each signal ends
+    batchable: bool = False
+
+    _frames: NDArray[np.complex64] | None
+    _first: int
+    _received: int
+    _target: int
+    _phase: NDArray[np.float64] | None
+
+    def __init__(self, speed_factor: float, window_size: float = 0.1, phase_vocoder: bool = False):
         """
         :param speed_factor: Speed perturbation factor.
         :param window_size: Short Time FFT window size in seconds.
+        :param phase_vocoder: Propagate phase instead of interpolating complex spectre.
         """
         self.speed_factor: float = speed_factor
         self.window_size: float = window_size
+        self.phase_vocoder: bool = phase_vocoder
+        self.reset()
+
+    @property
+    def hop_ratio(self) -> float:
+        # Phase propagation requires denser frames to resolve frequency deviations
+        return 0.25 if self.phase_vocoder else 0.5
+
+    def output_samples(self, samples: int) -> int:
+        return round(samples / self.speed_factor)
+
+    def context(self, rate: int) -> Context | None:
+        # Output blocks don't correspond to the input blocks sample by sample
+        return None
+
+    def reset(self):
+        self._frames = None  # Source frames which are still needed
+        self._first = 0  # Index of the first buffered source frame
+        self._received = 0  # Total number of received source frames
+        self._target = 0  # Index of the next target frame
+        self._phase = None  # Phase of the last target frame
+
+    def transform_spectre(self, spectre: NDArray[np.complex64], stft: StreamingSTFT, last: bool) -> NDArray:
+        # Now we need to stretch or squeeze spectrogram depending on the speed factor.
+        # Each target frame is taken from the (fractional) source frame position.
+        if self._frames is None:
+            self._frames = spectre
+        else:
+            self._frames = np.concatenate([self._frames, spectre], axis=-1)
+        self._received += spectre.shape[-1]
+
+        if last:
+            # Positions beyond the last source frame are mapped to silence
+            target_end = max(math.floor(self._received / self.speed_factor), 1)
+        else:
+            # Interpolation needs source frames on both sides of the position
+            target_end = math.ceil((self._received - 1) / self.speed_factor)
+        targets = np.arange(self._target, max(target_end, self._target))
+        positions = targets * self.speed_factor - self._first
+        mapping = LinearMapping.at(positions, self._frames.shape[-1])
+
+        if self.phase_vocoder:
+            target_spectre = self._vocode(mapping, 2 * np.pi * stft.hop / stft.size)
+        else:
+            target_spectre = mapping.apply(self._frames, axis=-1)
+
+        # Drop source frames which are not needed for the next targets
+        self._target += len(targets)
+        keep_from = max(math.floor((self._target - 1) * self.speed_factor), self._first)
+        dropped, self._first = keep_from - self._first, keep_from
+        self._frames = self._frames[..., dropped:]
+        return target_spectre
+
+    def _vocode(self, mapping: LinearMapping, hop_phase: float) -> NDArray[np.complex64]:
+        """Interpolate magnitudes and accumulate phase advances along the time axis.
+
+        :param mapping: Mapping from the target frames to the buffered source frames
+        :param hop_phase: Phase advance of the first bin between frames
+        """
+        frames = self._frames
+        magnitude = mapping.apply(np.abs(frames), axis=-1)
+        if len(mapping) == 0:
+            return magnitude.astype(frames.dtype)
+        phase = np.angle(frames)
+
+        # Expected phase advance between frames for each bin is 2*pi*k*hop/mfft,
+        # deviation from it is the frequency offset of the bin's partial.
+        expected = hop_phase * np.arange(frames.shape[-2])[:, np.newaxis]
+        if frames.shape[-1] < 2:
+            advance = np.zeros(frames.shape[:-1] + (1,))
+        else:
+            deviation = np.diff(phase, axis=-1) - expected
+            advance = expected + np.angle(np.exp(1j * deviation))
 
-    def __call__(self, signal: Signal) -> Signal:
-        # Calculate spectrogram or original signal
-        window_size_samples = int(self.window_size * signal.rate)  # Window size in samples
-        hop_samples = window_size_samples // 2
-        window = gaussian(window_size_samples, std=window_size_samples // 2, sym=True)
-        stft = ShortTimeFFT(window, hop=hop_samples, fs=signal.rate, scale_to="magnitude")
-        spectre = stft.stft(signal.data)
-
-        # Now we need to stretch or squeeze spectrogram depending on the speed factor
-
-        # Initialize empty result array
-        orig_spectre_samples = spectre.shape[-1]
-        target_spectre_samples = max(math.floor(orig_spectre_samples / self.speed_factor), 1)
-        target_shape = list(spectre.shape)
-        target_shape[-1] = target_spectre_samples
-        target_spectre = np.zeros(target_shape, dtype=spectre.dtype)
-
-        # Represent spectre as a function of time (measured in
-        # sample index) by linear interpolation along the time axis.
-        time_values = range(orig_spectre_samples)
-        spectre_func = interp1d(time_values, spectre, axis=-1, bounds_error=False, fill_value=0.0)
-
-        # Fill the target spectre
-        for time in range(target_spectre_samples):
-            orig_time = orig_spectre_samples / target_spectre_samples * time
-            target_spectre[:, :, time] = spectre_func(orig_time)
-
-        # Reverse Short-Time Fourier Transform
-        output = stft.istft(target_spectre)
-        return Signal(output, signal.rate)
+        # Target phase is accumulated from the advances at the preceding target positions
+        if self._phase is None:
+            start_phase = phase[..., 0]
+            sources = mapping.indices[:-1]
+        else:
+            start_phase = self._phase
+            previous = max(math.floor((self._target - 1) * self.speed_factor) - self._first, 0)
+            sources = np.concatenate([[previous], mapping.indices[:-1]])
+        sources = np.minimum(sources, advance.shape[-1] - 1)
+        steps = np.cumsum(np.take(advance, sources, axis=-1), axis=-1)
+        if self._phase is None:
+            target_phase = np.concatenate([start_phase[..., np.newaxis], start_phase[..., np.newaxis] + steps], axis=-1)
+        else:
+            target_phase = start_phase[..., np.newaxis] + steps
+        self._phase = target_phase[..., -1]
+        return (magnitude * np.exp(1j * target_phase)).astype(frames.dtype, copy=False)
@@ -0,0 +1,186 @@
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import NDArray
+from scipy.signal.windows import gaussian
+
+from audio_transformers.core.cache import DEFAULT_CACHE
+from audio_transformers.core.precision import real_dtype
+
+
+class StreamingSTFT:
+    """Short-Time Fourier Transform of a signal supplied block by block.
+
+    Frames of `size` samples are spaced by `hop` samples. The first frame
+    ends `hop` samples after the signal start (the signal is padded with
+    zeros before the start and after the end). The engine keeps the input
+    samples which are not yet covered by a complete frame and the pending
+    overlap-add buffer of the inverse transform, so that analysing and
+    synthesizing a signal block by block gives exactly the same result as
+    processing it as a whole, while using memory bounded by the block size.
+
+    Spectre has shape=(n_channels, n_bins, n_frames), the window is scaled
+    by its sum (the same as "magnitude" scaling of scipy's ShortTimeFFT).
+    Samples and spectre data types follow the precision set at creation
+    (see core.precision).
+    """
+
+    window: NDArray[np.float32]
+    dual_window: NDArray[np.float32]
+    hop: int
+    size: int
+    dtype: type[np.floating]
+
+    def __init__(self, window: NDArray[np.float64], hop: int, dual_window: NDArray[np.float64] | None = None):
+        """
+        :param window: Analysis window.
+        :param hop: Distance between consecutive frames in samples.
+        :param dual_window: Precomputed synthesis window (must be the dual of the scaled analysis window).
+        """
+        self.size = len(window)
+        self.hop = hop
+        self.dtype = real_dtype()
+        window = window / window.sum()
+        if dual_window is None:
+            dual_window = StreamingSTFT._dual(window, hop)
+        self.window = window.astype(self.dtype, copy=False)
+        self.dual_window = dual_window.astype(self.dtype, copy=False)
+        self._input: NDArray[np.float32] | None = None
+        self._pending: NDArray[np.float32] | None = None
+        self._input_samples: int = 0
+        self._output_samples: int = 0
+        self._skip: int = self.size - hop
+
+    @staticmethod
+    def gaussian(window_duration: float, rate: int, hop_ratio: float = 0.5) -> "StreamingSTFT":
+        """Create STFT with Gaussian window of the given duration in seconds."""
+        window_size = int(window_duration * rate)
+        hop = max(int(window_size * hop_ratio), 1)
+        key = ("gaussian", window_size, hop)
+        window, dual_window = DEFAULT_CACHE.get(key, lambda: gaussian_windows(window_size, hop))
+        return StreamingSTFT(window, hop, dual_window)
+
+    @staticmethod
+    def _dual(window: NDArray[np.float64], hop: int) -> NDArray[np.float64]:
+        """Get canonical dual window which provides perfect reconstruction."""
+        size = len(window)
+        energy = np.zeros(size)
+        squared = window**2
+        for shift in range(-(size // hop) * hop, size, hop):
+            start, stop = max(-shift, 0), min(size - shift, size)
+            energy[start:stop] += np.roll(squared, -shift)[start:stop]
+        return window / energy
+
+    @property
+    def bins(self) -> int:
+        """Get number of frequency bins."""
+        return self.size // 2 + 1
+
+    @property
+    def spectre_dtype(self) -> np.dtype:
+        """Get complex data type of the spectre."""
+        return np.result_type(self.dtype, np.complex64)
+
+    @property
+    def samples(self) -> int:
+        """Get total number of analysed samples."""
+        return self._input_samples
+
+    def frequencies(self, rate: int) -> NDArray[np.float64]:
+        """Get bin frequencies for the given sampling rate."""
+        return np.fft.rfftfreq(self.size, 1 / rate)
+
+    def analyze(self, data: NDArray[np.float32]) -> NDArray[np.complex64]:
+        """Get spectre of all complete frames available after the next block of data."""
+        if self._input is None:
+            self._input = np.zeros((data.shape[0], self.size - self.hop), dtype=self.dtype)
+        self._input = np.concatenate([self._input, data], axis=-1, dtype=self.dtype)
+        self._input_samples += data.shape[-1]
+        return self._frames()
+
+    def analyze_rest(self) -> NDArray[np.complex64]:
+        """Get spectre of the remaining frames covering the end of the signal."""
+        if self._input is None:
+            return np.zeros((0, self.bins, 0), dtype=self.spectre_dtype)
+        # Input buffer starts at the next frame, each sample
+        # must be covered by all the frames overlapping it.
+        frames = math.ceil(self._input.shape[-1] / self.hop)
+        padding = max((frames - 1) * self.hop + self.size - self._input.shape[-1], 0)
+        self._input = np.pad(self._input, ((0, 0), (0, padding)))
+        spectre = self._frames(limit=frames)
+        self._input = None
+        return spectre
+
+    def _frames(self, limit: int | None = None) -> NDArray[np.complex64]:
+        """Consume complete frames from the input buffer."""
+        channels, available = self._input.shape
+        frames = max((available - self.size) // self.hop + 1, 0)
+        if limit is not None:
+            frames = min(frames, limit)
+        if frames == 0:
+            return np.zeros((channels, self.bins, 0), dtype=self.spectre_dtype)
+        consumed = frames * self.hop
+        windows = sliding_window_view(self._input[:, : consumed - self.hop + self.size], self.size, axis=-1)
+        spectre = np.fft.rfft(windows[:, :: self.hop] * self.window, axis=-1)
+        self._input = self._input[:, consumed:]
+        return np.swapaxes(spectre, -1, -2)
+
+    def synthesize(self, spectre: NDArray[np.complex64]) -> NDArray[np.float32]:
+        """Get signal samples which are complete after overlap-adding the next frames."""
+        channels, _, frames = spectre.shape
+        ratio = math.ceil(self.size / self.hop)
+        if self._pending is None:
+            self._pending = np.zeros((channels, (ratio - 1) * self.hop), dtype=self.dtype)
+        if frames == 0:
+            return np.zeros((channels, 0), dtype=self.dtype)
+
+        segments = np.fft.irfft(np.swapaxes(spectre, -1, -2), n=self.size, axis=-1) * self.dual_window
+        segments = np.pad(segments, ((0, 0), (0, 0), (0, ratio * self.hop - self.size)))
+        segments = segments.reshape(channels, frames, ratio, self.hop)
+
+        # Each frame is split into hop-sized segments. Segments with
+        # the same index are laid out contiguously and added at once.
+        complete = frames * self.hop
+        output = np.zeros((channels, complete + self._pending.shape[-1]), dtype=self.dtype)
+        output[:, : self._pending.shape[-1]] += self._pending
+        for index in range(ratio):
+            start, stop = index * self.hop, index * self.hop + complete
+            output[:, start:stop] += segments[:, :, index, :].reshape(channels, complete)
+        self._pending = output[:, complete:]
+        return self._emit(output[:, :complete])
+
+    def synthesize_rest(self, spectre: NDArray[np.complex64], samples: int | None = None) -> NDArray[np.float32]:
+        """Get the rest of the synthesized signal after overlap-adding the last frames.
+
+        :param spectre: The last frames of the spectre.
+        :param samples: Total length of the synthesized signal. All the
+            overlap-added samples are returned if not specified.
+        """
+        if self._pending is None and spectre.shape[-1] == 0:
+            return np.zeros((spectre.shape[0], 0), dtype=self.dtype)
+        emitted = self._output_samples
+        rest = np.concatenate([self.synthesize(spectre), self._emit(self._pending)], axis=-1)
+        self._pending = None
+        if samples is None:
+            return rest
+        self._output_samples = samples
+        length = samples - emitted
+        if length <= rest.shape[-1]:
+            return rest[:, : max(length, 0)]
+        return np.pad(rest, ((0, 0), (0, length - rest.shape[-1])))
+
+    def _emit(self, output: NDArray[np.float32]) -> NDArray[np.float32]:
+        """Skip samples preceding the signal start."""
+        skip = min(self._skip, output.shape[-1])
+        self._skip -= skip
+        output = output[:, skip:]
+        self._output_samples += output.shape[-1]
+        return output
+
+
+def gaussian_windows(window_size: int, hop: int) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    """Design scaled Gaussian analysis window and its dual synthesis window."""
+    window = gaussian(window_size, std=window_size // 2, sym=True)
+    window = window / window.sum()
+    return window, StreamingSTFT._dual(window, hop)
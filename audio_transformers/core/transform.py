@@ -1,7 +1,43 @@
 import abc
+import math
 from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Tuple
 
-from audio_transformers.core.model import Signal
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.model import Signal, SignalBatch
+
+
+@dataclass(frozen=True)
+class Context:
+    """Input samples around a block required to transform the block independently.
+
+    A block extended by `left` preceding and `right` following samples of the
+    signal could be transformed on its own, the output samples of the block
+    (without the extension) are then the same as if the whole signal was
+    transformed. Transformations which process the signal by frames (e.g. STFT)
+    also require the extended block to start at a multiple of the `step`,
+    so that its frames are the same as the frames of the whole signal.
+    """
+
+    left: int = 0
+    right: int = 0
+    step: int = 1
+
+    def then(self, other: "Context") -> "Context":
+        """Get context of the transformation followed by another one (at the same sampling rate)."""
+        return Context(self.left + other.left, self.right + other.right, math.lcm(self.step, other.step))
+
+    def align(self, block_size: int) -> Tuple[int, int]:
+        """Get block size and left context rounded up to multiples of the step."""
+        block_size = max(math.ceil(block_size / self.step), 1) * self.step
+        return block_size, math.ceil(self.left / self.step) * self.step
+
+    def union(self, other: "Context") -> "Context":
+        """Get context sufficient for both transformations applied to the same input."""
+        return Context(max(self.left, other.left), max(self.right, other.right), math.lcm(self.step, other.step))
 
 
 class Transform(abc.ABC):
@@ -12,6 +48,10 @@ class Transform(abc.ABC):
     # the transformation to the whole signal.
     uniform: bool = True
 
+    # The transformation preserves the signal shape and is able
+    # to write its output directly to a preallocated array.
+    inplace: bool = False
+
     @abstractmethod
     def __call__(self, signal: Signal) -> Signal:
         """Apply transformation to the given signal samples.
@@ -19,3 +59,96 @@ class Transform(abc.ABC):
         :param signal: Input signal
         :return: Transformed signal
         """
+
+    @property
+    def streamable(self) -> bool:
+        """Check if consecutive blocks could be streamed through the transformation.
+
+        Uniform transformations are trivially streamable. Non-uniform ones
+        must carry their state between blocks (see Transform.stream), otherwise
+        they need the whole signal at once to be correct.
+        """
+        return self.uniform or type(self).stream is not Transform.stream
+
+    def context(self, rate: int) -> Context | None:
+        """Get input context required to transform blocks of a signal independently (see Context).
+
+        Uniform transformations don't need any context. None means that the
+        transformation needs the whole signal (or changes the signal length),
+        so its blocks could only be streamed.
+
+        :param rate: Sampling rate of the input signal.
+        """
+        return Context() if self.uniform else None
+
+    def output_rate(self, rate: int) -> int:
+        """Get sampling rate of the output for the given input sampling rate."""
+        return rate
+
+    def apply(self, signal: Signal, out: NDArray[np.float32] | None = None) -> Signal:
+        """Apply transformation writing the result to the given array.
+
+        Transformations which support writing to a preallocated array (see
+        Transform.inplace) do so without allocating the output. Others copy
+        their output to the array if its shape matches. The array must not
+        overlap the input signal data.
+
+        :param signal: Input signal
+        :param out: Optional array to store the result
+        :return: Transformed signal (with data stored in `out` if possible)
+        """
+        result = self(signal)
+        if out is None or out.shape != result.data.shape:
+            return result
+        np.copyto(out, result.data)
+        return Signal(out, result.rate)
+
+    def apply_batch(self, batch: SignalBatch) -> SignalBatch:
+        """Apply transformation to each signal of the batch independently.
+
+        Transformations which could process the whole batch in a single
+        vectorized call override this method. By default, the signals
+        are transformed one by one.
+        """
+        return SignalBatch.from_signals([self(signal) for signal in batch.to_signals()])
+
+    def stream(self) -> "Transform":
+        """Get transformation for processing consecutive blocks of a single signal.
+
+        Stateful transformations return a fresh copy of themselves which carries
+        the state from one block to the next. Stateless transformations may
+        return the very same object.
+        """
+        return self
+
+    def for_signal(self, key: int) -> "Transform":
+        """Get transformation for the signal identified by the given key.
+
+        Randomized transformations derive their random streams from the key,
+        so that different signals get different yet reproducible results.
+        Deterministic transformations return the very same object.
+        """
+        return self
+
+    def for_block(self, offset: int) -> "Transform":
+        """Get transformation for the block of a signal starting at the given sample.
+
+        Used when blocks are processed independently instead of being streamed
+        (see Transform.stream), so that the result doesn't depend on the order.
+        Randomized transformations derive their random values from the sample
+        positions, so that the result doesn't depend on the block boundaries
+        either (e.g. of the overlapping blocks extended by the context).
+        """
+        return self
+
+    def flush(self) -> Signal | None:
+        """Get the rest of the output held back by the stream at the end of the signal.
+
+        Transformations which delay their output (e.g. by the length of
+        a kernel or a window) return the rest of it when the input is over.
+        """
+        return None
+
+    def __repr__(self) -> str:
+        params = ", ".join(f"{name}={value!r}" for name, value in vars(self).items() if not name.startswith("_"))
+        return f"{type(self).__name__}({params})"
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import Sequence, Tuple, Dict, Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from audio_transformers.core.channels import ChannelMix
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.resample import Resample
+from audio_transformers.core.transform import Transform
+
+
+@dataclass(frozen=True)
+class DecodeOptions:
+    """Conversions performed by the decoder before the samples reach Python.
+
+    Resampling and channel mixing are done by ffmpeg, so that less data
+    is piped from the decoder and converted to signals.
+    """
+
+    rate: int | None = None
+    mixing: Sequence[ChannelMix] = ()
+
+    def ffmpeg_options(self, channels: int | None = None) -> Dict[str, Any]:
+        """Get ffmpeg output options.
+
+        :param channels: Number of the input channels, required for channel mixing.
+        """
+        options: Dict[str, Any] = {}
+        if self.rate is not None:
+            options["ar"] = self.rate
+        if len(self.mixing) > 0:
+            matrix = np.eye(channels)
+            for mix in self.mixing:
+                matrix = mix.matrix(matrix.shape[0]) @ matrix
+            options["af"] = pan_filter(matrix)
+        return options
+
+    def channels(self, channels: int) -> int:
+        """Get number of the decoded channels for the given number of the input channels."""
+        for mix in self.mixing:
+            channels = mix.matrix(channels).shape[0]
+        return channels
+
+
+def pan_filter(matrix: NDArray[np.float64]) -> str:
+    """Get ffmpeg "pan" audio filter for the given mixing matrix."""
+    gains = []
+    for output, row in enumerate(matrix):
+        terms = "+".join(f"{gain:.10g}*c{index}" for index, gain in enumerate(row) if gain != 0) or "0*c0"
+        gains.append(f"c{output}={terms}")
+    return f"pan={matrix.shape[0]}c|" + "|".join(gains)
+
+
+def push_down(transform: Transform) -> Tuple[DecodeOptions, Transform]:
+    """Move leading resampling and channel mixing stages to the decoder.
+
+    Resampling and channel mixing are linear and commute with each other,
+    so all such leading stages (but a single resampling) could be done by
+    the decoder. Resampling by ffmpeg is numerically different from
+    the Resample transformation, but has the same purpose.
+
+    :return: Decoder options and the rest of the transformation.
+    """
+    stages = transform.transforms if isinstance(transform, Composite) else (transform,)
+    rate: int | None = None
+    mixing = []
+    pushed = 0
+    for stage in stages:
+        if isinstance(stage, Resample) and rate is None:
+            rate = stage.rate
+        elif isinstance(stage, ChannelMix):
+            mixing.append(stage)
+        else:
+            break
+        pushed += 1
+    if pushed == 0:
+        return DecodeOptions(), transform
+    return DecodeOptions(rate, tuple(mixing)), Composite(stages[pushed:])
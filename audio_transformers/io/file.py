@@ -1,17 +1,24 @@
 from contextlib import AbstractContextManager
 from functools import cached_property
 from os import PathLike, fspath
-from typing import Iterator, TypeAlias, Literal
+from typing import Iterator, TypeAlias, Literal, Dict, Any
 
 import ffmpegio
+import ffmpegio.audio
 from ffmpegio.streams import SimpleAudioWriter, SimpleAudioReader
 
 import audio_transformers.io.format as format
 import audio_transformers.io.probe as probe
+import audio_transformers.io.wav as wav
 from audio_transformers.core.model import Signal
+from audio_transformers.core.precision import real_dtype
+from audio_transformers.io.decode import DecodeOptions
 
 Mode: TypeAlias = Literal["r", "w"]
 
+# Number of extra samples decoded after a range to make sure the range is complete
+RANGE_MARGIN: int = 1024
+
 
 class AudioFile(AbstractContextManager):
     """Audio file io."""
@@ -21,7 +28,10 @@ class AudioFile(AbstractContextManager):
     rate: int
     block_duration: float | None
     block_size: int | None
-    _file: SimpleAudioReader | SimpleAudioWriter
+    decode: DecodeOptions
+    native: bool
+    _wav: wav.WavInfo | None
+    _file: SimpleAudioReader | SimpleAudioWriter | wav.WavReader | wav.WavWriter | None
 
     def __init__(
         self,
@@ -30,28 +40,52 @@ class AudioFile(AbstractContextManager):
         rate: int | None = None,
         block_duration: float | None = None,
         block_size: int | None = None,
+        decode: DecodeOptions | None = None,
+        native: bool = True,
     ):
         """
         :param path: audio file path.
+        :param decode: Resampling and channel mixing done by the decoder (read mode only).
+        :param native: Read and write uncompressed WAV files directly instead of using ffmpeg.
         """
 
         self.path: str = fspath(path)
         self.mode: Mode = mode
+        self.native: bool = native
+        self._init_decode(decode)
+        self._init_native()
         self._init_rate(rate)
         self._init_block(block_duration, block_size)
-        self._init_file()
+        self._file = None
+        if self.mode == "w":
+            self._init_file()
 
     def __enter__(self) -> "AudioFile":
         return self
 
     def __exit__(self, __exc_type, __exc_value, __traceback):
-        self._file.close()
+        if self._file is not None:
+            self._file.close()
+
+    def _init_decode(self, decode: DecodeOptions | None):
+        if self.mode == "w" and decode is not None:
+            raise ValueError("Decode options cannot be specified in write mode.")
+        self.decode = decode or DecodeOptions()
+
+    def _init_native(self):
+        """Check if the input is an uncompressed WAV file which could be mapped without decoding."""
+        self._wav = None
+        if self.mode == "r" and self.native and self.decode == DecodeOptions():
+            self._wav = wav.info(self.path)
 
     def _init_rate(self, rate: int | None):
         if self.mode == "r":
             if rate is not None:
                 raise ValueError("Cannot explicitly specify sampling rate in read mode.")
-            self.rate = probe.rate(self.path)
+            if self._wav is not None:
+                self.rate = self._wav.rate
+            else:
+                self.rate = self.decode.rate or probe.rate(self.path)
         else:
             if rate is None:
                 raise ValueError("Sampling rate must be specified in write mode.")
@@ -80,9 +114,14 @@ class AudioFile(AbstractContextManager):
                 self.block_size = block_size
 
     def _init_file(self):
-        """Initialize file."""
-        if self.mode == "r":
-            self._file = ffmpegio.open(self.path, "ra", blocksize=self.block_size, sample_fmt="flt")
+        """Initialize file (input is opened on the first read)."""
+        if self.mode == "r" and self._wav is not None:
+            self._file = wav.WavReader(self.path, self.block_size, real_dtype())
+        elif self.mode == "r":
+            options = self._decode_options()
+            self._file = ffmpegio.open(self.path, "ra", blocksize=self.block_size, sample_fmt="flt", **options)
+        elif self.native and self.path.lower().endswith(".wav"):
+            self._file = wav.WavWriter(self.path, self.rate)
         else:  # write mode
             self._file = ffmpegio.open(self.path, "wa", rate_in=self.rate, overwrite=True)
 
@@ -91,6 +130,8 @@ class AudioFile(AbstractContextManager):
         """Get file duration."""
         if self.mode == "w":
             raise NotImplementedError("Duration is not implemented in write mode.")
+        if self._wav is not None:
+            return self._wav.duration
         return probe.duration(self.path)
 
     @cached_property
@@ -98,18 +139,67 @@ class AudioFile(AbstractContextManager):
         """Get total approximate samples."""
         if self.mode == "w":
             raise NotImplementedError("Samples count is not available in write mode.")
+        if self._wav is not None:
+            return self._wav.frames
+        if self.decode.rate is None:
+            return probe.samples(self.path)
         return int(self.duration * self.rate)
 
+    def _decode_options(self) -> Dict[str, Any]:
+        """Get ffmpeg output options of the decoder."""
+        channels = probe.channels(self.path) if len(self.decode.mixing) > 0 else None
+        return self.decode.ffmpeg_options(channels)
+
+    def _reader(self) -> SimpleAudioReader | wav.WavReader:
+        """Get input stream opening it if needed."""
+        if self.mode == "w":
+            raise NotImplementedError("Reading is not available in write mode.")
+        if self._file is None:
+            self._init_file()
+        return self._file
+
     def read(self, n: int = -1) -> Signal:
         """Read entire file."""
-        data = self._file.read(n)
+        data = self._reader().read(n)
+        return format.to_signal(data, self.rate)
+
+    def read_range(self, start: float, duration: float | None = None) -> Signal:
+        """Read the given time range decoding only the samples of the range.
+
+        The input is seeked by ffmpeg (or mapped for WAV files) and the decoded
+        samples are trimmed to the exact range, so that consecutive ranges fit
+        together sample to sample. Reading ranges doesn't affect the stream
+        of blocks.
+
+        :param start: Range start in seconds.
+        :param duration: Range duration in seconds (up to the end of file by default).
+        """
+        if self.mode == "w":
+            raise NotImplementedError("Reading is not available in write mode.")
+        if start < 0 or (duration is not None and duration < 0):
+            raise ValueError(f"Invalid range: start={start}, duration={duration}")
+        first = round(start * self.rate)
+        count = -1 if duration is None else round(duration * self.rate)
+        if self._wav is not None:
+            reader = wav.WavReader(self.path, self.block_size, real_dtype())
+            reader.position = min(first, self._wav.frames)
+            return format.to_signal(reader.read(count), self.rate)
+        options = self._decode_options()
+        if count >= 0:
+            # Output duration is limited with a margin, the samples are counted instead
+            options["t"] = (count + RANGE_MARGIN) / self.rate
+        _, data = ffmpegio.audio.read(self.path, ss_in=first / self.rate, sample_fmt="flt", **options)
+        if count >= 0:
+            data = data[:count]
         return format.to_signal(data, self.rate)
 
     def __iter__(self) -> Iterator[Signal]:
         """Iterate over blocks as signals."""
-        for block in self._file:
+        for block in self._reader():
             yield format.to_signal(block, self.rate)
 
     def write(self, signal: Signal) -> int:
         """Write signal object to the file."""
-        return self._file.write(format.from_signal(signal))
+        # Native writer converts samples anyway, so it doesn't need contiguous data
+        contiguous = not isinstance(self._file, wav.WavWriter)
+        return self._file.write(format.from_signal(signal, contiguous))
@@ -2,15 +2,25 @@ import numpy as np
 from numpy.typing import NDArray
 
 from audio_transformers.core.model import Signal
+from audio_transformers.core.precision import real_dtype
 
 
 def to_signal(raw_data, rate) -> Signal:
-    """Convert ffmpegio raw data to Signal."""
-    samples, channels = raw_data.shape
-    return Signal(raw_data.reshape((channels, samples), order="F"), rate)
+    """Convert ffmpegio raw data with interleaved samples, shape=(n_samples, n_channels), to Signal.
 
+    The signal data is a transposed view of the raw data (see Signal.interleaved).
+    """
+    return Signal(raw_data.T, rate)
 
-def from_signal(signal: Signal) -> NDArray[np.float32]:
-    """Convert signal to raw data ready to be written by ffmpegio."""
-    channels, samples = signal.data.shape
-    return signal.data.reshape((samples, channels), order="F")
+
+def from_signal(signal: Signal, contiguous: bool = True) -> NDArray[np.float32]:
+    """Convert signal to raw data with interleaved samples, shape=(n_samples, n_channels), ready to be written.
+
+    Interleaved signals are converted without copying.
+
+    :param contiguous: Copy samples of other signals to a contiguous array (required by ffmpegio).
+    """
+    data = np.asarray(signal.data, dtype=real_dtype()).T
+    if contiguous:
+        return np.ascontiguousarray(data)
+    return data
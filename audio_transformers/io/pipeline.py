@@ -0,0 +1,127 @@
+import threading
+from contextlib import AbstractContextManager
+from queue import Queue, Full, Empty
+from typing import Iterable, Iterator, TypeVar, Tuple, Any
+
+from audio_transformers.core.model import Signal
+from audio_transformers.io.file import AudioFile
+
+T = TypeVar("T")
+
+# Number of blocks waiting between pipeline stages
+DEFAULT_DEPTH: int = 2
+
+# Interval of checking if the waiting stage is cancelled (in seconds)
+_POLL_INTERVAL: float = 0.1
+
+
+def _put(queue: Queue, entry: Any, stop: threading.Event) -> bool:
+    """Put entry to the bounded queue unless the consumer is gone."""
+    while not stop.is_set():
+        try:
+            queue.put(entry, timeout=_POLL_INTERVAL)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def prefetch(items: Iterable[T], depth: int = DEFAULT_DEPTH) -> Iterator[T]:
+    """Iterate over items in a background thread keeping up to `depth` items ready.
+
+    Decoding the next blocks by ffmpeg overlaps with processing of the
+    current one. Errors of the iteration are raised by the consumer.
+    """
+    queue: Queue[Tuple[bool, Any]] = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in items:
+                if not _put(queue, (True, item), stop):
+                    return
+            _put(queue, (False, None), stop)
+        except BaseException as error:
+            _put(queue, (False, error), stop)
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            has_item, item = queue.get()
+            if not has_item:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+class WriteBehind(AbstractContextManager):
+    """Write signals to the audio file in a background thread.
+
+    Encoding of the written blocks by ffmpeg overlaps with processing of
+    the next ones. Up to `depth` blocks wait to be written. Errors of the
+    writer thread are raised by the next write or when the writer is closed.
+    """
+
+    def __init__(self, file: AudioFile, depth: int = DEFAULT_DEPTH):
+        """
+        :param file: Audio file opened in write mode.
+        :param depth: Maximal number of blocks waiting to be written.
+        """
+        self.file: AudioFile = file
+        self._queue: Queue[Signal | None] = Queue(maxsize=depth)
+        self._stop: threading.Event = threading.Event()
+        self._error: BaseException | None = None
+        self._thread: threading.Thread = threading.Thread(target=self._consume, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "WriteBehind":
+        return self
+
+    def __exit__(self, __exc_type, __exc_value, __traceback):
+        self.close(cancel=__exc_type is not None)
+
+    @property
+    def rate(self) -> int:
+        """Get sampling rate of the file."""
+        return self.file.rate
+
+    def write(self, signal: Signal):
+        """Enqueue the signal to be written."""
+        self._check()
+        if not _put(self._queue, signal, self._stop):
+            self._check()
+
+    def close(self, cancel: bool = False):
+        """Wait until all the enqueued signals are written (or drop them if cancelled)."""
+        if cancel:
+            self._stop.set()
+        else:
+            _put(self._queue, None, self._stop)
+        self._thread.join()
+        if not cancel:
+            self._check()
+
+    def _consume(self):
+        """Write enqueued signals until the end mark."""
+        try:
+            while not self._stop.is_set():
+                try:
+                    signal = self._queue.get(timeout=_POLL_INTERVAL)
+                except Empty:
+                    continue
+                if signal is None:
+                    return
+                self.file.write(signal)
+        except BaseException as error:
+            self._error = error
+            self._stop.set()
+
+    def _check(self):
+        """Raise error of the writer thread."""
+        if self._error is not None:
+            raise self._error
@@ -1,35 +1,172 @@
+import functools
+import json
+import logging
 import os
-import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass, asdict
 from os import PathLike, fspath
 from subprocess import PIPE
+from typing import Callable, Dict, Any
 
-import ffmpegio
 from ffmpegio import ffprobe
 
-DURATION_PATTERN = re.compile(r"Duration:\s+(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+(?:\.\d+)?)")
+import audio_transformers.io.wav as wav
 
+logger = logging.getLogger(__name__)
 
-def duration(path: PathLike | str) -> float:
-    """Get file duration."""
+DEFAULT_CACHE_PATH: str = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "audio-transformers", "probe.sqlite"
+)
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    """Properties of the first audio stream of a file."""
+
+    rate: int
+    channels: int
+    duration: float
+    samples: int
+    codec: str
+
+
+class ProbeCache:
+    """Persistent cache of the probing results.
+
+    Results are stored in a SQLite database and are keyed by the file path,
+    size and modification time, so that modified files are probed again.
+    The database could be shared by concurrent processes.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        """
+        :param path: Database file path.
+        """
+        self.path: str = path
+        self._ready: bool = False
+
+    def get(self, path: PathLike | str, probe: Callable[[str], AudioInfo]) -> AudioInfo:
+        """Get cached info of the file or probe it and store the result."""
+        path = os.path.abspath(fspath(path))
+        stat = os.stat(path)
+        try:
+            with closing(self._connect()) as connection:
+                row = connection.execute(
+                    "SELECT info FROM probe WHERE path = ? AND size = ? AND mtime = ?",
+                    (path, stat.st_size, stat.st_mtime_ns),
+                ).fetchone()
+                if row is not None:
+                    return AudioInfo(**json.loads(row[0]))
+                result = probe(path)
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO probe (path, size, mtime, info) VALUES (?, ?, ?, ?)",
+                        (path, stat.st_size, stat.st_mtime_ns, json.dumps(asdict(result))),
+                    )
+                return result
+        except sqlite3.Error as error:
+            logger.warning(f"Probe cache {self.path} is not available: {error}")
+            return probe(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connect to the database creating it if needed."""
+        if not self._ready:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=60.0)
+        if not self._ready:
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS probe "
+                    "(path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, info TEXT)"
+                )
+            self._ready = True
+        return connection
+
+
+# Probing results are not cached unless the cache is set (see set_cache)
+_cache: ProbeCache | None = None
+
+
+def set_cache(path: str | None):
+    """Set process-wide persistent probe cache (disabled if the path is None)."""
+    global _cache
+    _cache = ProbeCache(path) if path is not None else None
+
+
+def get_cache() -> str | None:
+    """Get current probe cache path."""
+    return _cache.path if _cache is not None else None
+
+
+def info(path: PathLike | str) -> AudioInfo:
+    """Get properties of the first audio stream of the file.
+
+    Uncompressed WAV files are probed by reading their header, other files
+    are probed by a single ffprobe call.
+    """
     if not os.path.isfile(path):
         raise FileNotFoundError(path)
-    probe = ffprobe(f"-i {fspath(path)}", stderr=PIPE, universal_newlines=True)
+    wav_info = wav.info(path)
+    if wav_info is not None:
+        codec = f"pcm_{wav_info.dtype.kind.replace('i', 's')}{8 * wav_info.dtype.itemsize}"
+        codec += "le" if wav_info.dtype.itemsize > 1 else ""
+        return AudioInfo(wav_info.rate, wav_info.channels, wav_info.duration, wav_info.frames, codec)
+    path = os.path.abspath(fspath(path))
+    stat = os.stat(path)
+    return _probe(path, stat.st_size, stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _probe(path: str, size: int, mtime: int) -> AudioInfo:
+    """Probe the file version identified by its size and modification time (memoized by the process)."""
+    if _cache is not None:
+        return _cache.get(path, _ffprobe)
+    return _ffprobe(path)
+
+
+def _ffprobe(path: str) -> AudioInfo:
+    """Probe the file by ffprobe."""
+    args = ["-v", "error", "-select_streams", "a:0", "-show_streams", "-show_format", "-of", "json", path]
+    probe = ffprobe(args, stdout=PIPE, stderr=PIPE, universal_newlines=True)
     if probe.returncode != 0:
-        raise IOError(f"Cannot determine file duration: {path}. FFProbe stderr:\n{probe.stderr}")
-    match = DURATION_PATTERN.search(probe.stderr)
-    if not match:
+        raise IOError(f"Cannot probe file: {path}. FFProbe stderr:\n{probe.stderr}")
+    return parse(json.loads(probe.stdout), path)
+
+
+def parse(output: Dict[str, Any], path: str) -> AudioInfo:
+    """Parse JSON output of ffprobe."""
+    streams = output.get("streams", [])
+    if len(streams) == 0:
+        raise IOError(f"No audio streams found: {path}")
+    stream = streams[0]
+    rate = int(stream["sample_rate"])
+    duration = stream.get("duration", output.get("format", {}).get("duration"))
+    if duration is None:
         raise IOError(f"Cannot determine file duration: {path}")
-    return 3600 * float(match.group("hours")) + 60 * float(match.group("minutes")) + float(match.group("seconds"))
+    duration = float(duration)
+    if "duration_ts" in stream and stream.get("time_base") == f"1/{rate}":
+        samples = int(stream["duration_ts"])
+    else:
+        samples = int(duration * rate)
+    return AudioInfo(rate, int(stream["channels"]), duration, samples, stream.get("codec_name", ""))
+
+
+def duration(path: PathLike | str) -> float:
+    """Get file duration."""
+    return info(path).duration
 
 
 def rate(path: PathLike | str) -> int:
     """Get file sampling rate."""
-    if not os.path.isfile(path):
-        raise FileNotFoundError(path)
-    with ffmpegio.open(fspath(path), "ra", blocksize=1) as file:
-        return file.rate
+    return info(path).rate
+
+
+def channels(path: PathLike | str) -> int:
+    """Get file channels count."""
+    return info(path).channels
 
 
 def samples(path: PathLike | str) -> int:
     """Get file total samples count."""
-    return int(rate(path) * duration(path))
+    return info(path).samples
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from typing import Iterable, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+import audio_transformers.io.format as format
+from audio_transformers.core.model import Signal
+from audio_transformers.core.precision import real_dtype
+
+
+def _scratch_file(directory: str | None) -> str:
+    """Create empty scratch file in the given (or system temporary) directory."""
+    handle, path = tempfile.mkstemp(prefix="audio-", suffix=".raw", dir=directory)
+    os.close(handle)
+    return path
+
+
+def allocate(channels: int, samples: int, directory: str | None = None) -> NDArray[np.float32]:
+    """Allocate memory-mapped signal data with shape=(n_channels, n_samples) in a scratch file.
+
+    Samples are stored interleaved (the same as they are decoded and encoded),
+    so the data is a transposed view of the mapped (n_samples, n_channels) array.
+    The scratch file is removed right away, the mapping keeps it alive while in use.
+    """
+    if samples == 0:
+        return np.zeros((channels, 0), dtype=real_dtype())
+    path = _scratch_file(directory)
+    try:
+        return np.memmap(path, dtype=real_dtype(), mode="w+", shape=(samples, channels)).T
+    finally:
+        _unlink(path)
+
+
+def spill(signal: Signal, directory: str | None = None) -> Signal:
+    """Move signal data to a scratch file, so that it is paged in from the file on access."""
+    data = allocate(signal.channels, signal.samples, directory)
+    np.copyto(data, signal.data)
+    return Signal(data, signal.rate)
+
+
+def store(blocks: Iterable[Signal], rate: int, directory: str | None = None) -> Signal:
+    """Write consecutive blocks to a scratch file and map them as a single signal.
+
+    Only a single block is held in memory at a time, the resulting signal
+    data is paged in from the scratch file on access.
+    """
+    path = _scratch_file(directory)
+    try:
+        samples, channels = 0, 0
+        with open(path, "wb") as file:
+            for block in blocks:
+                file.write(format.from_signal(block).tobytes())
+                samples += block.samples
+                channels = block.channels
+        if samples == 0:
+            return Signal(np.zeros((channels, 0)), rate)
+        return Signal(np.memmap(path, dtype=real_dtype(), mode="r", shape=(samples, channels)).T, rate)
+    finally:
+        _unlink(path)
+
+
+def blocks(signal: Signal, block_size: int) -> Iterator[Signal]:
+    """Iterate over consecutive blocks of the (memory-mapped) signal copied to memory."""
+    for start in range(0, signal.samples, block_size):
+        stop = start + block_size
+        yield Signal(np.array(signal.data[:, start:stop]), signal.rate)
+
+
+def _unlink(path: str):
+    """Remove scratch file if the platform allows removing files in use."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
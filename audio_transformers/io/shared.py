@@ -0,0 +1,176 @@
+import threading
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from queue import Queue, Empty
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from audio_transformers.core.model import Signal
+from audio_transformers.core.precision import real_dtype
+
+# Alignment of the blocks stored in a slot (in bytes)
+ALIGNMENT: int = 64
+
+# Interval of checking if the ring is closed while waiting for a free slot (in seconds)
+_POLL_INTERVAL: float = 0.1
+
+# Shared memory segments mapped by the current process by their names
+_attached: Dict[str, SharedMemory] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    """Map shared memory segment created by another process (once per process)."""
+    memory = _attached.get(name)
+    if memory is None:
+        memory = SharedMemory(name)
+        _attached[name] = memory
+    return memory
+
+
+def _aligned(offset: int) -> int:
+    """Round the offset up to the block alignment."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+@dataclass(frozen=True)
+class SharedBlock:
+    """Location of a signal stored in a slot.
+
+    Samples are stored interleaved, the same as they are decoded and encoded.
+    """
+
+    offset: int
+    channels: int
+    samples: int
+    rate: int
+    dtype: str
+
+    @property
+    def end(self) -> int:
+        """Get aligned offset of the next block."""
+        return _aligned(self.offset + self.channels * self.samples * np.dtype(self.dtype).itemsize)
+
+
+@dataclass(frozen=True)
+class Slot:
+    """Shared memory slot passed to a worker process instead of the block samples.
+
+    Blocks are stored in and loaded from the slot by their locations, only
+    the locations are pickled. Signals which don't fit into the slot are
+    passed as is.
+    """
+
+    name: str
+    size: int
+
+    def load(self, block: SharedBlock | Signal, copy: bool = False) -> Signal:
+        """Get signal stored in the slot.
+
+        :param copy: Copy the samples, otherwise the signal is a view of the shared memory
+            which is valid until the slot is released.
+        """
+        if isinstance(block, Signal):
+            return block
+        data = np.ndarray((block.samples, block.channels), block.dtype, _attach(self.name).buf, block.offset)
+        return Signal(np.array(data.T) if copy else data.T, block.rate)
+
+    def store(self, signals: Sequence[Signal], offset: int = 0) -> List[SharedBlock | Signal]:
+        """Store signals in the slot one after another starting from the given offset.
+
+        :return: Locations of the stored signals (or the signals which don't fit into the slot).
+        """
+        results: List[SharedBlock | Signal] = []
+        for signal in signals:
+            block = SharedBlock(offset, signal.channels, signal.samples, signal.rate, signal.data.dtype.str)
+            if block.end > self.size:
+                results.append(signal)
+                continue
+            data = np.ndarray((block.samples, block.channels), block.dtype, _attach(self.name).buf, block.offset)
+            np.copyto(data.T, signal.data)
+            results.append(block)
+            offset = block.end
+        return results
+
+
+class BlockRing(AbstractContextManager):
+    """Ring of preallocated shared memory slots for passing blocks between processes.
+
+    A slot is acquired for each block sent to a worker (or for the results of
+    a worker decoding its own block) and released when the results are
+    consumed, so the number of blocks in flight is bounded by the number of
+    slots. Slots are allocated with the first block, each of them fits
+    `blocks` blocks with up to `capacity` samples.
+    """
+
+    def __init__(self, slots: int, capacity: int, blocks: int = 2):
+        """
+        :param slots: Number of slots.
+        :param capacity: Maximal number of samples of the input blocks.
+        :param blocks: Number of blocks of the maximal size fitting into a slot.
+        """
+        self.slots: int = slots
+        self.capacity: int = capacity
+        self.blocks: int = blocks
+        self._memory: List[SharedMemory] = []
+        self._free: Queue[Slot] = Queue()
+        self._lock: threading.Lock = threading.Lock()
+        self._closed: threading.Event = threading.Event()
+
+    def __enter__(self) -> "BlockRing":
+        return self
+
+    def __exit__(self, __exc_type, __exc_value, __traceback):
+        self.close()
+
+    def acquire(self, channels: int) -> Slot | None:
+        """Get a free slot for blocks with the given number of channels waiting until any slot is released.
+
+        :return: The slot or None if the ring is closed.
+        """
+        self._allocate(channels)
+        while not self._closed.is_set():
+            try:
+                return self._free.get(timeout=_POLL_INTERVAL)
+            except Empty:
+                continue
+        return None
+
+    def send(self, signal: Signal) -> Tuple[Slot, SharedBlock | Signal] | None:
+        """Store the signal in a free slot waiting until any slot is released.
+
+        :return: The slot and the signal location or None if the ring is closed.
+        """
+        slot = self.acquire(signal.channels)
+        if slot is None:
+            return None
+        (block,) = slot.store([signal])
+        return slot, block
+
+    def release(self, slot: Slot):
+        """Return the slot to the ring once its content is consumed."""
+        self._free.put(slot)
+
+    def close(self):
+        """Free shared memory (segments stay mapped by the processes which are still using them)."""
+        self._closed.set()
+        with self._lock:
+            for memory in self._memory:
+                _attached.pop(memory.name, None)
+                memory.close()
+                memory.unlink()
+            self._memory = []
+
+    def _allocate(self, channels: int):
+        """Create the slots for blocks with the given number of channels."""
+        with self._lock:
+            if len(self._memory) > 0 or self._closed.is_set():
+                return
+            block_size = _aligned(self.capacity * channels * np.dtype(real_dtype()).itemsize)
+            size = max(block_size * self.blocks, ALIGNMENT)
+            for _ in range(self.slots):
+                memory = SharedMemory(create=True, size=size)
+                _attached[memory.name] = memory
+                self._memory.append(memory)
+                self._free.put(Slot(memory.name, size))
@@ -0,0 +1,263 @@
+import os
+import struct
+from dataclasses import dataclass
+from os import PathLike, fspath
+from typing import BinaryIO, Iterator, Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+WAVE_FORMAT_PCM: int = 0x0001
+WAVE_FORMAT_IEEE_FLOAT: int = 0x0003
+WAVE_FORMAT_EXTENSIBLE: int = 0xFFFE
+
+# Sample types supported by the native reader (24-bit PCM is left to ffmpeg)
+SAMPLE_TYPES = {
+    (WAVE_FORMAT_PCM, 8): np.dtype("u1"),
+    (WAVE_FORMAT_PCM, 16): np.dtype("<i2"),
+    (WAVE_FORMAT_PCM, 32): np.dtype("<i4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): np.dtype("<f4"),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): np.dtype("<f8"),
+}
+
+HEADER_SIZE: int = 44
+MAX_CHUNK_SIZE: int = 0xFFFFFFFF
+COPY_BUFFER_SIZE: int = 1 << 20
+
+
+@dataclass(frozen=True)
+class WavInfo:
+    """Layout of the sample data of an uncompressed WAV file."""
+
+    rate: int
+    channels: int
+    dtype: np.dtype
+    offset: int  # Data chunk offset in bytes
+    frames: int  # Number of samples per channel
+
+    @property
+    def duration(self) -> float:
+        """Get duration in seconds."""
+        return self.frames / self.rate
+
+
+def info(path: PathLike | str) -> WavInfo | None:
+    """Parse header of a PCM or floating-point WAV file.
+
+    :return: Data layout or None if the file is not a WAV file supported by the native reader.
+    """
+    path = fspath(path)
+    if not path.lower().endswith(".wav") or not os.path.isfile(path):
+        return None
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        riff = file.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:] != b"WAVE":
+            return None
+        fmt = None
+        while True:
+            chunk_header = file.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                fmt = _parse_format(file.read(chunk_size))
+                file.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                rate, channels, dtype = fmt
+                offset = file.tell()
+                # Size is not updated by writers which cannot seek back (e.g. streamed to a pipe)
+                data_size = min(chunk_size, file_size - offset) if chunk_size > 0 else file_size - offset
+                return WavInfo(rate, channels, dtype, offset, data_size // (channels * dtype.itemsize))
+            else:
+                file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+def _parse_format(chunk: bytes) -> tuple[int, int, np.dtype] | None:
+    """Parse "fmt " chunk into sampling rate, channels and sample type."""
+    if len(chunk) < 16:
+        return None
+    format_tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", chunk[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE:
+        if len(chunk) < 26:
+            return None
+        # Sub-format GUID starts with the actual format tag
+        (format_tag,) = struct.unpack("<H", chunk[24:26])
+    dtype = SAMPLE_TYPES.get((format_tag, bits))
+    if dtype is None or channels == 0:
+        return None
+    return rate, channels, dtype
+
+
+def to_float(data: NDArray, dtype: type[np.floating]) -> NDArray[np.float32]:
+    """Convert stored samples to floating-point samples in range [-1, 1].
+
+    Floating-point samples of the same type are returned as is (without copying).
+    """
+    if data.dtype.kind == "f":
+        return data.astype(dtype, copy=False)
+    if data.dtype.kind == "u":
+        return (data.astype(dtype) - 128) / dtype(128)
+    return data.astype(dtype) / dtype(2 ** (8 * data.dtype.itemsize - 1))
+
+
+class WavReader:
+    """Reader of uncompressed WAV files which maps the sample data into memory.
+
+    Blocks are served as (n_samples, n_channels) float arrays (the same as
+    decoded by ffmpeg). Floating-point samples are views of the mapped file.
+    """
+
+    def __init__(self, path: PathLike | str, blocksize: int, dtype: type[np.floating] = np.float32):
+        """
+        :param path: WAV file path, it must be supported by the native reader (see wav.info).
+        :param blocksize: Number of samples per block.
+        :param dtype: Type of the returned samples.
+        """
+        self.info: WavInfo = info(path)
+        if self.info is None:
+            raise ValueError(f"Not a PCM or floating-point WAV file: {path}")
+        self.blocksize: int = blocksize
+        self.dtype: type[np.floating] = dtype
+        self.position: int = 0
+        self._data: NDArray = np.zeros((0, self.info.channels), dtype=self.info.dtype)
+        if self.info.frames > 0:
+            shape = (self.info.frames, self.info.channels)
+            self._data = np.memmap(fspath(path), self.info.dtype, "r", self.info.offset, shape)
+
+    @property
+    def rate(self) -> int:
+        """Get sampling rate."""
+        return self.info.rate
+
+    @property
+    def channels(self) -> int:
+        """Get number of channels."""
+        return self.info.channels
+
+    def read(self, n: int = -1) -> NDArray[np.float32]:
+        """Read next n samples (all the rest samples by default)."""
+        start = self.position
+        stop = self.info.frames if n < 0 else min(start + n, self.info.frames)
+        self.position = max(stop, start)
+        return to_float(np.asarray(self._data[start:stop]), self.dtype)
+
+    def __iter__(self) -> Iterator[NDArray[np.float32]]:
+        """Iterate over blocks of samples."""
+        while self.position < self.info.frames:
+            yield self.read(self.blocksize)
+
+    def close(self):
+        """Release the mapped data."""
+        self._data = self._data[:0]
+
+
+class WavWriter:
+    """Writer of 16-bit PCM WAV files (the same as encoded by ffmpeg by default).
+
+    The header is written along with the first samples, data sizes are
+    updated when the writer is closed.
+    """
+
+    def __init__(self, path: PathLike | str, rate: int):
+        """
+        :param path: Output file path, existing file is replaced.
+        :param rate: Sampling rate.
+        """
+        self.rate: int = rate
+        self.channels: int | None = None
+        self.frames: int = 0
+        self._file: BinaryIO = open(fspath(path), "wb")
+
+    def write(self, data: NDArray[np.float32]) -> int:
+        """Write (n_samples, n_channels) floating-point samples.
+
+        :return: Number of written samples.
+        """
+        if self.channels is None:
+            self.channels = data.shape[1]
+            self._file.write(self._header())
+        elif data.shape[1] != self.channels:
+            raise ValueError(f"Incompatible number of channels: {data.shape[1]} != {self.channels}")
+        samples = np.clip(np.rint(data * 32768.0), -32768, 32767).astype("<i2")
+        self._file.write(samples.tobytes())
+        self.frames += data.shape[0]
+        return data.shape[0]
+
+    def append(self, path: PathLike | str) -> int:
+        """Append samples of a 16-bit PCM WAV file by copying its data chunk (without decoding).
+
+        :return: Number of appended samples.
+        """
+        segment = info(path)
+        if segment is None or segment.dtype != np.dtype("<i2"):
+            raise ValueError(f"Not a 16-bit PCM WAV file: {path}")
+        if segment.rate != self.rate:
+            raise ValueError(f"Incompatible sampling rate: {segment.rate} != {self.rate}")
+        if segment.frames == 0:
+            return 0
+        if self.channels is None:
+            self.channels = segment.channels
+            self._file.write(self._header())
+        elif segment.channels != self.channels:
+            raise ValueError(f"Incompatible number of channels: {segment.channels} != {self.channels}")
+        with open(fspath(path), "rb") as file:
+            file.seek(segment.offset)
+            remaining = segment.frames * 2 * segment.channels
+            while remaining > 0:
+                chunk = file.read(min(remaining, COPY_BUFFER_SIZE))
+                if len(chunk) == 0:
+                    raise IOError(f"Unexpected end of file: {path}")
+                self._file.write(chunk)
+                remaining -= len(chunk)
+        self.frames += segment.frames
+        return segment.frames
+
+    def close(self):
+        """Update the header and close the file."""
+        if self._file.closed:
+            return
+        if self.channels is None:
+            self.channels = 1
+            self._file.write(self._header())
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+    def _header(self) -> bytes:
+        """Get WAV header for the samples written so far."""
+        block_align = 2 * self.channels
+        data_size = min(self.frames * block_align, MAX_CHUNK_SIZE - HEADER_SIZE)
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF",
+            data_size + HEADER_SIZE - 8,
+            b"WAVE",
+            b"fmt ",
+            16,
+            WAVE_FORMAT_PCM,
+            self.channels,
+            self.rate,
+            self.rate * block_align,
+            block_align,
+            16,
+            b"data",
+            data_size,
+        )
+
+
+def concat(segments: Iterable[PathLike | str], path: PathLike | str, rate: int) -> int:
+    """Join 16-bit PCM WAV segments into a single file by appending their sample data.
+
+    :param segments: Paths of consecutive segments.
+    :param path: Output file path, existing file is replaced.
+    :param rate: Sampling rate of the segments.
+    :return: Total number of samples.
+    """
+    writer = WavWriter(path, rate)
+    try:
+        return sum(writer.append(segment) for segment in segments)
+    finally:
+        writer.close()
@@ -108,6 +108,10 @@ class Console:
         """Output data collection."""
         return print(self.dumps(data, format), file=self._output_file)
 
+    def text(self, text: str):
+        """Output plain text."""
+        print(text, file=self._output_file)
+
     def error(self, message: str, prefix: str = "ERROR:", end: str = "\n"):
         """Print error message."""
         print(colored(prefix, "red", attrs=["bold"]), message, end=end, file=self._errors_file)
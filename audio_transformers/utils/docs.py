@@ -48,7 +48,8 @@ class Docs:
         for arg in signature.parameters.values():
             arg_type = "Any"
             if arg.annotation is not None:
-                arg_type = arg.annotation.__name__
+                # Union types (e.g. "int | None") have no name
+                arg_type = getattr(arg.annotation, "__name__", None) or str(arg.annotation)
             default = ""
             if arg.default is not inspect.Parameter.empty:
                 default = arg.default
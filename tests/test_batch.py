@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from audio_transformers.core.band_stop import BandStop
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal, SignalBatch
+from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.speed_perturbation import SpeedPerturbation
+
+
+def make_signals(rate: int = 16000):
+    return [Signal(np.random.randn(2, samples), rate) for samples in (16000, 9000, 31000, 5)]
+
+
+def test_batch_roundtrip():
+    signals = make_signals()
+    batch = SignalBatch.from_signals(signals)
+
+    assert batch.data.shape == (4, 2, 31000)
+    assert all(np.array_equal(a.data, b.data) for a, b in zip(batch.to_signals(), signals))
+    with pytest.raises(ValueError):
+        SignalBatch.from_signals([Signal(np.zeros((1, 10)), 16000), Signal(np.zeros((2, 10)), 16000)])
+
+
+@pytest.mark.parametrize(
+    "transform",
+    (
+        LowPass(cutoff_freq=1000),
+        BandStop(low_cutoff=500, high_cutoff=2000, roll_off=48, engine="fft"),
+        PitchShift(shift=0.5),
+        SpeedPerturbation(speed_factor=1.3),
+        Composite([Inversion(), LowPass(cutoff_freq=4000), PitchShift(shift=-0.3)]),
+    ),
+    ids=lambda transform: type(transform).__name__,
+)
+def test_batch_equals_separate(transform):
+    signals = make_signals()
+    outputs = transform.apply_batch(SignalBatch.from_signals(signals)).to_signals()
+
+    for output, signal in zip(outputs, signals):
+        expected = transform(signal)
+        assert output.samples == expected.samples
+        assert np.allclose(output.data, expected.data, atol=1e-5)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from audio_transformers.core.buffers import BufferPool
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.high_pass import HighPass
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
+from audio_transformers.core.pitch_shift import PitchShift
+
+
+def test_buffer_pool_reuse():
+    pool = BufferPool(max_shapes=1)
+    first = pool.acquire((2, 100), np.float32)
+    pool.release(first)
+
+    assert pool.acquire((2, 100), np.float32) is first
+    assert pool.acquire((2, 100), np.float32) is not first
+
+    pool.release(first)
+    pool.release(np.empty((2, 50), dtype=np.float32))
+    assert pool.acquire((2, 100), np.float32) is not first
+
+
+def test_inplace_apply():
+    signal = Signal(np.random.randn(2, 1000), 16000)
+    out = np.empty_like(signal.data)
+
+    result = Inversion().apply(signal, out)
+    assert result.data is out
+    assert np.array_equal(out, -signal.data)
+
+    result = LowPass(cutoff_freq=1000).apply(signal, out)
+    assert result.data is out
+    assert np.allclose(out, LowPass(cutoff_freq=1000)(signal).data)
+
+
+def test_composite_ping_pong():
+    signal = Signal(np.random.randn(2, 16000), 16000)
+    stages = [Inversion(), LowPass(cutoff_freq=4000), HighPass(cutoff_freq=100), Inversion(), PitchShift(0.5)]
+    composite = Composite(stages)
+    pool = BufferPool()
+
+    expected = signal
+    for stage in stages:
+        expected = stage(expected)
+    first = composite.apply(signal, pool=pool)
+    second = composite.apply(signal, pool=pool)
+
+    assert np.allclose(first.data, expected.data)
+    assert np.allclose(second.data, expected.data)
+    assert not np.may_share_memory(first.data, second.data)
+
+
+def test_composite_out():
+    signal = Signal(np.zeros((1, 1000)), 16000)
+    out = np.empty_like(signal.data)
+    result = Composite([GaussianNoise(amplitude=1.0), Inversion()]).apply(signal, out)
+
+    assert result.data is out
+    assert np.std(out) > 0.5
@@ -0,0 +1,32 @@
+import numpy as np
+
+from audio_transformers.core.cache import PlanCache, DEFAULT_CACHE
+from audio_transformers.core.low_pass import LowPass
+
+
+def test_plan_cache_lru_eviction():
+    cache = PlanCache(max_size=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    assert cache.get("a", lambda: None) == 1
+    cache.get("c", lambda: 3)
+
+    # "b" is the least recently used
+    assert cache.get("b", lambda: "new") == "new"
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 4
+    assert stats.evictions == 2
+    assert stats.size == 2
+    assert stats.hit_rate == 0.2
+
+
+def test_filter_design_reused():
+    DEFAULT_CACHE.clear()
+    first = LowPass(cutoff_freq=1000, engine="fft").kernel(16000)
+    second = LowPass(cutoff_freq=1000, engine="fft").kernel(16000)
+    other = LowPass(cutoff_freq=2000, engine="fft").kernel(16000)
+
+    assert first is second
+    assert not np.array_equal(first, other)
+    assert DEFAULT_CACHE.stats().hits >= 1
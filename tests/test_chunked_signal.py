@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from audio_transformers.core.model import ChunkedSignal, Signal
+from tests.utils import sinusoid, split
+
+
+def test_chunked_signal_assembly():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=3.0, channels=2)
+    blocks = split(signal, 777)
+    chunked = ChunkedSignal()
+    for block in blocks:
+        chunked.append(block)
+
+    assert chunked.samples == signal.samples
+    assert chunked.duration == pytest.approx(signal.duration)
+    assert len(chunked.chunks) == len(blocks)
+    assert all(np.shares_memory(chunk.data, block.data) for chunk, block in zip(chunked, blocks))
+    assert np.array_equal(chunked.to_signal().data, signal.data)
+    assert len(chunked.chunks) == 1
+
+
+@pytest.mark.parametrize("start,stop", ((0, 100), (500, 2000), (776, 778), (-1000, None), (5000, 4000)))
+def test_chunked_signal_slicing(start: int, stop: int):
+    signal = Signal(np.random.randn(2, 10000), 16000)
+    chunked = ChunkedSignal(split(signal, 777)) + ChunkedSignal([signal[:10]])
+    expected = np.concatenate([signal.data, signal.data[:, :10]], axis=-1)[:, start:stop]
+
+    sliced = chunked[start:stop]
+
+    assert sliced.samples == expected.shape[-1]
+    assert np.array_equal(sliced.to_signal().data, expected)
+
+
+def test_chunked_signal_validation():
+    chunked = ChunkedSignal([Signal(np.zeros((2, 10)), 16000)])
+
+    with pytest.raises(ValueError):
+        chunked.append(Signal(np.zeros((1, 10)), 16000))
+    with pytest.raises(ValueError):
+        chunked.append(Signal(np.zeros((2, 10)), 8000))
+    with pytest.raises(ValueError):
+        ChunkedSignal().to_signal()
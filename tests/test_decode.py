@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from audio_transformers.core.channels import Downmix, SelectChannels
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
+from audio_transformers.core.resample import Resample
+from audio_transformers.io.decode import DecodeOptions, push_down, pan_filter
+
+
+def test_channel_mix():
+    signal = Signal(np.random.randn(3, 100), 16000)
+
+    assert np.allclose(Downmix()(signal).data, signal.data.mean(axis=0, keepdims=True))
+    assert np.array_equal(SelectChannels([2, 0])(signal).data, signal.data[[2, 0]])
+    for mix in (Downmix(), SelectChannels([2, 0])):
+        assert np.allclose(mix.matrix(signal.channels) @ signal.data, mix(signal).data, atol=1e-6)
+    with pytest.raises(ValueError):
+        SelectChannels([3])(signal)
+
+
+def test_push_down():
+    low_pass = LowPass(cutoff_freq=1000)
+    decode, rest = push_down(Composite([SelectChannels([0, 1]), Resample(16000), Downmix(), Resample(8000), low_pass]))
+
+    assert decode.rate == 16000
+    assert len(decode.mixing) == 2
+    assert isinstance(rest.transforms[0], Resample) and rest.transforms[1] is low_pass
+    assert decode.ffmpeg_options(channels=6) == {"ar": 16000, "af": "pan=1c|c0=0.5*c0+0.5*c1"}
+
+
+def test_push_down_nothing():
+    transform = Composite([LowPass(cutoff_freq=1000), Downmix()])
+
+    assert push_down(transform) == (DecodeOptions(), transform)
+    assert pan_filter(np.eye(2)[[1, 0]]) == "pan=2c|c0=1*c1|c1=1*c0"
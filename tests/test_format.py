@@ -0,0 +1,51 @@
+import numpy as np
+
+import audio_transformers.io.format as format
+from audio_transformers.core.buffers import BufferPool
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
+
+
+def decoded(samples: int = 1000, channels: int = 2) -> np.ndarray:
+    """Get raw interleaved data as decoded by ffmpegio."""
+    return np.random.default_rng(0).standard_normal((samples, channels), dtype=np.float32)
+
+
+def test_zero_copy_conversion():
+    raw = decoded()
+
+    signal = format.to_signal(raw, 16000)
+
+    assert signal.interleaved
+    assert np.shares_memory(signal.data, raw)
+    assert np.array_equal(signal.data[1], raw[:, 1])
+    assert np.shares_memory(format.from_signal(signal), raw)
+    assert not Signal(signal.data.copy(), 16000).interleaved
+    assert not format.to_signal(decoded(channels=1), 16000).interleaved
+
+
+def test_layout_preserving_chain():
+    raw = decoded()
+    signal = format.to_signal(raw, 16000)
+    pool = BufferPool()
+    chain = Composite([Inversion(), LowPass(cutoff_freq=4000), Inversion()])
+
+    result = chain.apply(signal, pool=pool)
+    written = format.from_signal(result)
+
+    assert result.interleaved
+    assert np.shares_memory(written, result.data)
+    assert np.allclose(written, -format.from_signal(LowPass(cutoff_freq=4000)(Signal(-raw.T.copy(), 16000))))
+
+
+def test_noise_layout_independent():
+    raw = decoded()
+    noise = GaussianNoise(amplitude=0.1, seed=42)
+
+    interleaved = noise.apply(format.to_signal(raw, 16000), out=np.empty((1000, 2), dtype=np.float32).T)
+    planar = noise.apply(Signal(raw.T.copy(), 16000), out=np.empty((2, 1000), dtype=np.float32))
+
+    assert np.array_equal(interleaved.data, planar.data)
@@ -1,8 +1,12 @@
 import numpy as np
 import pytest
 
-from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.cli.task.executor import TaskExecutor
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.gaussian_noise import GaussianNoise, NOISE_CHUNK
+from audio_transformers.core.inversion import Inversion
 from audio_transformers.core.model import Signal
+from tests.utils import split
 
 
 def test_gaussian_noise_stats():
@@ -16,3 +20,43 @@ def test_gaussian_noise_stats():
     assert output.data.std().mean() == pytest.approx(1.0, abs=0.5)
     assert output.data.shape == probe_signal.data.shape
     assert output.rate == probe_signal.rate
+
+
+def test_gaussian_noise_reproducible():
+    rate = 16000
+    signal = Signal(np.zeros((2, rate * 3), dtype=np.float32), rate)
+    blocks = split(signal, rate)
+    transform = Composite([GaussianNoise(amplitude=0.5, seed=42), Inversion()]).for_signal(7)
+
+    streamed = list(TaskExecutor.stream(transform, blocks))
+    positioned = TaskExecutor.positioned(blocks)
+    independent = [TaskExecutor.fan_out_block(transform, [Composite([])], block)[0] for block in positioned]
+    repeated = list(TaskExecutor.stream(transform, blocks))
+    other_signal = list(TaskExecutor.stream(transform.for_signal(8), blocks))
+
+    assert all(block.data.dtype == np.float32 for block in streamed)
+    assert all(np.array_equal(a.data, b.data) for a, b in zip(streamed, independent))
+    assert all(np.array_equal(a.data, b.data) for a, b in zip(streamed, repeated))
+    assert not np.array_equal(streamed[0].data, streamed[1].data)
+    assert not np.array_equal(streamed[0].data, other_signal[0].data)
+
+
+def test_gaussian_noise_unseeded():
+    signal = Signal(np.zeros((1, 1000), dtype=np.float32), 16000)
+    aug = GaussianNoise(amplitude=1.0)
+
+    assert not np.array_equal(aug(signal).data, aug(signal).data)
+
+
+def test_gaussian_noise_block_boundaries():
+    rate = 16000
+    signal = Signal(np.zeros((2, NOISE_CHUNK * 3), dtype=np.float32), rate)
+    transform = GaussianNoise(amplitude=0.5, seed=42).for_signal(7)
+
+    whole = transform(signal).data
+    # Overlapping blocks at arbitrary positions get the same noise as the whole signal
+    for start, stop in ((0, 1000), (1000, NOISE_CHUNK + 5), (NOISE_CHUNK - 3, 2 * NOISE_CHUNK + 3)):
+        block = transform.for_block(start)(signal[start:stop])
+        assert np.array_equal(block.data, whole[:, start:stop])
+    streamed = np.concatenate([block.data for block in TaskExecutor.stream(transform, split(signal, 5000))], axis=-1)
+    assert np.array_equal(streamed, whole)
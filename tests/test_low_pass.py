@@ -1,7 +1,14 @@
 import math
 
+import numpy as np
+import pytest
+import scipy
+
+from audio_transformers.core.filter import FILTER_CHUNK
+from audio_transformers.core.high_pass import HighPass
 from audio_transformers.core.low_pass import LowPass
-from tests.utils import pulse, sinusoid
+from audio_transformers.core.model import Signal
+from tests.utils import pulse, sinusoid, split
 
 
 def test_low_pass_pulse():
@@ -37,3 +44,71 @@ def test_low_pass_high_cutoff():
 
     aug = LowPass(cutoff_freq=cutoff)
     assert aug(probe_signal).data.max() / probe_signal.data.max() > 0.9
+
+
+@pytest.mark.parametrize("channels", (1, 2))
+def test_low_pass_stream(channels: int):
+    rate = 16000
+    block_size = rate // 10
+    probe_signal = sinusoid(300, rate, channels=channels) + sinusoid(3000, rate, channels=channels)
+
+    aug = LowPass(cutoff_freq=1000, roll_off=24)
+    stream = aug.stream()
+    blocks = [stream(block) for block in split(probe_signal, block_size)]
+    output = np.concatenate([block.data for block in blocks], axis=-1)
+
+    assert np.allclose(output, aug(probe_signal).data, atol=1e-5)
+
+
+def test_low_pass_fft():
+    cutoff = 1000
+    rate = 16000
+    low_freq_signal = sinusoid(cutoff / 2, rate)  # cutoff - octave
+    high_freq_signal = sinusoid(cutoff * 2, rate)  # cutoff + octave
+
+    low_pass = LowPass(cutoff_freq=cutoff, roll_off=48, engine="fft")
+    passed = low_pass(low_freq_signal)
+    stopped = low_pass(high_freq_signal)
+
+    margin = rate // 10  # Skip transients at the signal edges
+    assert passed.data.shape == low_freq_signal.data.shape
+    assert passed.data[:, margin:-margin].max() == pytest.approx(1.0, rel=0.05)
+    assert stopped.data[:, margin:-margin].max() < 0.01
+
+
+@pytest.mark.parametrize("channels", (1, 2))
+def test_low_pass_fft_stream(channels: int):
+    rate = 16000
+    block_size = rate // 10
+    probe_signal = sinusoid(300, rate, channels=channels) + sinusoid(3000, rate, channels=channels)
+
+    aug = LowPass(cutoff_freq=1000, roll_off=48, engine="fft")
+    stream = aug.stream()
+    blocks = [stream(block) for block in split(probe_signal, block_size)] + [stream.flush()]
+    output = np.concatenate([block.data for block in blocks], axis=-1)
+
+    assert np.allclose(output, aug(probe_signal).data, atol=1e-5)
+
+
+def test_low_pass_out():
+    rate = 16000
+    signal = sinusoid(freq=1000, rate=rate, time_stop=3 * FILTER_CHUNK / rate + 0.1, channels=2)
+    low_pass = LowPass(cutoff_freq=1000)
+    out = np.empty_like(signal.data)
+
+    result = low_pass.apply(signal, out)
+
+    sos = low_pass.sos(rate)
+    zi = scipy.signal.sosfilt_zi(sos)[:, np.newaxis, :] * signal.data[np.newaxis, :, 0, np.newaxis]
+    expected, _ = scipy.signal.sosfilt(sos, signal.data, axis=-1, zi=zi)
+    assert result.data is out
+    assert np.array_equal(out, expected.astype(out.dtype))
+    assert np.array_equal(low_pass(signal).data, out)
+
+
+@pytest.mark.parametrize("engine", ("iir", "fft"))
+def test_low_pass_empty(engine: str):
+    empty = Signal(np.zeros((2, 0)), 16000)
+
+    assert LowPass(cutoff_freq=1000, engine=engine)(empty).data.shape == (2, 0)
+    assert HighPass(cutoff_freq=1000, engine=engine)(empty).data.shape == (2, 0)
@@ -0,0 +1,111 @@
+import os
+import tempfile
+from io import StringIO
+
+import numpy as np
+import pytest
+
+from audio_transformers.cli.handlers.transform import TransformHandler
+from audio_transformers.cli.task.executor import DEFAULT_TRANSFORMS
+from audio_transformers.cli.task.model import TaskSpec, TransformSpec
+from audio_transformers.core.band_stop import BandStop
+from audio_transformers.core.cascade import FilterCascade
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.high_pass import HighPass
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.optimizer import optimize
+from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.spectral import SpectralChain
+from audio_transformers.core.speed_perturbation import SpeedPerturbation
+from audio_transformers.utils.console import Console
+from tests.utils import sinusoid, fundamental_freq
+
+
+@pytest.fixture
+def tempdir():
+    """Create temporary directory."""
+    with tempfile.TemporaryDirectory(prefix="audio-tests-") as directory:
+        yield directory
+
+
+def test_optimizer_removes_noops():
+    plan = optimize(Composite([Inversion(), GaussianNoise(amplitude=0), Inversion(), PitchShift(0.0)]))
+
+    assert plan.transform.transforms == ()
+    assert len(plan.rewrites) == 3
+
+
+def test_optimizer_merges_stft_transforms():
+    plan = optimize(Composite([PitchShift(0.5), PitchShift(0.25), SpeedPerturbation(0.5), SpeedPerturbation(0.5)]))
+
+    (chain,) = plan.transform.transforms
+    assert isinstance(chain, SpectralChain)
+    pitch_shift, speed_perturbation = chain.transforms
+    assert isinstance(pitch_shift, PitchShift)
+    assert pitch_shift.shift == pytest.approx(0.75)
+    assert isinstance(speed_perturbation, SpeedPerturbation)
+    assert speed_perturbation.speed_factor == pytest.approx(0.25)
+
+
+def test_optimizer_fuses_filters():
+    rate = 16000
+    chain = Composite([HighPass(100), Composite([LowPass(4000, roll_off=12), LowPass(rate)]), BandStop(1000, 2000)])
+    probe_signal = sinusoid(500, rate, channels=2) + sinusoid(1500, rate, channels=2)
+
+    plan = optimize(chain)
+
+    (cascade,) = plan.transform.transforms
+    assert isinstance(cascade, FilterCascade)
+    assert len(cascade.filters) == 4
+    assert np.allclose(plan.transform(probe_signal).data, chain(probe_signal).data, atol=1e-4)
+
+
+def test_optimizer_explain():
+    plan = optimize(Composite([Inversion(), Inversion(), GaussianNoise(amplitude=0.1)]))
+    explanation = plan.explain()
+
+    assert "Remove double inversion" in explanation
+    assert explanation.endswith("1. GaussianNoise(amplitude=0.1, seed=None)")
+
+
+def test_transform_plan(tempdir):
+    output = StringIO()
+    console = Console(output_file=output, errors_file=StringIO())
+    task_path = os.path.join(tempdir, "task.yaml")
+    task = TaskSpec(
+        transforms=[
+            TransformSpec(type="Resample", params=dict(rate=16000)),
+            TransformSpec(type="LowPass", params=dict(cutoff_freq=4000)),
+            TransformSpec(type="HighPass", params=dict(cutoff_freq=100)),
+        ]
+    )
+    task.save(task_path)
+
+    handler = TransformHandler(console, DEFAULT_TRANSFORMS)
+    handler.plan(config=task_path)
+
+    assert "Fuse adjacent filters" in output.getvalue()
+    assert "Done by decoder: DecodeOptions(rate=16000" in output.getvalue()
+
+
+def test_optimizer_shares_spectre():
+    rate = 16000
+    probe_freq = 1000
+    chain = Composite([PitchShift(1.0), SpeedPerturbation(0.5)])
+    probe_signal = sinusoid(probe_freq, rate, channels=2)
+
+    plan = optimize(chain)
+    output = plan.transform(probe_signal)
+
+    (shared,) = plan.transform.transforms
+    assert isinstance(shared, SpectralChain)
+    assert output.data.shape == chain(probe_signal).data.shape
+    assert fundamental_freq(output) == pytest.approx(probe_freq * 2)
+
+
+def test_optimizer_keeps_incompatible_spectre():
+    plan = optimize(Composite([PitchShift(1.0), SpeedPerturbation(0.5, phase_vocoder=True)]))
+
+    assert len(plan.transform.transforms) == 2
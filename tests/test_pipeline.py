@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import List, Iterator
+
+import numpy as np
+import pytest
+
+from audio_transformers.core.model import Signal
+from audio_transformers.io.pipeline import prefetch, WriteBehind
+
+
+class FakeFile:
+    """Audio file substitute recording written signals."""
+
+    def __init__(self, fail_at: int | None = None):
+        self.rate: int = 16000
+        self.written: List[Signal] = []
+        self.threads: List[threading.Thread] = []
+        self.fail_at: int | None = fail_at
+
+    def write(self, signal: Signal):
+        if len(self.written) == self.fail_at:
+            raise IOError("Broken pipe")
+        time.sleep(0.001)
+        self.threads.append(threading.current_thread())
+        self.written.append(signal)
+
+
+def signals(count: int) -> List[Signal]:
+    return [Signal(np.full((1, 10), index), 16000) for index in range(count)]
+
+
+def test_prefetch():
+    produced = []
+
+    def produce() -> Iterator[int]:
+        for item in range(10):
+            produced.append(threading.current_thread())
+            yield item
+
+    assert list(prefetch(produce(), depth=2)) == list(range(10))
+    assert threading.current_thread() not in produced
+
+
+def test_prefetch_error():
+    def produce() -> Iterator[int]:
+        yield 1
+        raise ValueError("Corrupted input")
+
+    items = prefetch(produce())
+    assert next(items) == 1
+    with pytest.raises(ValueError, match="Corrupted input"):
+        next(items)
+
+
+def test_prefetch_cancel():
+    produced = []
+
+    def produce() -> Iterator[int]:
+        for item in range(1000):
+            produced.append(item)
+            yield item
+
+    items = prefetch(produce(), depth=2)
+    assert next(items) == 0
+    items.close()
+
+    assert len(produced) < 10
+
+
+def test_write_behind():
+    file = FakeFile()
+    written = signals(20)
+
+    with WriteBehind(file, depth=2) as writer:
+        for signal in written:
+            writer.write(signal)
+
+    assert file.written == written
+    assert threading.current_thread() not in file.threads
+
+
+def test_write_behind_error():
+    file = FakeFile(fail_at=3)
+
+    with pytest.raises(IOError, match="Broken pipe"):
+        with WriteBehind(file, depth=2) as writer:
+            for signal in signals(100):
+                writer.write(signal)
+
+    assert len(file.written) == 3
@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
+from scipy.interpolate import interp1d
 
-from audio_transformers.core.pitch_shift import PitchShift
-from tests.utils import sinusoid, fundamental_freq
+from audio_transformers.core.pitch_shift import PitchShift, frequency_mapping
+from tests.utils import sinusoid, fundamental_freq, split
 
 
 @pytest.mark.parametrize("channels", (1, 2))
@@ -18,3 +20,31 @@ def test_pitch_shift_sin(channels):
 
     assert output_freq == pytest.approx(probe_freq * 2**shift)
     assert output_signal.data.shape == probe_signal.data.shape
+
+
+@pytest.mark.parametrize("shift", (-0.3, 0.3))
+def test_pitch_shift_frequency_mapping(shift):
+    bins, frames = 801, 20
+    factor = 2**-shift
+    frequencies = np.linspace(0, 8000, bins)
+    spectre = np.random.randn(2, bins, frames) + 1j * np.random.randn(2, bins, frames)
+
+    # Reference implementation: interpolate spectre at the scaled frequencies
+    spectre_func = interp1d(frequencies, spectre, axis=-2, bounds_error=False, fill_value=0.0)
+    expected = spectre_func(frequencies * factor)
+
+    result = frequency_mapping(bins, factor).apply(spectre, axis=-2)
+    assert np.allclose(result, expected, atol=1e-5)
+
+
+def test_pitch_shift_stream():
+    rate = 16000
+    block_size = rate // 10 + 7
+    probe_signal = sinusoid(1000, rate, channels=2) + sinusoid(3000, rate, channels=2)
+
+    aug = PitchShift(0.5)
+    stream = aug.stream()
+    blocks = [stream(block) for block in split(probe_signal, block_size)] + [stream.flush()]
+    output = np.concatenate([block.data for block in blocks], axis=-1)
+
+    assert np.allclose(output, aug(probe_signal).data, atol=1e-6)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from audio_transformers.core.band_pass import BandPass
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
+from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.precision import POLICIES, Precision, set_precision
+from audio_transformers.core.speed_perturbation import SpeedPerturbation
+from audio_transformers.core.stft import StreamingSTFT
+from audio_transformers.io.format import from_signal
+
+TRANSFORMS = (
+    GaussianNoise(amplitude=0.1),
+    Inversion(),
+    LowPass(cutoff_freq=1000),
+    BandPass(low_cutoff=500, high_cutoff=2000, engine="fft"),
+    PitchShift(shift=0.5),
+    SpeedPerturbation(speed_factor=1.2, phase_vocoder=True),
+)
+
+
+@pytest.mark.parametrize("precision", ("single", "double"))
+@pytest.mark.parametrize("transform", TRANSFORMS, ids=lambda transform: type(transform).__name__)
+def test_transform_precision(transform, precision: Precision):
+    set_precision(precision)
+    try:
+        signal = Signal(np.random.randn(2, 16000), 16000)
+        stream = transform.stream()
+        outputs = [transform(signal), stream(signal[:7000]), stream(signal[7000:]), stream.flush()]
+        data_type = POLICIES[precision].real
+
+        assert signal.data.dtype == data_type
+        assert all(output.data.dtype == data_type for output in outputs if output is not None)
+        assert from_signal(outputs[0]).dtype == data_type
+    finally:
+        set_precision("single")
+
+
+def test_spectre_precision():
+    stft = StreamingSTFT.gaussian(0.1, 16000)
+    spectre = stft.analyze(np.random.randn(1, 16000).astype(np.float32))
+
+    assert spectre.dtype == np.complex64
+
+
+def test_unknown_precision():
+    with pytest.raises(ValueError):
+        set_precision("half")
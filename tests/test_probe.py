@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import scipy
+
+import audio_transformers.io.probe as probe
+from audio_transformers.io.probe import AudioInfo, ProbeCache
+
+FFPROBE_OUTPUT = {
+    "streams": [
+        {
+            "index": 0,
+            "codec_name": "opus",
+            "sample_rate": "48000",
+            "channels": 2,
+            "time_base": "1/48000",
+            "duration_ts": 480960,
+            "duration": "10.020000",
+        }
+    ],
+    "format": {"filename": "input.opus", "duration": "10.020000"},
+}
+
+
+@pytest.fixture
+def tempdir():
+    """Create temporary directory."""
+    with tempfile.TemporaryDirectory(prefix="audio-tests-") as directory:
+        yield directory
+
+
+def test_parse():
+    assert probe.parse(FFPROBE_OUTPUT, "input.opus") == AudioInfo(48000, 2, 10.02, 480960, "opus")
+
+    stream = dict(FFPROBE_OUTPUT["streams"][0], time_base="1/1000")
+    del stream["duration"]
+    output = dict(FFPROBE_OUTPUT, streams=[stream])
+    assert probe.parse(output, "input.opus") == AudioInfo(48000, 2, 10.02, 480960, "opus")
+
+    with pytest.raises(IOError):
+        probe.parse({"streams": []}, "video.mp4")
+
+
+def test_probe_cache(tempdir):
+    path = os.path.join(tempdir, "input.opus")
+    with open(path, "wb") as file:
+        file.write(b"data")
+    probed = []
+
+    def fake_probe(probed_path: str) -> AudioInfo:
+        probed.append(probed_path)
+        return AudioInfo(16000, 1, len(probed), 16000 * len(probed), "opus")
+
+    cache = ProbeCache(os.path.join(tempdir, "cache", "probe.sqlite"))
+    first = cache.get(path, fake_probe)
+    assert ProbeCache(cache.path).get(path, fake_probe) == first
+    assert probed == [os.path.abspath(path)]
+
+    with open(path, "ab") as file:
+        file.write(b"more data")
+    assert cache.get(path, fake_probe).duration == 2
+    assert len(probed) == 2
+
+
+def test_probe_wav(tempdir):
+    path = os.path.join(tempdir, "input.wav")
+    scipy.io.wavfile.write(path, 8000, np.zeros((4000, 2), dtype=np.int16))
+
+    assert probe.info(path) == AudioInfo(8000, 2, 0.5, 4000, "pcm_s16le")
+    assert probe.samples(path) == 4000
+    with pytest.raises(FileNotFoundError):
+        probe.info(os.path.join(tempdir, "missing.opus"))
+
+
+def test_set_cache(tempdir):
+    path = os.path.join(tempdir, "probe.sqlite")
+    try:
+        probe.set_cache(path)
+        assert probe.get_cache() == path
+    finally:
+        probe.set_cache(None)
+    assert probe.get_cache() is None
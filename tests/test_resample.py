@@ -0,0 +1,50 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import scipy
+
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
+from audio_transformers.core.resample import Resample
+from tests.utils import sinusoid, fundamental_freq, split
+
+
+@pytest.mark.parametrize("rate,target_rate", ((48000, 16000), (44100, 16000), (16000, 22050)))
+def test_resample_matches_resample_poly(rate: int, target_rate: int):
+    signal = Signal(np.random.randn(2, 33333), rate)
+    output = Resample(target_rate)(signal)
+
+    ratio = Fraction(target_rate, rate)
+    up, down = ratio.numerator, ratio.denominator
+    padding = down * 50
+    padded = np.pad(signal.data.astype(np.float64), ((0, 0), (padding, padding)), mode="edge")
+    expected = scipy.signal.resample_poly(padded, up, down, axis=-1)
+    start = padding * up // down
+
+    assert output.rate == target_rate
+    assert output.samples == -(-signal.samples * up // down)
+    assert np.allclose(output.data, expected[:, start:][:, : output.samples], atol=1e-5)
+
+
+@pytest.mark.parametrize("block_size", (1000, 7001))
+def test_resample_stream(block_size: int):
+    signal = sinusoid(freq=1000, rate=48000, time_stop=2.0, channels=2)
+    resample = Resample(16000)
+
+    stream = resample.stream()
+    blocks = [stream(block) for block in split(signal, block_size)] + [stream.flush()]
+    output = Signal(np.concatenate([block.data for block in blocks], axis=-1), 16000)
+
+    assert np.allclose(output.data, resample(signal).data, atol=1e-6)
+    assert fundamental_freq(output) == pytest.approx(1000, rel=0.05)
+
+
+def test_resample_output_rate():
+    transform = Composite([Resample(16000), LowPass(cutoff_freq=1000)])
+
+    assert transform.output_rate(48000) == 16000
+    assert transform(sinusoid(freq=500, rate=48000)).rate == 16000
+    with pytest.raises(ValueError):
+        Resample(0)
@@ -0,0 +1,85 @@
+import numpy as np
+
+from audio_transformers.cli.task.executor import TaskExecutor, FileTask, FileOutput
+from audio_transformers.core.buffers import DEFAULT_POOL
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
+from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.transform import Transform
+from audio_transformers.io import scratch
+from tests.utils import sinusoid, split
+
+
+class Normalize(Transform):
+    """Non-uniform transformation which cannot be streamed."""
+
+    uniform: bool = False
+
+    def __call__(self, signal: Signal) -> Signal:
+        return Signal(signal.data / np.abs(signal.data).max(), signal.rate)
+
+
+def test_store():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=3.0, channels=2)
+    signal.data[1] *= 0.5
+
+    stored = scratch.store(split(signal, 777), signal.rate)
+
+    assert stored.rate == signal.rate
+    assert stored.data.shape == signal.data.shape
+    assert np.array_equal(stored.data, signal.data)
+    assert np.array_equal(np.concatenate([block.data for block in scratch.blocks(stored, 1000)], axis=-1), signal.data)
+
+
+def test_store_empty():
+    stored = scratch.store([], rate=16000)
+    assert stored.samples == 0
+
+
+def test_allocate():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=1.0, channels=2)
+
+    out = scratch.allocate(signal.channels, signal.samples)
+    result = Inversion().apply(signal, out)
+
+    assert out.shape == signal.data.shape
+    assert np.shares_memory(result.data, out)
+    assert np.array_equal(out, -signal.data)
+
+
+def test_streamable():
+    assert Inversion().streamable
+    assert LowPass(cutoff_freq=1000).streamable
+    assert PitchShift(shift=1.0).streamable
+    assert not Normalize().streamable
+    assert not Composite([Inversion(), Normalize()]).streamable
+
+    task = FileTask("input.wav", [FileOutput("a.wav"), FileOutput("b.wav", Normalize())], Inversion())
+    assert task.uniform is False
+    assert task.streamable is False
+
+
+def test_apply_mapped():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=2.0, channels=2)
+    mapped = scratch.store(split(signal, 1000), signal.rate)
+
+    inverted = TaskExecutor.apply_mapped(Inversion(), mapped)
+    normalized = TaskExecutor.apply_mapped(Composite([Inversion(), Normalize()]), mapped)
+
+    assert np.array_equal(inverted.data, -signal.data)
+    assert np.allclose(normalized.data, Normalize()(Signal(-signal.data, signal.rate)).data)
+    assert TaskExecutor.apply_mapped(Composite([]), mapped) is mapped
+
+
+def test_apply_mapped_buffers():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=2.0, channels=2)
+    mapped = scratch.store(split(signal, 1000), signal.rate)
+    DEFAULT_POOL.clear()
+
+    result = TaskExecutor.apply_mapped(Composite([Inversion(), GaussianNoise(0.1, seed=1), Normalize()]), mapped)
+
+    assert isinstance(result.data.base, np.memmap)
+    assert len(DEFAULT_POOL._free) == 0
@@ -0,0 +1,61 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from audio_transformers.cli.task.executor import TaskExecutor
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.model import Signal
+from audio_transformers.io.shared import BlockRing, SharedBlock
+from tests.utils import sinusoid
+
+
+def test_send_and_store():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=1.0, channels=2)
+    with BlockRing(slots=2, capacity=signal.samples, blocks=2) as ring:
+        slot, block = ring.send(signal)
+        assert isinstance(block, SharedBlock)
+
+        loaded = slot.load(block)
+        assert loaded.interleaved
+        assert np.array_equal(loaded.data, signal.data)
+
+        results = slot.store([loaded[:100], Signal(-loaded.data, loaded.rate)], offset=block.end)
+        assert isinstance(results[0], SharedBlock)
+        assert isinstance(results[1], Signal)  # Doesn't fit into the slot
+        assert np.array_equal(slot.load(results[0], copy=True).data, signal.data[:, :100])
+        assert np.array_equal(slot.load(results[1]).data, -signal.data)
+        ring.release(slot)
+
+
+def test_bounded_slots():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=0.1, channels=1)
+    ring = BlockRing(slots=2, capacity=signal.samples)
+    first, _ = ring.send(signal)
+    second, _ = ring.send(signal)
+    assert first != second
+
+    ring.release(first)
+    third, _ = ring.send(signal)
+    assert third == first
+
+    ring.close()
+    assert ring.send(signal) is None
+
+
+def test_imap_shared_errors():
+    signal = sinusoid(freq=1000, rate=16000, time_stop=0.1, channels=2)
+
+    def blocks():
+        yield 0, signal
+        raise IOError("Decoding failed")
+
+    fan_out = partial(TaskExecutor.fan_out_block, Inversion(), [Composite([])])
+    with TaskExecutor._pool(2) as pool, BlockRing(slots=2, capacity=signal.samples) as ring:
+        results = TaskExecutor._imap_shared(
+            pool, ring, partial(TaskExecutor.call_shared, fan_out), TaskExecutor._send(ring, blocks())
+        )
+        assert np.array_equal(next(results)[0].data, -signal.data)
+        with pytest.raises(IOError):
+            next(results)
@@ -1,7 +1,10 @@
+import numpy as np
 import pytest
+from scipy.interpolate import interp1d
 
+from audio_transformers.core.interpolation import LinearMapping
 from audio_transformers.core.speed_perturbation import SpeedPerturbation
-from tests.utils import sinusoid, fundamental_freq
+from tests.utils import sinusoid, fundamental_freq, split
 
 
 @pytest.mark.parametrize("speed_factor", (0.5, 2.0))
@@ -26,3 +29,48 @@ def test_speed_perturbation(speed_factor, ch):
     assert output_length / input_length == pytest.approx(1 / speed_factor, rel=0.05)
     assert fundamental_freq(first_half) == pytest.approx(freq_first)
     assert fundamental_freq(second_half) == pytest.approx(freq_second)
+
+
+@pytest.mark.parametrize("speed_factor", (0.5, 2.0))
+def test_speed_perturbation_phase_vocoder(speed_factor):
+    rate = 16000
+    freq_first = 1000
+    freq_second = 4000
+    probe_signal = sinusoid(freq_first, rate) + sinusoid(freq_second, rate)
+
+    aug = SpeedPerturbation(speed_factor, phase_vocoder=True)
+    output_signal = aug(probe_signal)
+
+    length_half = output_signal.samples // 2
+    assert output_signal.samples / probe_signal.samples == pytest.approx(1 / speed_factor, rel=0.05)
+    assert fundamental_freq(output_signal[:length_half]) == pytest.approx(freq_first)
+    assert fundamental_freq(output_signal[length_half:]) == pytest.approx(freq_second)
+
+
+def test_speed_perturbation_time_mapping():
+    frames, target_frames = 37, 91
+    spectre = np.random.randn(2, 5, frames) + 1j * np.random.randn(2, 5, frames)
+    positions = np.arange(target_frames) * frames / target_frames
+
+    # Reference implementation: interpolate spectre at the target time positions
+    spectre_func = interp1d(range(frames), spectre, axis=-1, bounds_error=False, fill_value=0.0)
+    expected = spectre_func(positions)
+
+    result = LinearMapping.at(positions, frames).apply(spectre, axis=-1)
+    assert np.allclose(result, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("speed_factor", (0.7, 1.3))
+@pytest.mark.parametrize("phase_vocoder", (False, True))
+def test_speed_perturbation_stream(speed_factor, phase_vocoder):
+    rate = 16000
+    block_size = rate // 10 + 7
+    probe_signal = sinusoid(1000, rate, channels=2) + sinusoid(3000, rate, channels=2)
+
+    aug = SpeedPerturbation(speed_factor, phase_vocoder=phase_vocoder)
+    stream = aug.stream()
+    blocks = [stream(block) for block in split(probe_signal, block_size)] + [stream.flush()]
+    output = np.concatenate([block.data for block in blocks], axis=-1)
+
+    assert output.shape[-1] == round(probe_signal.samples / speed_factor)
+    assert np.allclose(output, aug(probe_signal).data, atol=1e-6)
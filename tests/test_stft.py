@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from audio_transformers.core.precision import Precision, POLICIES, set_precision
+from audio_transformers.core.stft import StreamingSTFT
+
+
+@pytest.mark.parametrize("window_size,hop", ((1600, 800), (1601, 800), (1600, 400)))
+@pytest.mark.parametrize("block_size", (777, 100000))
+@pytest.mark.parametrize("precision,atol", (("single", 1e-5), ("double", 1e-8)))
+def test_stft_reconstruction(window_size: int, hop: int, block_size: int, precision: Precision, atol: float):
+    data = np.random.randn(2, 10007)
+    set_precision(precision)
+    try:
+        stft = StreamingSTFT(np.hanning(window_size + 2)[1:-1], hop)
+    finally:
+        set_precision("single")
+
+    output = []
+    for start in range(0, data.shape[-1], block_size):
+        block = data[:, start:][:, :block_size]
+        output.append(stft.synthesize(stft.analyze(block)))
+    output.append(stft.synthesize_rest(stft.analyze_rest(), data.shape[-1]))
+    result = np.concatenate(output, axis=-1)
+
+    assert result.dtype == POLICIES[precision].real
+    assert np.allclose(result, data, atol=atol)
+
+
+def test_stft_magnitude():
+    rate = 16000
+    freq = 1000
+    time = np.arange(rate) / rate
+    data = np.sin(2 * np.pi * freq * time)[np.newaxis, :]
+    stft = StreamingSTFT.gaussian(0.1, rate)
+
+    spectre = stft.analyze(data)
+    magnitude = np.abs(spectre).mean(axis=-1)[0]
+
+    assert stft.frequencies(rate)[magnitude.argmax()] == pytest.approx(freq)
+    assert magnitude.max() == pytest.approx(0.5, rel=0.1)
@@ -3,16 +3,27 @@ import os
 import tempfile
 from io import StringIO
 
+import numpy as np
 import pytest
 
 from audio_transformers.cli.handlers.transform import TransformHandler
-from audio_transformers.cli.task.executor import DEFAULT_TRANSFORMS
-from audio_transformers.cli.task.model import TaskSpec, TransformSpec
+from audio_transformers.cli.task.executor import DEFAULT_TRANSFORMS, TaskExecutor, FileTask, FileOutput
+from audio_transformers.cli.task.model import TaskSpec, TransformSpec, OutputSpec
+from audio_transformers.core.channels import Downmix
+from audio_transformers.core.composite import Composite
+from audio_transformers.core.gaussian_noise import GaussianNoise
+from audio_transformers.core.inversion import Inversion
+from audio_transformers.core.low_pass import LowPass
+from audio_transformers.core.model import Signal
 from audio_transformers.core.pitch_shift import PitchShift
+from audio_transformers.core.resample import Resample
+from audio_transformers.core.speed_perturbation import SpeedPerturbation
+from audio_transformers.core.transform import Transform
+from audio_transformers.io.decode import DecodeOptions
 from audio_transformers.io.file import AudioFile
 from audio_transformers.utils.console import Console
 from audio_transformers.utils.docs import Docs
-from tests.utils import sinusoid, fundamental_freq
+from tests.utils import sinusoid, fundamental_freq, split
 
 
 def make_task(speed_factor: float = 0.5, pitch_shift: float = 1.0) -> TaskSpec:
@@ -132,3 +143,203 @@ def test_transform_files(tempdir):
 
     assert output_signal.duration == pytest.approx(input_signal.duration / speed_factor, rel=0.1)
     assert fundamental_freq(output_signal) == pytest.approx(fundamental_freq(input_signal) * 2, rel=0.1)
+
+
+def test_transform_files_outputs(tempdir):
+    output = StringIO()
+    console = Console(output_file=output, errors_file=StringIO())
+
+    handler = TransformHandler(console, DEFAULT_TRANSFORMS)
+
+    freq = 1000
+    rate = 16000
+    input_signal = sinusoid(freq, rate, time_stop=10.0, channels=2)
+    input_path = os.path.join(tempdir, "file.wav")
+    task_path = os.path.join(tempdir, "task.yaml")
+
+    with AudioFile(input_path, "w", rate=input_signal.rate) as file:
+        file.write(input_signal)
+
+    task = TaskSpec(
+        input_root=tempdir,
+        input_pattern="*.wav",
+        transforms=[TransformSpec(type="Inversion", params={})],
+        outputs=[
+            OutputSpec(name="slow", transforms=[TransformSpec(type="SpeedPerturbation", params={"speed_factor": 0.5})]),
+            OutputSpec(name="high", transforms=[TransformSpec(type="PitchShift", params={"shift": 1.0})]),
+        ],
+    )
+    task.save(task_path)
+
+    handler.files(config=task_path)
+
+    with AudioFile(os.path.join(tempdir, "file_slow.wav"), "r") as file:
+        slow_signal = file.read()
+    with AudioFile(os.path.join(tempdir, "file_high.wav"), "r") as file:
+        high_signal = file.read()
+
+    assert slow_signal.duration == pytest.approx(input_signal.duration * 2, rel=0.1)
+    assert high_signal.duration == pytest.approx(input_signal.duration, rel=0.1)
+    assert fundamental_freq(high_signal) == pytest.approx(fundamental_freq(input_signal) * 2, rel=0.1)
+
+
+def test_fan_out_subtasks():
+    with tempfile.TemporaryDirectory(prefix="audio-tests-") as directory:
+        open(os.path.join(directory, "file.wav"), "w").close()
+        task = TaskSpec(
+            input_root=directory,
+            input_pattern="*.wav",
+            transforms=[TransformSpec(type="Inversion", params={})],
+            outputs=[
+                OutputSpec(name="low", transforms=[TransformSpec(type="LowPass", params={"cutoff_freq": 1000})]),
+                OutputSpec(name="copy", output_pattern="{name}.{output}"),
+            ],
+        )
+        (subtask,) = TaskExecutor(DEFAULT_TRANSFORMS).subtasks(task)
+
+    assert [output.output_path for output in subtask.outputs] == [
+        os.path.join(directory, "file_low.wav"),
+        os.path.join(directory, "file.copy"),
+    ]
+
+    signal = sinusoid(1000, 16000, time_stop=3.0)
+    blocks = split(signal, 16000)
+    shared, branches = TaskExecutor.signal_transforms(subtask)
+    streamed = [[], []]
+    for index, block in TaskExecutor.fan_out(shared, branches, blocks):
+        streamed[index].append(block.data)
+    independent = [TaskExecutor.fan_out_block(shared, branches, block) for block in TaskExecutor.positioned(blocks)]
+
+    assert np.allclose(np.concatenate(streamed[1], axis=-1), -signal.data)
+    expected = LowPass(cutoff_freq=1000)(Signal(-signal.data, signal.rate))
+    assert np.allclose(np.concatenate(streamed[0], axis=-1), expected.data)
+    assert np.allclose(np.concatenate([outputs[1].data for outputs in independent], axis=-1), -signal.data)
+
+
+@pytest.mark.parametrize(
+    "transform",
+    (
+        LowPass(cutoff_freq=1000),
+        LowPass(cutoff_freq=1000, roll_off=96, engine="fft"),
+        PitchShift(shift=0.5),
+        Composite([LowPass(cutoff_freq=4000), PitchShift(shift=-0.3)]),
+    ),
+)
+def test_overlapped_segments(transform: Transform):
+    signal = Signal(np.random.default_rng(42).standard_normal((2, 40000)), 16000)
+    task = FileTask("input.wav", [FileOutput("output.wav")], transform)
+    context = task.context(signal.rate)
+
+    segments = list(TaskExecutor.segments(split(signal, 3000), context, block_size=5000))
+    shared, branches = TaskExecutor.signal_transforms(task)
+    outputs = [TaskExecutor.fan_out_segment(shared, branches, segment)[0] for segment in segments]
+
+    assert all(segment[1].samples <= 5000 + context.left + context.right + 2 * context.step for segment in segments)
+    assert np.allclose(np.concatenate([output.data for output in outputs], axis=-1), transform(signal).data, atol=1e-4)
+
+
+def test_unknown_context():
+    task = FileTask("input.wav", [FileOutput("slow.wav", SpeedPerturbation(0.5)), FileOutput("copy.wav")])
+    assert task.context(16000) is None
+    assert FileTask("input.wav", [FileOutput("low.wav", Resample(8000))]).context(16000) is None
+
+
+@pytest.mark.parametrize(
+    "transform",
+    (Inversion(), GaussianNoise(amplitude=0.1, seed=3), PitchShift(shift=0.5), SpeedPerturbation(speed_factor=0.8)),
+)
+@pytest.mark.parametrize("segmented", (True, False))
+def test_transform_file_seeking(tempdir, transform: Transform, segmented: bool):
+    input_path = os.path.join(tempdir, "input.wav")
+    signal = sinusoid(freq=440, rate=16000, time_stop=10.0, channels=2)
+    with AudioFile(input_path, "w", rate=signal.rate) as file:
+        file.write(signal)
+    outputs = [
+        FileOutput(os.path.join(tempdir, "seeking.wav")),
+        FileOutput(os.path.join(tempdir, "low.wav"), LowPass(500)),
+    ]
+    streamed_outputs = [FileOutput(os.path.join(tempdir, "streamed.wav"))]
+
+    TaskExecutor.execute_subtask_parallel(
+        FileTask(input_path, outputs, transform, block_duration=3.0), segmented=segmented
+    )
+    TaskExecutor.execute_subtask_stream(FileTask(input_path, streamed_outputs, transform, block_duration=3.0))
+
+    with AudioFile(outputs[0].output_path) as seeking, AudioFile(streamed_outputs[0].output_path) as streamed:
+        assert np.allclose(seeking.read().data, streamed.read().data, atol=1e-3)
+
+
+@pytest.mark.parametrize("transform", (Inversion(), GaussianNoise(amplitude=0.1, seed=3), PitchShift(shift=0.5)))
+def test_transform_file_shared(tempdir, transform: Transform):
+    input_path = os.path.join(tempdir, "input.wav")
+    signal = sinusoid(freq=440, rate=16000, time_stop=10.0, channels=2)
+    with AudioFile(input_path, "w", rate=signal.rate) as file:
+        file.write(signal)
+    outputs = [
+        FileOutput(os.path.join(tempdir, "shared.wav")),
+        FileOutput(os.path.join(tempdir, "mono.wav"), Downmix()),
+    ]
+    streamed_outputs = [FileOutput(os.path.join(tempdir, "streamed.wav"))]
+
+    TaskExecutor.execute_subtask_parallel(FileTask(input_path, outputs, transform, block_duration=3.0), seek=False)
+    TaskExecutor.execute_subtask_stream(FileTask(input_path, streamed_outputs, transform, block_duration=3.0))
+
+    with AudioFile(outputs[0].output_path) as shared, AudioFile(streamed_outputs[0].output_path) as streamed:
+        assert np.allclose(shared.read().data, streamed.read().data, atol=1e-3)
+    with AudioFile(outputs[1].output_path) as mono:
+        assert mono.read().channels == 1
+
+
+@pytest.mark.parametrize("mode", ({"seek": True}, {"seek": False}, {"segmented": False}))
+def test_transform_file_seeded_noise(tempdir, mode):
+    input_path = os.path.join(tempdir, "input.wav")
+    signal = sinusoid(freq=440, rate=16000, time_stop=7.0, channels=2)
+    with AudioFile(input_path, "w", rate=signal.rate) as file:
+        file.write(signal)
+    transform = Composite([GaussianNoise(0.1, seed=3), LowPass(cutoff_freq=1000)])
+    serial_task = FileTask(input_path, [FileOutput(os.path.join(tempdir, "serial.wav"))], transform, 2.0)
+    parallel_task = FileTask(input_path, [FileOutput(os.path.join(tempdir, "parallel.wav"))], transform, 2.0)
+
+    assert TaskExecutor.execute_subtask(serial_task) is None
+    TaskExecutor.execute_subtask_parallel(parallel_task, **mode)
+
+    with AudioFile(serial_task.outputs[0].output_path) as serial:
+        with AudioFile(parallel_task.outputs[0].output_path) as parallel:
+            assert np.allclose(serial.read().data, parallel.read().data, atol=1e-3)
+
+
+def test_transform_file_decode_rate(tempdir):
+    input_path = os.path.join(tempdir, "input.wav")
+    signal = sinusoid(freq=440, rate=16000, time_stop=10.0, channels=2)
+    with AudioFile(input_path, "w", rate=signal.rate) as file:
+        file.write(signal)
+    decode = DecodeOptions(rate=8000)
+    parallel_task = FileTask(input_path, [FileOutput(os.path.join(tempdir, "parallel.wav"))], Inversion(), 3.0, decode)
+    streamed_task = FileTask(input_path, [FileOutput(os.path.join(tempdir, "streamed.wav"))], Inversion(), 3.0, decode)
+
+    TaskExecutor.execute_subtask_parallel(parallel_task)
+    TaskExecutor.execute_subtask_stream(streamed_task)
+
+    with AudioFile(parallel_task.outputs[0].output_path) as parallel:
+        with AudioFile(streamed_task.outputs[0].output_path) as streamed:
+            parallel_signal, streamed_signal = parallel.read(), streamed.read()
+    assert parallel_signal.rate == 8000
+    assert np.allclose(parallel_signal.data, streamed_signal.data, atol=1e-3)
+
+
+def test_signal_key(tempdir):
+    os.makedirs(os.path.join(tempdir, "data", "sub"))
+    open(os.path.join(tempdir, "data", "sub", "file.wav"), "w").close()
+    spec = dict(input_pattern="**/*.wav", transforms=[TransformSpec(type="Inversion", params={})])
+    executor = TaskExecutor(DEFAULT_TRANSFORMS)
+
+    keys = set()
+    for input_root in (os.path.join(tempdir, "data"), os.path.join(tempdir, "data") + "/", tempdir + "/./data"):
+        (subtask,) = executor.subtasks(TaskSpec(input_root=input_root, **spec))
+        keys.add(subtask.signal_key)
+    assert len(keys) == 1
+    assert subtask.key == "sub/file.wav"
+
+    relative = os.path.relpath(subtask.input_path)
+    assert FileTask(relative, []).signal_key == FileTask(os.path.abspath(relative), []).signal_key
+    assert FileTask("a/file.wav", []).signal_key != FileTask("a/other.wav", []).signal_key
@@ -1,10 +1,11 @@
 import math
 
+import numpy as np
 import pytest
 
 from audio_transformers.core.band_pass import BandPass
 from audio_transformers.core.band_stop import BandStop
-from tests.utils import sinusoid
+from tests.utils import sinusoid, split
 
 
 @pytest.mark.parametrize("channels", (1, 2))
@@ -60,3 +61,38 @@ def test_band_pass_high(channels: int):
 
     assert output_low.data.max() / probe_low.data.max() < 1 / math.sqrt(2)
     assert output_center.data.max() / probe_center.data.max() == pytest.approx(1.0, 0.1)
+
+
+@pytest.mark.parametrize("channels", (1, 2))
+def test_band_stop_stream(channels: int):
+    rate = 16000
+    block_size = rate // 10
+    probe_signal = sinusoid(500, rate, channels=channels) + sinusoid(2000, rate, channels=channels)
+
+    aug = BandStop(1000, 4000, roll_off=24)
+    stream = aug.stream()
+    blocks = [stream(block) for block in split(probe_signal, block_size)]
+    output = np.concatenate([block.data for block in blocks], axis=-1)
+
+    assert np.allclose(output, aug(probe_signal).data, atol=1e-5)
+
+
+def test_band_pass_fft():
+    rate = 32000
+    low_cutoff = 2000
+    high_cutoff = 4000
+    probe_low = sinusoid(low_cutoff // 2, rate)  # Low cutoff - octave
+    probe_center = sinusoid(math.sqrt(low_cutoff * high_cutoff), rate)  # Geometric center
+    probe_high = sinusoid(high_cutoff * 2, rate)  # High cutoff + octave
+
+    aug = BandPass(low_cutoff, high_cutoff, roll_off=48, engine="fft")
+    margin = rate // 10  # Skip transients at the signal edges
+
+    assert aug(probe_low).data[:, margin:-margin].max() < 0.01
+    assert aug(probe_center).data[:, margin:-margin].max() == pytest.approx(1.0, 0.1)
+    assert aug(probe_high).data[:, margin:-margin].max() < 0.01
+
+
+def test_filter_unknown_engine():
+    with pytest.raises(ValueError):
+        BandPass(1000, 2000, engine="unknown")
@@ -0,0 +1,128 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import scipy
+
+import audio_transformers.io.format as format
+import audio_transformers.io.wav as wav
+from audio_transformers.core.model import Signal
+from audio_transformers.io.file import AudioFile
+from tests.utils import sinusoid
+
+
+@pytest.fixture
+def tempdir():
+    """Create temporary directory."""
+    with tempfile.TemporaryDirectory(prefix="audio-tests-") as directory:
+        yield directory
+
+
+@pytest.mark.parametrize("dtype,scale", (("<f4", 1.0), ("<f8", 1.0), ("<i2", 2**15), ("<i4", 2**31)))
+def test_read_wav(tempdir, dtype: str, scale: float):
+    path = os.path.join(tempdir, "input.wav")
+    signal = sinusoid(freq=1000, rate=16000, time_stop=2.0, channels=2)
+    signal.data[1] *= 0.5
+    stored = signal.data.T.astype(np.float64) * (scale - 1 if scale > 1 else scale)
+    scipy.io.wavfile.write(path, signal.rate, stored.astype(dtype))
+
+    with AudioFile(path, "r", block_size=7000) as file:
+        assert isinstance(file._reader(), wav.WavReader)
+        assert file.rate == signal.rate
+        assert file.samples == signal.samples
+        blocks = list(file)
+        mapped = [np.shares_memory(block.data, file._file._data) for block in blocks]
+
+    assert [block.samples for block in blocks] == [7000, 7000, 7000, 7000, 4000]
+    assert np.allclose(np.concatenate([block.data for block in blocks], axis=-1), signal.data, atol=1e-4)
+    assert all(mapped) == (dtype == "<f4")
+
+
+def test_read_extensible(tempdir):
+    path = os.path.join(tempdir, "input.wav")
+    data = np.arange(12, dtype="<i2").reshape(6, 2)
+    fmt = wav.struct.pack("<HHIIHHHHI16s", wav.WAVE_FORMAT_EXTENSIBLE, 2, 8000, 32000, 4, 16, 22, 16, 3, b"\x01\x00")
+    with open(path, "wb") as file:
+        file.write(b"RIFF" + wav.struct.pack("<I", 4 + 8 + len(fmt) + 8 + data.nbytes) + b"WAVE")
+        file.write(b"fmt " + wav.struct.pack("<I", len(fmt)) + fmt)
+        file.write(b"data" + wav.struct.pack("<I", data.nbytes) + data.tobytes())
+
+    info = wav.info(path)
+
+    assert info == wav.WavInfo(rate=8000, channels=2, dtype=np.dtype("<i2"), offset=68, frames=6)
+    assert np.array_equal(wav.WavReader(path, blocksize=10).read() * 2**15, data)
+
+
+def test_write_wav(tempdir):
+    path = os.path.join(tempdir, "output.wav")
+    signal = sinusoid(freq=1000, rate=16000, time_stop=1.0, channels=2)
+    signal.data[0] *= 0.25
+
+    with AudioFile(path, "w", rate=signal.rate) as file:
+        assert isinstance(file._file, wav.WavWriter)
+        file.write(signal[:10000])
+        file.write(signal[10000:])
+
+    rate, data = scipy.io.wavfile.read(path)
+    assert rate == signal.rate
+    assert data.dtype == np.int16
+    assert np.allclose(data.T / 2**15, signal.data, atol=1e-4)
+
+
+def test_unsupported_files(tempdir):
+    path = os.path.join(tempdir, "input.wav")
+    scipy.io.wavfile.write(path, 16000, np.zeros(100, dtype=np.uint8))
+    with open(os.path.join(tempdir, "text.wav"), "w") as file:
+        file.write("not a wav file")
+
+    assert wav.info(path).dtype == np.dtype("u1")
+    assert wav.info(os.path.join(tempdir, "text.wav")) is None
+    assert wav.info(os.path.join(tempdir, "missing.wav")) is None
+
+
+def test_interleaved_layout():
+    raw = np.array([[0, 100], [1, 101], [2, 102]], dtype=np.float32)
+
+    signal = format.to_signal(raw, 16000)
+
+    assert np.array_equal(signal.data, [[0, 1, 2], [100, 101, 102]])
+    assert np.array_equal(format.from_signal(signal), raw)
+    assert np.array_equal(format.from_signal(Signal(signal.data.copy(), 16000)), raw)
+
+
+def test_read_range(tempdir):
+    path = os.path.join(tempdir, "input.wav")
+    signal = sinusoid(freq=1000, rate=16000, time_stop=2.0, channels=2)
+    scipy.io.wavfile.write(path, signal.rate, signal.data.T)
+
+    with AudioFile(path, "r") as file:
+        ranges = [file.read_range(0.0, 0.5), file.read_range(0.5, 1.0), file.read_range(1.5)]
+        assert file.read_range(3.0, 1.0).samples == 0
+        with pytest.raises(ValueError):
+            file.read_range(1.0, -1.0)
+
+    assert [part.samples for part in ranges] == [8000, 16000, 8000]
+    assert np.array_equal(np.concatenate([part.data for part in ranges], axis=-1), signal.data)
+
+
+def test_concat(tempdir):
+    signal = sinusoid(freq=1000, rate=16000, time_stop=1.0, channels=2)
+    segments = []
+    for index, (start, stop) in enumerate(((0, 5000), (5000, 5000), (5000, 16000))):
+        segments.append(os.path.join(tempdir, f"segment-{index}.wav"))
+        with AudioFile(segments[-1], "w", rate=signal.rate) as file:
+            file.write(signal[start:stop])
+
+    path = os.path.join(tempdir, "joined.wav")
+    assert wav.concat(segments, path, signal.rate) == signal.samples
+
+    with AudioFile(path) as joined, AudioFile(os.path.join(tempdir, "segment-2.wav")) as last:
+        assert joined.samples == signal.samples
+        assert np.allclose(joined.read().data, signal.data, atol=1e-4)
+        assert np.array_equal(joined.read_range(5000 / signal.rate).data, last.read().data)
+
+    with AudioFile(os.path.join(tempdir, "mono.wav"), "w", rate=signal.rate) as file:
+        file.write(signal.data[:1])
+    with pytest.raises(ValueError):
+        wav.concat([segments[0], os.path.join(tempdir, "mono.wav")], path, signal.rate)
@@ -1,4 +1,4 @@
-from typing import Tuple
+from typing import Tuple, List
 
 import numpy as np
 import scipy
@@ -39,5 +39,10 @@ def get_spectre(signal: Signal) -> Tuple[NDArray[np.float32], NDArray[np.float32
 def fundamental_freq(signal: Signal) -> float:
     """Calculate the loudest frequency in the signal."""
     spectre, frequencies = get_spectre(signal)
-    max_index = spectre.mean(axis=-1).argmax(axis=-1)
+    max_index = np.abs(spectre).mean(axis=-1).argmax(axis=-1)
     return frequencies[max_index]
+
+
+def split(signal: Signal, block_size: int) -> List[Signal]:
+    """Split signal into consecutive blocks."""
+    return [signal[start:][:block_size] for start in range(0, signal.samples, block_size)]